@@ -4,11 +4,12 @@ from inspect import signature
 from typing import Any, Callable, List, Optional, Type
 
 import gpytorch.distributions
-from attr import define
+from attr import define, field
 from botorch.acquisition import AcquisitionFunction
 from botorch.models.gpytorch import Model
 from botorch.posteriors import Posterior
 from botorch.posteriors.gpytorch import GPyTorchPosterior
+from linear_operator.operators import DiagLinearOperator
 from torch import Tensor, cat, squeeze
 
 from baybe.surrogates.base import Surrogate
@@ -58,9 +59,43 @@ def debotorchize(acqf_cls: Type[AcquisitionFunction]):
         def __getattr__(self, item):
             return getattr(self.acqf, item)
 
+        def __reduce__(self):
+            # The locally defined class cannot be pickled by reference. Instead, the
+            # wrapper is recreated from its ingredients (e.g. for sending it to other
+            # processes).
+            # Analytic acquisition functions have no pending points
+            X_pending = getattr(self.acqf, "X_pending", None)
+            return (
+                _restore_debotorchized,
+                (acqf_cls, self.model._surrogate, self.best_f, X_pending),
+            )
+
     return Wrapper
 
 
+def _restore_debotorchized(
+    acqf_cls: Type[AcquisitionFunction],
+    surrogate: Surrogate,
+    best_f: float,
+    X_pending: Optional[Tensor],
+):
+    """Recreate a debotorchized acquisition function (used for unpickling).
+
+    Args:
+        acqf_cls: The wrapped BoTorch acquisition function class.
+        surrogate: The surrogate model of the acquisition function.
+        best_f: The best found objective function value found so far.
+        X_pending: The pending points of the acquisition function.
+
+    Returns:
+        The recreated acquisition function.
+    """
+    acqf = debotorchize(acqf_cls)(surrogate, best_f)
+    if X_pending is not None:
+        acqf.set_X_pending(X_pending)
+    return acqf
+
+
 class AdapterModel(Model):
     """A BoTorch model that uses a BayBE surrogate model for posterior computation.
 
@@ -90,8 +125,17 @@ class AdapterModel(Model):
         **kwargs: Any,
     ) -> Posterior:
         # See base class.
-        mean, var = self._surrogate.posterior(X)
-        mvn = gpytorch.distributions.MultivariateNormal(mean, var)
+
+        # For surrogates without joint posterior, the covariance is represented as a
+        # diagonal operator, so that no dense covariance matrices are allocated
+        # (analytic acquisition functions only access the marginal variances and
+        # Monte Carlo sampling uses the trivial root decomposition)
+        if not self._surrogate.joint_posterior:
+            mean, var = self._surrogate.marginal_posterior(X)
+            covar = DiagLinearOperator(var)
+        else:
+            mean, covar = self._surrogate.posterior(X)
+        mvn = gpytorch.distributions.MultivariateNormal(mean, covar)
         return GPyTorchPosterior(mvn)
 
 
@@ -103,6 +147,11 @@ class PartialAcquisitionFunction:
     to be a tensor of dimension ``d x 1`` where d is the computational dimension of
     the search space that is to be pinned. The acquisition function is assumed to be
     defined for the full hybrid space.
+
+    Pending points of the hybrid space that have been set on the acquisition function
+    before wrapping it are always retained. Pending points set via
+    :func:`baybe.acquisition.PartialAcquisitionFunction.set_X_pending` are lifted to the
+    hybrid space and considered in addition.
     """
 
     acqf: AcquisitionFunction
@@ -115,6 +164,21 @@ class PartialAcquisitionFunction:
     """A flag for denoting whether ``pinned_part`` corresponds to the discrete
     subspace."""
 
+    _base_X_pending: Optional[Tensor] = field(init=False)
+    """The pending points of the hybrid space set before wrapping the acquisition
+    function."""
+
+    _partial_X_pending: Optional[Tensor] = field(init=False, default=None)
+    """The pending points of the partial space."""
+
+    def __attrs_post_init__(self):
+        self._base_X_pending = getattr(self.acqf, "X_pending", None)
+
+    @property
+    def X_pending(self) -> Optional[Tensor]:
+        """The pending points of the partial space."""
+        return self._partial_X_pending
+
     def _lift_partial_part(self, partial_part: Tensor) -> Tensor:
         """Lift ``partial_part`` to the original hybrid space.
 
@@ -173,8 +237,16 @@ class PartialAcquisitionFunction:
             X_pending: ``n x d`` Tensor with n d-dim design points that have been
                 submitted for evaluation but have not yet been evaluated.
         """
+        self._partial_X_pending = X_pending
         if X_pending is not None:  # Lift point to hybrid space and add additional dim
             X_pending = self._lift_partial_part(X_pending)
             X_pending = squeeze(X_pending, -2)
+        # Retain the pending points of the hybrid space
+        if self._base_X_pending is not None:
+            X_pending = (
+                self._base_X_pending
+                if X_pending is None
+                else cat([self._base_X_pending, X_pending], -2)
+            )
         # Now use the original set_X_pending function
         self.acqf.set_X_pending(X_pending)
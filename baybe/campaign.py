@@ -69,6 +69,11 @@ class Campaign(SerialMixin):
     measurements_exp: pd.DataFrame = field(factory=pd.DataFrame, eq=eq_dataframe)
     """The experimental representation of the conducted experiments."""
 
+    pending_experiments: pd.DataFrame = field(factory=pd.DataFrame, eq=eq_dataframe)
+    """The experimental representation of experiments that have been started but whose
+    measurements have not yet been added. Pending experiments are considered when
+    computing new recommendations and are retired when their measurements are added."""
+
     numerical_measurements_must_be_within_tolerance: bool = field(default=True)
     """Flag for forcing numerical measurements to be within tolerance."""
 
@@ -109,6 +114,13 @@ class Campaign(SerialMixin):
             return pd.DataFrame()
         return self.objective.transform(self.measurements_exp)
 
+    @property
+    def pending_experiments_comp(self) -> pd.DataFrame:
+        """The computational representation of the pending experiments."""
+        if len(self.pending_experiments) < 1:
+            return pd.DataFrame()
+        return self.searchspace.transform(self.pending_experiments)
+
     @classmethod
     def from_config(cls, config_json: str) -> Campaign:
         """Create a campaign from a configuration JSON.
@@ -193,18 +205,8 @@ class Campaign(SerialMixin):
                     f"provided dataframe. Non-numeric target values are not supported."
                 )
 
-        # Check if all targets have valid values
-        for param in self.parameters:
-            if data[param.name].isna().any():
-                raise ValueError(
-                    f"The parameter '{param.name}' has missing values or NaNs in the "
-                    f"provided dataframe. Missing parameter values are not supported."
-                )
-            if param.is_numeric and (data[param.name].dtype.kind not in "iufb"):
-                raise TypeError(
-                    f"The numerical parameter '{param.name}' has non-numeric entries in"
-                    f" the provided dataframe."
-                )
+        # Check if all parameters have valid values
+        self._validate_parameter_values(data)
 
         # Update meta data
         # TODO: refactor responsibilities
@@ -222,6 +224,9 @@ class Campaign(SerialMixin):
             [self.measurements_exp, to_insert], axis=0, ignore_index=True
         )
 
+        # Retire the corresponding pending experiments
+        self._retire_pending_experiments(data)
+
         # Telemetry
         telemetry_record_value(TELEM_LABELS["COUNT_ADD_RESULTS"], 1)
         telemetry_record_recommended_measurement_percentage(
@@ -231,6 +236,95 @@ class Campaign(SerialMixin):
             self.numerical_measurements_must_be_within_tolerance,
         )
 
+    def add_pending_experiments(self, data: pd.DataFrame) -> None:
+        """Register experiments that have been started but not yet measured.
+
+        Pending experiments are passed to the recommender, which accounts for them when
+        computing new recommendations (e.g. as ``X_pending`` of Monte Carlo acquisition
+        functions), so that parallel experimentation campaigns do not waste batch slots
+        on points that are already being measured. Pending experiments are retired
+        when the corresponding measurements are added via
+        :func:`baybe.campaign.Campaign.add_measurements`.
+
+        Args:
+            data: The started experiments in experimental representation. Additional
+                columns (e.g. targets) are ignored.
+
+        Raises:
+            ValueError: If one of the parameters has missing values or NaNs in the
+                provided dataframe.
+            TypeError: If a numerical parameter has non-numeric entries in the provided
+                dataframe.
+        """
+        self._validate_parameter_values(data)
+
+        # The recommendations cached so far do not account for the new experiments
+        self._cached_recommendation = pd.DataFrame()
+
+        self.pending_experiments = pd.concat(
+            [self.pending_experiments, data[[p.name for p in self.parameters]]],
+            axis=0,
+            ignore_index=True,
+        )
+
+    def _validate_parameter_values(self, data: pd.DataFrame) -> None:
+        """Check that the provided data contains valid values for all parameters.
+
+        Args:
+            data: The data to be checked.
+
+        Raises:
+            ValueError: If one of the parameters has missing values or NaNs in the
+                provided dataframe.
+            TypeError: If a numerical parameter has non-numeric entries in the provided
+                dataframe.
+        """
+        for param in self.parameters:
+            if data[param.name].isna().any():
+                raise ValueError(
+                    f"The parameter '{param.name}' has missing values or NaNs in the "
+                    f"provided dataframe. Missing parameter values are not supported."
+                )
+            if param.is_numeric and (data[param.name].dtype.kind not in "iufb"):
+                raise TypeError(
+                    f"The numerical parameter '{param.name}' has non-numeric entries in"
+                    f" the provided dataframe."
+                )
+
+    def _retire_pending_experiments(self, data: pd.DataFrame) -> None:
+        """Remove the pending experiments that correspond to the provided measurements.
+
+        Each measurement retires at most one pending experiment. Numerical parameter
+        values are compared up to floating point precision, all other parameter values
+        need to match exactly.
+
+        Args:
+            data: The added measurements.
+        """
+        if len(self.pending_experiments) < 1:
+            return
+
+        num_cols = [p.name for p in self.parameters if p.is_numeric]
+        cat_cols = [p.name for p in self.parameters if not p.is_numeric]
+        pending_num = self.pending_experiments[num_cols].to_numpy(dtype=float)
+        pending_cat = self.pending_experiments[cat_cols].to_numpy()
+        is_pending = np.ones(len(self.pending_experiments), dtype=bool)
+
+        for row_num, row_cat in zip(
+            data[num_cols].to_numpy(dtype=float), data[cat_cols].to_numpy()
+        ):
+            match = (
+                is_pending
+                & np.isclose(pending_num, row_num).all(axis=1)
+                & (pending_cat == row_cat).all(axis=1)
+            )
+            if match.any():
+                is_pending[np.argmax(match)] = False
+
+        self.pending_experiments = self.pending_experiments.loc[is_pending].reset_index(
+            drop=True
+        )
+
     def recommend(self, batch_quantity: int = 5) -> pd.DataFrame:
         """Provide the recommendations for the next batch of experiments.
 
@@ -259,12 +353,14 @@ class Campaign(SerialMixin):
             self.n_fits_done += 1
             self.measurements_exp["FitNr"].fillna(self.n_fits_done, inplace=True)
 
-        # Get the recommended search space entries
+        # Get the recommended search space entries, accounting for pending experiments
+        pending_experiments = self.pending_experiments_comp
         rec = self.strategy.recommend(
             self.searchspace,
             batch_quantity,
             self.measurements_parameters_comp,
             self.measurements_targets_comp,
+            pending_experiments if len(pending_experiments) > 0 else None,
         )
 
         # Cache the recommendations
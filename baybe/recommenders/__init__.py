@@ -2,11 +2,14 @@
 
 from baybe.recommenders.bayesian import (
     NaiveHybridRecommender,
+    RelaxedHybridRecommender,
     SequentialGreedyRecommender,
+    ThompsonSamplingRecommender,
 )
 from baybe.recommenders.clustering import (
     GaussianMixtureClusteringRecommender,
     KMeansClusteringRecommender,
+    MiniBatchKMeansClusteringRecommender,
     PAMClusteringRecommender,
 )
 from baybe.recommenders.sampling import FPSRecommender, RandomRecommender
@@ -15,8 +18,11 @@ __all__ = [
     "FPSRecommender",
     "GaussianMixtureClusteringRecommender",
     "KMeansClusteringRecommender",
+    "MiniBatchKMeansClusteringRecommender",
     "PAMClusteringRecommender",
     "NaiveHybridRecommender",
     "RandomRecommender",
+    "RelaxedHybridRecommender",
     "SequentialGreedyRecommender",
+    "ThompsonSamplingRecommender",
 ]
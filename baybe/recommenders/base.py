@@ -98,6 +98,7 @@ class Recommender(ABC):
         train_y: Optional[pd.DataFrame] = None,
         allow_repeated_recommendations: bool = False,
         allow_recommending_already_measured: bool = True,
+        pending_experiments: Optional[pd.DataFrame] = None,
     ) -> pd.DataFrame:
         """Recommend (a batch of) points in the search space.
 
@@ -112,6 +113,9 @@ class Recommender(ABC):
             allow_recommending_already_measured: Allow to output recommendations that
                 were measured previously. This only has an influence in discrete
                 search spaces.
+            pending_experiments: The features of experiments that have been started
+                but whose response values are not yet available. Recommenders that
+                cannot account for pending experiments ignore them.
 
         Returns:
             A DataFrame containing the recommendations as individual rows.
@@ -130,6 +134,7 @@ class NonPredictiveRecommender(Recommender, ABC):
         train_y: Optional[pd.DataFrame] = None,
         allow_repeated_recommendations: bool = False,
         allow_recommending_already_measured: bool = True,
+        pending_experiments: Optional[pd.DataFrame] = None,
     ) -> pd.DataFrame:
         # See base class.
 
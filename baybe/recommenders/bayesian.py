@@ -1,11 +1,15 @@
 """Different recommendation strategies that are based on Bayesian optimization."""
 
+import time
 from abc import ABC
+from collections import OrderedDict
+from copy import deepcopy
 from functools import partial
-from typing import Any, Callable, ClassVar, Literal, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Literal, Optional
 
 import numpy as np
 import pandas as pd
+import torch
 from attrs import define, field, validators
 from botorch.acquisition import (
     AcquisitionFunction,
@@ -17,11 +21,12 @@ from botorch.acquisition import (
     qProbabilityOfImprovement,
     qUpperConfidenceBound,
 )
-from botorch.optim import optimize_acqf, optimize_acqf_discrete, optimize_acqf_mixed
-from sklearn.metrics import pairwise_distances_argmin
+from botorch.exceptions import UnsupportedError
+from botorch.optim import optimize_acqf
+from torch import Tensor
 
 from baybe.acquisition import PartialAcquisitionFunction, debotorchize
-from baybe.exceptions import NoMCAcquisitionFunctionError
+from baybe.exceptions import NoMCAcquisitionFunctionError, NotEnoughPointsLeftError
 from baybe.recommenders.base import (
     NonPredictiveRecommender,
     Recommender,
@@ -30,11 +35,26 @@ from baybe.recommenders.base import (
 from baybe.searchspace import SearchSpace, SearchSpaceType
 from baybe.surrogates import _ONNX_INSTALLED, GaussianProcessSurrogate
 from baybe.surrogates.base import Surrogate
+from baybe.surrogates.utils import compute_fit_fingerprint
 from baybe.utils import farthest_point_sampling, to_tensor
+from baybe.utils.optimization import (
+    OptimizationBudget,
+    OptimizationReport,
+    count_evaluations,
+    get_budgeted_optimizer_settings,
+    match_candidates,
+    optimize_acqf_discrete_chunked,
+    optimize_acqf_hybrid,
+    optimize_acqf_hybrid_screened,
+)
 
 if _ONNX_INSTALLED:
     from baybe.surrogates import CustomONNXSurrogate
 
+_FIT_CACHE_SIZE = 8
+"""The maximum number of fitted surrogate states kept in the fit cache of a
+recommender."""
+
 
 @define
 class BayesianRecommender(Recommender, ABC):
@@ -48,6 +68,12 @@ class BayesianRecommender(Recommender, ABC):
     ] = field(default="qEI")
     """The used acquisition function class."""
 
+    _fit_cache: "OrderedDict[str, Dict[str, Any]]" = field(
+        init=False, factory=OrderedDict, eq=False, repr=False
+    )
+    """Copies of the fitted states of recent surrogate fits, keyed by their fit
+    fingerprints (in LRU order)."""
+
     def _get_acquisition_function_cls(
         self,
     ) -> Callable:
@@ -71,7 +97,11 @@ class BayesianRecommender(Recommender, ABC):
         return fun
 
     def setup_acquisition_function(
-        self, searchspace: SearchSpace, train_x: pd.DataFrame, train_y: pd.DataFrame
+        self,
+        searchspace: SearchSpace,
+        train_x: pd.DataFrame,
+        train_y: pd.DataFrame,
+        pending_experiments: Optional[pd.DataFrame] = None,
     ) -> AcquisitionFunction:
         """Create the current acquisition function from provided training data.
 
@@ -79,16 +109,34 @@ class BayesianRecommender(Recommender, ABC):
             searchspace: The search space in which the experiments are to be conducted.
             train_x: The features of the conducted experiments.
             train_y: The corresponding response values.
+            pending_experiments: The features of experiments that have been started
+                but whose response values are not yet available. They are passed to the
+                acquisition function as ``X_pending``.
 
         Returns:
             An acquisition function obtained by fitting the surrogate model of self to
             the provided training data.
 
+        Raises:
+            NoMCAcquisitionFunctionError: If pending experiments are provided but the
+                selected acquisition function is not a Monte Carlo acquisition function.
         """
         best_f = train_y.max()
         surrogate_model = self._fit(searchspace, train_x, train_y)
         acquisition_function_cls = self._get_acquisition_function_cls()
-        return acquisition_function_cls(surrogate_model, best_f)
+        acqf = acquisition_function_cls(surrogate_model, best_f)
+
+        if pending_experiments is not None:
+            try:
+                acqf.set_X_pending(to_tensor(pending_experiments))
+            except UnsupportedError as ex:
+                raise NoMCAcquisitionFunctionError(
+                    f"Pending experiments can only be considered with Monte Carlo "
+                    f"acquisition functions, but '{self.acquisition_function_cls}' "
+                    f"was selected."
+                ) from ex
+
+        return acqf
 
     def _fit(
         self,
@@ -98,13 +146,18 @@ class BayesianRecommender(Recommender, ABC):
     ) -> Surrogate:
         """Train a fresh surrogate model instance for the DOE strategy.
 
+        If the surrogate model has already been fitted to the same data and search
+        space, the existing fit is reused. If a recent fit of the recommender matches,
+        its state is restored into the surrogate model. In both cases, refitting is
+        skipped.
+
         Args:
             searchspace: The search space.
             train_x: The features of the conducted experiments.
             train_y: The corresponding response values.
 
         Returns:
-            A surrogate model fitted to the provided data.
+            The surrogate model of the recommender, fitted to the provided data.
 
         Raises:
             ValueError: If the training inputs and targets do not have the same index.
@@ -113,10 +166,47 @@ class BayesianRecommender(Recommender, ABC):
         if not train_x.index.equals(train_y.index):
             raise ValueError("Training inputs and targets must have the same index.")
 
-        self.surrogate_model.fit(searchspace, *to_tensor(train_x, train_y))
+        train_x, train_y = to_tensor(train_x, train_y)
+        fingerprint = compute_fit_fingerprint(
+            self.surrogate_model, searchspace, train_x, train_y
+        )
+
+        # Reuse the current fit if it stems from the same configuration and data
+        if getattr(self.surrogate_model, "_fit_fingerprint", None) == fingerprint:
+            if fingerprint not in self._fit_cache:
+                self._cache_fit(fingerprint)
+            return self.surrogate_model
+
+        # Restore a recent fit of the same configuration to the same data
+        if fingerprint in self._fit_cache:
+            self._fit_cache.move_to_end(fingerprint)
+            state = deepcopy(self._fit_cache[fingerprint])
+            self.surrogate_model._set_fitted_state(state)
+            self.surrogate_model._fit_fingerprint = fingerprint
+            return self.surrogate_model
+
+        self.surrogate_model.fit(searchspace, train_x, train_y)
+        self.surrogate_model._fit_fingerprint = fingerprint
+        self._cache_fit(fingerprint)
 
         return self.surrogate_model
 
+    def _cache_fit(self, fingerprint: str) -> None:
+        """Add a copy of the current surrogate fit to the fit cache.
+
+        The least recently used fits are evicted from the cache. Surrogates that do not
+        expose their fitted state are not cached.
+
+        Args:
+            fingerprint: The fingerprint of the fit.
+        """
+        state = self.surrogate_model._get_fitted_state()
+        if not state:
+            return
+        self._fit_cache[fingerprint] = deepcopy(state)
+        while len(self._fit_cache) > _FIT_CACHE_SIZE:
+            self._fit_cache.popitem(last=False)
+
     def recommend(  # noqa: D102
         self,
         searchspace: SearchSpace,
@@ -125,13 +215,16 @@ class BayesianRecommender(Recommender, ABC):
         train_y: Optional[pd.DataFrame] = None,
         allow_repeated_recommendations: bool = False,
         allow_recommending_already_measured: bool = True,
+        pending_experiments: Optional[pd.DataFrame] = None,
     ) -> pd.DataFrame:
         # See base class.
 
         if _ONNX_INSTALLED and isinstance(self.surrogate_model, CustomONNXSurrogate):
             CustomONNXSurrogate.validate_compatibility(searchspace)
 
-        acqf = self.setup_acquisition_function(searchspace, train_x, train_y)
+        acqf = self.setup_acquisition_function(
+            searchspace, train_x, train_y, pending_experiments
+        )
 
         if searchspace.type == SearchSpaceType.DISCRETE:
             return _select_candidates_and_recommend(
@@ -223,10 +316,10 @@ class BayesianRecommender(Recommender, ABC):
 class SequentialGreedyRecommender(BayesianRecommender):
     """Recommender using sequential Greedy optimization.
 
-    This recommender implements the BoTorch functions ``optimize_acqf_discrete``,
-    ``optimize_acqf`` and ``optimize_acqf_mixed`` for the optimization of discrete,
-    continuous and hybrid search spaces. In particular, it can be applied in all
-    kinds of search spaces.
+    This recommender implements a chunked variant of the BoTorch function
+    ``optimize_acqf_discrete`` and the BoTorch functions ``optimize_acqf`` and
+    ``optimize_acqf_mixed`` for the optimization of discrete, continuous and hybrid
+    search spaces. In particular, it can be applied in all kinds of search spaces.
     It is important to note that this algorithm performs a brute-force optimization in
     hybrid search spaces which can be computationally expensive. Thus, the behavior of
     the algorithm in hybrid search spaces can be controlled by two additional
@@ -248,6 +341,100 @@ class SequentialGreedyRecommender(BayesianRecommender):
     """Percentage of discrete search space that is sampled when performing hybrid search
     space optimization. Ignored when ``hybrid_sampler="None"``."""
 
+    hybrid_n_top: Optional[int] = field(
+        default=None, validator=validators.optional(validators.ge(1))
+    )
+    """If provided, hybrid search spaces are optimized by first screening all discrete
+    configurations at a set of random continuous points and then optimizing the
+    continuous subspace only for the ``hybrid_n_top`` most promising configurations
+    (see :func:`baybe.utils.optimization.optimize_acqf_hybrid_screened`). Otherwise,
+    the continuous subspace is optimized for every discrete configuration."""
+
+    hybrid_screening_samples: int = field(default=16, validator=validators.ge(1))
+    """The number of random continuous points at which the discrete configurations are
+    screened. Ignored when ``hybrid_n_top`` is ``None``."""
+
+    hybrid_n_workers: int = field(default=1, validator=validators.ge(1))
+    """The number of threads among which the optimizations of the (screened) discrete
+    configurations are distributed."""
+
+    chunk_size: int = field(default=10_000, validator=validators.ge(1))
+    """The maximum number of discrete candidates whose acquisition values are computed
+    at once. Bounds the memory required for scoring discrete search spaces."""
+
+    n_retained: int = field(default=10_000, validator=validators.ge(1))
+    """The number of best-scoring discrete candidates among which the points of a
+    batch are selected in a sequential greedy fashion."""
+
+    n_threads: Optional[int] = field(
+        default=None, validator=validators.optional(validators.ge(1))
+    )
+    """The number of torch threads used for scoring discrete candidates. If ``None``,
+    the global torch setting is used."""
+
+    n_processes: Optional[int] = field(
+        default=None, validator=validators.optional(validators.ge(1))
+    )
+    """The number of worker processes used for scoring discrete candidates. If larger
+    than one, the candidates are placed in shared memory and scored in shards by a
+    persistent worker pool, to which the fitted surrogate model is sent once per
+    recommendation. Requires a picklable surrogate model (otherwise, the scoring falls
+    back to the main process)."""
+
+    scoring_precision: Literal["float64", "float32"] = field(
+        default="float64", validator=validators.in_(["float64", "float32"])
+    )
+    """The floating point precision used for scoring discrete candidates. The surrogate
+    model is always trained in double precision, but scoring in single precision
+    halves the memory footprint of the candidate chunks and increases the scoring
+    throughput. The effect on the ranking of the candidates can be assessed using
+    :func:`baybe.utils.optimization.compare_scoring_precision`."""
+
+    optimization_budget: Optional[OptimizationBudget] = field(default=None)
+    """An optional budget for optimizing the acquisition function in continuous and
+    hybrid search spaces, which is automatically translated into the number of
+    restarts and raw samples of the optimizer
+    (see :func:`baybe.utils.optimization.get_budgeted_optimizer_settings`). If
+    ``None``, fixed default settings are used."""
+
+    _optimization_report: Optional[OptimizationReport] = field(
+        init=False, default=None, eq=False
+    )
+    """The report on the budget spent in the last continuous or hybrid optimization."""
+
+    @property
+    def optimization_report(self) -> Optional[OptimizationReport]:
+        """The report on the budget spent in the last continuous or hybrid optimization.
+
+        ``None`` if no such optimization has been performed yet.
+        """
+        return self._optimization_report
+
+    def _report_optimization(
+        self,
+        settings: Dict[str, Any],
+        n_runs: int,
+        n_evaluations: int,
+        start_time: float,
+    ) -> None:
+        """Store the report on a completed optimization.
+
+        Args:
+            settings: The optimizer settings that were used.
+            n_runs: The number of optimizer runs among which the budget was split.
+            n_evaluations: The number of acquisition function evaluations.
+            start_time: The start time of the optimization (in terms of
+                :func:`time.perf_counter`).
+        """
+        self._optimization_report = OptimizationReport(
+            budget=self.optimization_budget,
+            num_restarts=settings["num_restarts"],
+            raw_samples=settings["raw_samples"],
+            n_runs=n_runs,
+            n_evaluations=n_evaluations,
+            elapsed_time=time.perf_counter() - start_time,
+        )
+
     @sampling_percentage.validator
     def _validate_percentage(  # noqa: DOC101, DOC103
         self, _: Any, value: float
@@ -271,11 +458,17 @@ class SequentialGreedyRecommender(BayesianRecommender):
     ) -> pd.Index:
         # See base class.
 
-        # determine the next set of points to be tested
-        candidates_tensor = to_tensor(candidates_comp)
+        # determine the next set of points to be tested, streaming the candidates
         try:
-            points, _ = optimize_acqf_discrete(
-                acquisition_function, batch_quantity, candidates_tensor
+            ilocs, _ = optimize_acqf_discrete_chunked(
+                acquisition_function,
+                batch_quantity,
+                candidates_comp,
+                chunk_size=self.chunk_size,
+                n_retained=self.n_retained,
+                n_threads=self.n_threads,
+                n_processes=self.n_processes,
+                dtype=getattr(torch, self.scoring_precision),
             )
         except AttributeError as ex:
             raise NoMCAcquisitionFunctionError(
@@ -283,21 +476,7 @@ class SequentialGreedyRecommender(BayesianRecommender):
                 f"acquisition functions."
             ) from ex
 
-        # retrieve the index of the points from the input dataframe
-        # IMPROVE: The merging procedure is conceptually similar to what
-        #   `SearchSpace._match_measurement_with_searchspace_indices` does, though using
-        #   a simpler matching logic. When refactoring the SearchSpace class to
-        #   handle continuous parameters, a corresponding utility could be extracted.
-        idxs = pd.Index(
-            pd.merge(
-                candidates_comp.reset_index(),
-                pd.DataFrame(points, columns=candidates_comp.columns),
-                on=list(candidates_comp),
-            )["index"]
-        )
-        assert len(points) == len(idxs)
-
-        return idxs
+        return candidates_comp.index[ilocs]
 
     def _recommend_continuous(
         self,
@@ -307,29 +486,44 @@ class SequentialGreedyRecommender(BayesianRecommender):
     ) -> pd.DataFrame:
         # See base class.
 
+        equality_constraints = [
+            c.to_botorch(searchspace.continuous.parameters)
+            for c in searchspace.continuous.constraints_lin_eq
+        ]
+        inequality_constraints = [
+            c.to_botorch(searchspace.continuous.parameters)
+            for c in searchspace.continuous.constraints_lin_ineq
+        ]
+
+        start_time = time.perf_counter()
+        bounds = searchspace.continuous.param_bounds_comp
         try:
-            points, _ = optimize_acqf(
-                acq_function=acquisition_function,
-                bounds=searchspace.continuous.param_bounds_comp,
-                q=batch_quantity,
-                num_restarts=5,  # TODO make choice for num_restarts
-                raw_samples=10,  # TODO make choice for raw_samples
-                equality_constraints=[
-                    c.to_botorch(searchspace.continuous.parameters)
-                    for c in searchspace.continuous.constraints_lin_eq
-                ]
-                or None,  # TODO: https://github.com/pytorch/botorch/issues/2042
-                inequality_constraints=[
-                    c.to_botorch(searchspace.continuous.parameters)
-                    for c in searchspace.continuous.constraints_lin_ineq
-                ]
-                or None,  # TODO: https://github.com/pytorch/botorch/issues/2042
-            )
+            with count_evaluations(acquisition_function) as counter:
+                settings = get_budgeted_optimizer_settings(
+                    acquisition_function,
+                    bounds,
+                    batch_quantity,
+                    self.optimization_budget,
+                    constrained=bool(equality_constraints or inequality_constraints),
+                )
+                _limit_constrained_restart_batches(
+                    settings, bool(equality_constraints or inequality_constraints)
+                )
+                points, _ = optimize_acqf(
+                    acq_function=acquisition_function,
+                    bounds=bounds,
+                    q=batch_quantity,
+                    # TODO: https://github.com/pytorch/botorch/issues/2042
+                    equality_constraints=equality_constraints or None,
+                    inequality_constraints=inequality_constraints or None,
+                    **settings,
+                )
         except AttributeError as ex:
             raise NoMCAcquisitionFunctionError(
                 f"The '{self.__class__.__name__}' only works with Monte Carlo "
                 f"acquisition functions."
             ) from ex
+        self._report_optimization(settings, 1, counter.count, start_time)
 
         # Return optimized points as dataframe
         rec = pd.DataFrame(points, columns=searchspace.continuous.param_names)
@@ -341,14 +535,16 @@ class SequentialGreedyRecommender(BayesianRecommender):
         searchspace: SearchSpace,
         batch_quantity: int,
     ) -> pd.DataFrame:
-        """Recommend points using the ``optimize_acqf_mixed`` function of BoTorch.
+        """Recommend points using a variant of the ``optimize_acqf_mixed`` function.
 
         This functions samples points from the discrete subspace, performs optimization
         in the continuous subspace with these points being fixed and returns the best
         found solution.
-        **Important**: This performs a brute-force calculation by fixing every possible
-        assignment of discrete variables and optimizing the continuous subspace for
-        each of them. It is thus computationally expensive.
+        **Important**: Unless ``hybrid_n_top`` is set, this performs a brute-force
+        calculation by fixing every possible assignment of discrete variables and
+        optimizing the continuous subspace for each of them. It is thus computationally
+        expensive. With ``hybrid_n_top``, the continuous subspace is only optimized for
+        the most promising assignments identified in a cheap screening step.
 
         Args:
             acquisition_function: The acquisition function to be optimized.
@@ -373,70 +569,88 @@ class SequentialGreedyRecommender(BayesianRecommender):
 
         # Potential sampling of discrete candidates
         if self.hybrid_sampler == "Farthest":
-            ilocs = farthest_point_sampling(candidates_comp.values, n_candidates)
+            # The linear-time initialization avoids the quadratic search for the most
+            # distant pair among all discrete configurations
+            ilocs = farthest_point_sampling(
+                candidates_comp.values, n_candidates, initialization="projection"
+            )
             candidates_comp = candidates_comp.iloc[ilocs]
         elif self.hybrid_sampler == "Random":
             candidates_comp = candidates_comp.sample(n_candidates)
 
-        # Prepare all considered discrete configurations in the List[Dict[int, float]]
-        # format expected by BoTorch
+        # Translate the continuous constraints into the BoTorch format
         # TODO: Currently assumes that discrete parameters are first and continuous
         #   second. Once parameter redesign [11611] is completed, we might adjust this.
-        candidates_comp.columns = list(range(len(candidates_comp.columns)))
-        fixed_features_list = candidates_comp.to_dict("records")
-
-        # Actual call of the BoTorch optimization routine
+        n_discrete = len(candidates_comp.columns)
+        equality_constraints = [
+            c.to_botorch(searchspace.continuous.parameters, idx_offset=n_discrete)
+            for c in searchspace.continuous.constraints_lin_eq
+        ]
+        inequality_constraints = [
+            c.to_botorch(searchspace.continuous.parameters, idx_offset=n_discrete)
+            for c in searchspace.continuous.constraints_lin_ineq
+        ]
+
+        # The optimization budget is split among all runs of the continuous optimizer
+        n_configurations = len(candidates_comp)
+        if self.hybrid_n_top is not None:
+            n_configurations = min(self.hybrid_n_top, n_configurations)
+        n_runs = batch_quantity * n_configurations
+
+        start_time = time.perf_counter()
+        bounds = searchspace.param_bounds_comp
         try:
-            points, _ = optimize_acqf_mixed(
-                acq_function=acquisition_function,
-                bounds=searchspace.param_bounds_comp,
-                q=batch_quantity,
-                num_restarts=5,  # TODO make choice for num_restarts
-                raw_samples=10,  # TODO make choice for raw_samples
-                fixed_features_list=fixed_features_list,
-                equality_constraints=[
-                    c.to_botorch(
-                        searchspace.continuous.parameters,
-                        idx_offset=len(candidates_comp.columns),
+            with count_evaluations(acquisition_function) as counter:
+                settings = get_budgeted_optimizer_settings(
+                    acquisition_function,
+                    bounds,
+                    1,
+                    self.optimization_budget,
+                    n_runs=n_runs,
+                    constrained=bool(equality_constraints or inequality_constraints),
+                )
+                _limit_constrained_restart_batches(
+                    settings, bool(equality_constraints or inequality_constraints)
+                )
+                if self.hybrid_n_top is not None:
+                    # Screen the discrete configurations and optimize only the best
+                    # ones, which directly yields the positions of the selected
+                    # configurations
+                    disc_idxs_iloc, cont_points, _ = optimize_acqf_hybrid_screened(
+                        acquisition_function,
+                        batch_quantity,
+                        candidates_comp,
+                        continuous_samples=to_tensor(
+                            searchspace.continuous.samples_random(
+                                self.hybrid_screening_samples
+                            )
+                        ),
+                        bounds=bounds,
+                        n_top=self.hybrid_n_top,
+                        chunk_size=self.chunk_size,
+                        n_workers=self.hybrid_n_workers,
+                        equality_constraints=equality_constraints or None,
+                        inequality_constraints=inequality_constraints or None,
+                        **settings,
                     )
-                    for c in searchspace.continuous.constraints_lin_eq
-                ]
-                or None,  # TODO: https://github.com/pytorch/botorch/issues/2042
-                inequality_constraints=[
-                    c.to_botorch(
-                        searchspace.continuous.parameters,
-                        idx_offset=len(candidates_comp.columns),
+                else:
+                    # Optimize the continuous subspace for every configuration
+                    disc_idxs_iloc, cont_points, _ = optimize_acqf_hybrid(
+                        acquisition_function,
+                        batch_quantity,
+                        candidates_comp,
+                        bounds=bounds,
+                        n_workers=self.hybrid_n_workers,
+                        equality_constraints=equality_constraints or None,
+                        inequality_constraints=inequality_constraints or None,
+                        **settings,
                     )
-                    for c in searchspace.continuous.constraints_lin_ineq
-                ]
-                or None,  # TODO: https://github.com/pytorch/botorch/issues/2042
-            )
         except AttributeError as ex:
             raise NoMCAcquisitionFunctionError(
                 f"The '{self.__class__.__name__}' only works with Monte Carlo "
                 f"acquisition functions."
             ) from ex
-
-        # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
-        # TODO [14819]: The following code is necessary due to floating point
-        #   inaccuracies introduced by BoTorch (potentially due to some float32
-        #   conversion?). The current workaround is the match the recommendations back
-        #   to the closest candidate points.
-
-        # Split discrete and continuous parts
-        disc_points = points[:, : len(candidates_comp.columns)]
-        cont_points = points[:, len(candidates_comp.columns) :]
-
-        # Find the closest match with the discrete candidates
-        candidates_comp_np = candidates_comp.to_numpy()
-        disc_points_np = disc_points.numpy()
-        if not disc_points_np.flags["C_CONTIGUOUS"]:
-            disc_points_np = np.ascontiguousarray(disc_points_np)
-        if not candidates_comp_np.flags["C_CONTIGUOUS"]:
-            candidates_comp_np = np.ascontiguousarray(candidates_comp_np)
-        disc_idxs_iloc = pairwise_distances_argmin(
-            disc_points_np, candidates_comp_np, metric="manhattan"
-        )
+        self._report_optimization(settings, n_runs, counter.count, start_time)
 
         # Get the actual search space dataframe indices
         disc_idxs_loc = candidates_comp.iloc[disc_idxs_iloc].index
@@ -450,11 +664,351 @@ class SequentialGreedyRecommender(BayesianRecommender):
         # Adjust the index of the continuous part and concatenate both
         rec_cont_exp.index = rec_disc_exp.index
         rec_exp = pd.concat([rec_disc_exp, rec_cont_exp], axis=1)
-        # <<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<
 
         return rec_exp
 
 
+@define
+class RelaxedHybridRecommender(SequentialGreedyRecommender):
+    """Recommender optimizing hybrid spaces via a continuous relaxation.
+
+    Instead of enumerating the discrete configurations of a hybrid search space, the
+    computational representation of the discrete parameters (e.g. one-hot or integer
+    encodings) is relaxed into a continuous box and optimized jointly with the
+    continuous parameters. The relaxed optima are then projected onto their nearest
+    valid discrete configurations, among which the final points are selected by
+    locally refining the continuous part
+    (see :func:`baybe.utils.optimization.optimize_acqf_hybrid_screened`). Hence, the
+    computational cost scales with the dimension of the search space rather than with
+    the number of discrete configurations.
+
+    Purely discrete and purely continuous search spaces are handled as in
+    :class:`SequentialGreedyRecommender`.
+    """
+
+    # Object variables
+    n_neighbors: int = field(default=5, validator=validators.ge(1))
+    """The number of nearest valid discrete configurations considered per relaxed
+    optimum."""
+
+    def _recommend_hybrid(
+        self,
+        acquisition_function: Callable,
+        searchspace: SearchSpace,
+        batch_quantity: int,
+    ) -> pd.DataFrame:
+        """Recommend points by optimizing a continuous relaxation of the search space.
+
+        The ``hybrid_sampler`` and ``sampling_percentage`` attributes are ignored. The
+        ``hybrid_n_top``, ``hybrid_screening_samples`` and ``hybrid_n_workers``
+        attributes control the refinement of the projected configurations.
+
+        Args:
+            acquisition_function: The acquisition function to be optimized.
+            searchspace: The search space in which the recommendations should be made.
+            batch_quantity: The size of the calculated batch.
+
+        Returns:
+            The recommended points.
+
+        Raises:
+            NoMCAcquisitionFunctionError: If a non Monte Carlo acquisition function
+                is chosen.
+        """
+        # Get discrete candidates
+        _, candidates_comp = searchspace.discrete.get_candidates(
+            allow_repeated_recommendations=True,
+            allow_recommending_already_measured=True,
+        )
+
+        # The relaxed discrete subspace spans the range of the computational
+        # representation of the discrete parameters
+        # TODO: Currently assumes that discrete parameters are first and continuous
+        #   second. Once parameter redesign [11611] is completed, we might adjust this.
+        n_discrete = len(candidates_comp.columns)
+        disc_bounds = torch.from_numpy(searchspace.discrete.comp_rep_statistics.bounds)
+        bounds = torch.cat(
+            [disc_bounds, searchspace.continuous.param_bounds_comp], dim=-1
+        )
+        equality_constraints = [
+            c.to_botorch(searchspace.continuous.parameters, idx_offset=n_discrete)
+            for c in searchspace.continuous.constraints_lin_eq
+        ]
+        inequality_constraints = [
+            c.to_botorch(searchspace.continuous.parameters, idx_offset=n_discrete)
+            for c in searchspace.continuous.constraints_lin_ineq
+        ]
+
+        # The optimization budget is split among the relaxed optimization and the
+        # refinement runs
+        n_refined = min(
+            self.hybrid_n_top or self.n_neighbors * batch_quantity,
+            len(candidates_comp),
+        )
+        n_runs = 1 + batch_quantity * n_refined
+
+        start_time = time.perf_counter()
+        try:
+            with count_evaluations(acquisition_function) as counter:
+                settings = get_budgeted_optimizer_settings(
+                    acquisition_function,
+                    bounds,
+                    batch_quantity,
+                    self.optimization_budget,
+                    n_runs=n_runs,
+                    constrained=bool(equality_constraints or inequality_constraints),
+                )
+                _limit_constrained_restart_batches(
+                    settings, bool(equality_constraints or inequality_constraints)
+                )
+
+                # Optimize the relaxed problem
+                relaxed, _ = optimize_acqf(
+                    acq_function=acquisition_function,
+                    bounds=bounds,
+                    q=batch_quantity,
+                    equality_constraints=equality_constraints or None,
+                    inequality_constraints=inequality_constraints or None,
+                    **settings,
+                )
+
+                # Project the relaxed optima onto their nearest discrete configurations,
+                # measuring distances relative to the ranges of the discrete dimensions.
+                # The cached tree of the subspace applies unless candidates are
+                # excluded from the recommendation.
+                statistics = searchspace.discrete.comp_rep_statistics
+                if (n_discrete > 0) and (
+                    len(candidates_comp) == len(searchspace.discrete.comp_rep)
+                ):
+                    candidates = searchspace.discrete.comp_rep_tree
+                else:
+                    candidates = statistics.normalize(candidates_comp.to_numpy())
+                neighbors = match_candidates(
+                    statistics.normalize(relaxed[:, :n_discrete].numpy()),
+                    candidates,
+                    k=self.n_neighbors,
+                )
+                ilocs = np.unique(neighbors)
+
+                # Locally refine the continuous part for the projected configurations,
+                # screening them at the relaxed optima and at random continuous points
+                continuous_samples = torch.cat(
+                    [
+                        relaxed[:, n_discrete:],
+                        to_tensor(
+                            searchspace.continuous.samples_random(
+                                self.hybrid_screening_samples
+                            )
+                        ),
+                    ]
+                )
+                refined_ilocs, cont_points, _ = optimize_acqf_hybrid_screened(
+                    acquisition_function,
+                    batch_quantity,
+                    candidates_comp.iloc[ilocs],
+                    continuous_samples=continuous_samples,
+                    bounds=searchspace.param_bounds_comp,
+                    n_top=self.hybrid_n_top or len(ilocs),
+                    chunk_size=self.chunk_size,
+                    n_workers=self.hybrid_n_workers,
+                    equality_constraints=equality_constraints or None,
+                    inequality_constraints=inequality_constraints or None,
+                    **settings,
+                )
+        except AttributeError as ex:
+            raise NoMCAcquisitionFunctionError(
+                f"The '{self.__class__.__name__}' only works with Monte Carlo "
+                f"acquisition functions."
+            ) from ex
+        self._report_optimization(settings, n_runs, counter.count, start_time)
+
+        # Get experimental representation of discrete and continuous parts
+        disc_idxs_loc = candidates_comp.index[ilocs[refined_ilocs]]
+        rec_disc_exp = searchspace.discrete.exp_rep.loc[disc_idxs_loc]
+        rec_cont_exp = pd.DataFrame(
+            cont_points, columns=searchspace.continuous.param_names
+        )
+
+        # Adjust the index of the continuous part and concatenate both
+        rec_cont_exp.index = rec_disc_exp.index
+        rec_exp = pd.concat([rec_disc_exp, rec_cont_exp], axis=1)
+
+        return rec_exp
+
+
+@define
+class ThompsonSamplingRecommender(BayesianRecommender):
+    """Recommender selecting the maxima of functions drawn from the posterior.
+
+    Each point of a batch is the best discrete candidate under an individual function
+    drawn from the posterior of the surrogate model. All functions are evaluated
+    jointly on streamed chunks of candidates, so that the cost of a recommendation
+    grows only mildly with the batch size, in contrast to the sequential greedy
+    optimization of batch acquisition functions. This makes the recommender suited for
+    large batches drawn from very large discrete search spaces.
+
+    The functions are drawn via
+    :func:`baybe.surrogates.Surrogate.sample_posterior_paths`. For surrogates that do
+    not support drawing functions, each candidate is sampled independently from its
+    marginal posterior distribution instead, i.e. correlations between the candidates
+    are ignored.
+
+    If several functions attain their maximum at the same candidate, the respective
+    next best candidates are selected so that all recommended points are distinct.
+    Candidates that coincide with pending experiments are not recommended. The
+    ``acquisition_function_cls`` attribute is not used otherwise.
+    """
+
+    # Class variables
+    compatibility: ClassVar[SearchSpaceType] = SearchSpaceType.DISCRETE
+    # See base class.
+
+    # Object variables
+    chunk_size: int = field(default=10_000, validator=validators.ge(1))
+    """The maximum number of discrete candidates at which the drawn functions are
+    evaluated at once."""
+
+    def _recommend_discrete(
+        self,
+        acquisition_function: Callable,
+        searchspace: SearchSpace,
+        candidates_comp: pd.DataFrame,
+        batch_quantity: int,
+    ) -> pd.Index:
+        # See base class.
+
+        # In hybrid spaces, the candidates are lifted to the full space by the partial
+        # acquisition function, whose model is used for drawing the functions
+        lift = (
+            acquisition_function._lift_partial_part
+            if isinstance(acquisition_function, PartialAcquisitionFunction)
+            else None
+        )
+        functions = _draw_posterior_functions(
+            acquisition_function.model._surrogate, batch_quantity
+        )
+
+        # The functions are not conditioned on pending experiments, which are
+        # therefore excluded from the candidates
+        candidates_comp = _drop_pending_candidates(
+            acquisition_function, candidates_comp
+        )
+        if len(candidates_comp) < batch_quantity:
+            raise NotEnoughPointsLeftError(
+                f"There are fewer than {batch_quantity} candidates left to recommend "
+                f"after excluding the pending experiments."
+            )
+
+        # Stream the candidates and keep track of the best ones of each function. Since
+        # at most ``batch_quantity - 1`` of them can be claimed by other functions, this
+        # suffices for selecting distinct points.
+        n_candidates = len(candidates_comp)
+        top_values = torch.empty((batch_quantity, 0), dtype=torch.float64)
+        top_ilocs = torch.empty((batch_quantity, 0), dtype=torch.long)
+        for start in range(0, n_candidates, self.chunk_size):
+            stop = min(start + self.chunk_size, n_candidates)
+            chunk = to_tensor(candidates_comp.iloc[start:stop])
+            if lift is not None:
+                chunk = lift(chunk).squeeze(-2)
+            values = torch.cat([top_values, functions(chunk).to(torch.float64)], dim=-1)
+            ilocs = torch.cat(
+                [top_ilocs, torch.arange(start, stop).expand(batch_quantity, -1)],
+                dim=-1,
+            )
+            top_values, idxs = torch.topk(
+                values, min(batch_quantity, values.shape[-1]), dim=-1
+            )
+            top_ilocs = torch.gather(ilocs, -1, idxs)
+
+        # Select the best candidate of each function that has not yet been selected
+        selected: List[int] = []
+        for ranking in top_ilocs.tolist():
+            selected.append(next(i for i in ranking if i not in selected))
+
+        return candidates_comp.index[selected]
+
+
+def _limit_constrained_restart_batches(
+    settings: Dict[str, Any], constrained: bool
+) -> None:
+    """Let BoTorch optimize the restarts of constrained problems one at a time.
+
+    For problems with linear constraints, BoTorch relies on SciPy's SLSQP, whose cost
+    grows cubically with the number of jointly optimized variables, so solving the
+    restarts as separate problems is considerably faster than stacking them.
+
+    Args:
+        settings: The keyword arguments for BoTorch's optimizers, modified in place.
+        constrained: Whether the optimization problem has linear constraints.
+    """
+    if constrained:
+        settings.setdefault("options", {})["batch_limit"] = 1
+
+
+def _drop_pending_candidates(
+    acquisition_function: Callable, candidates_comp: pd.DataFrame
+) -> pd.DataFrame:
+    """Drop the candidates coinciding with pending points of an acquisition function.
+
+    Args:
+        acquisition_function: The acquisition function carrying the pending points. For
+            partial acquisition functions, the pending points of the hybrid space are
+            compared via their discrete parts.
+        candidates_comp: The candidates in computational representation.
+
+    Returns:
+        The candidates that do not coincide with any pending point.
+    """
+    pending = [getattr(acquisition_function, "X_pending", None)]
+    if isinstance(acquisition_function, PartialAcquisitionFunction):
+        hybrid_pending = acquisition_function._base_X_pending
+        if hybrid_pending is not None:
+            pending.append(hybrid_pending[:, : candidates_comp.shape[1]])
+    pending = [p for p in pending if p is not None]
+    if not pending:
+        return candidates_comp
+
+    pending_comp = pd.DataFrame(
+        torch.cat(pending).detach().to(torch.float64).numpy(),
+        columns=candidates_comp.columns,
+    )
+    is_pending = pd.MultiIndex.from_frame(candidates_comp.astype(float)).isin(
+        pd.MultiIndex.from_frame(pending_comp)
+    )
+    return candidates_comp[~is_pending]
+
+
+def _draw_posterior_functions(
+    surrogate: Surrogate, n_samples: int
+) -> Callable[[Tensor], Tensor]:
+    """Draw functions from the posterior of a surrogate model.
+
+    If the surrogate does not support drawing functions from its posterior, the
+    returned callable samples independently from the marginal posterior distributions
+    of the points it is evaluated at.
+
+    Args:
+        surrogate: The fitted surrogate model.
+        n_samples: The number of functions to be drawn.
+
+    Returns:
+        A callable mapping points of shape ``(n, d)`` to the values of the drawn
+        functions, represented as a tensor of shape ``(n_samples, n)``.
+    """
+    try:
+        return surrogate.sample_posterior_paths(n_samples)
+    except NotImplementedError:
+        pass
+
+    def sample_marginals(candidates: Tensor) -> Tensor:
+        with torch.no_grad():
+            mean, var = surrogate.marginal_posterior(candidates.unsqueeze(-2))
+        mean, std = mean.squeeze(-1), var.squeeze(-1).sqrt()
+        return mean + std * torch.randn((n_samples, len(candidates)), dtype=mean.dtype)
+
+    return sample_marginals
+
+
 @define
 class NaiveHybridRecommender(Recommender):
     """Recommend points by independent optimization of subspaces.
@@ -496,6 +1050,7 @@ class NaiveHybridRecommender(Recommender):
         train_y: Optional[pd.DataFrame] = None,
         allow_repeated_recommendations: bool = False,
         allow_recommending_already_measured: bool = True,
+        pending_experiments: Optional[pd.DataFrame] = None,
     ) -> pd.DataFrame:
         # See base class.
 
@@ -524,6 +1079,7 @@ class NaiveHybridRecommender(Recommender):
                 train_y=train_y,
                 allow_repeated_recommendations=allow_repeated_recommendations,
                 allow_recommending_already_measured=allow_recommending_already_measured,
+                pending_experiments=pending_experiments,
             )
 
         # We are in a hybrid setting now
@@ -550,9 +1106,10 @@ class NaiveHybridRecommender(Recommender):
         acqf_func_dict = {}
         # We now check whether the discrete recommender is bayesian.
         if is_bayesian_recommender:
-            # Get access to the recommenders acquisition function
+            # Get access to the recommenders acquisition function. Pending experiments
+            # are points of the full hybrid space and are hence set before wrapping.
             disc_acqf = self.disc_recommender.setup_acquisition_function(
-                searchspace, train_x, train_y
+                searchspace, train_x, train_y, pending_experiments
             )
 
             # Construct the partial acquisition function that attaches cont_part
@@ -575,9 +1132,14 @@ class NaiveHybridRecommender(Recommender):
         disc_part = searchspace.discrete.comp_rep.loc[disc_rec_idx].sample(1)
         disc_part = to_tensor(disc_part).unsqueeze(-2)
 
+        # Share the recent fits of the discrete recommender, so that an identically
+        # configured continuous surrogate is not refitted to the same data
+        if is_bayesian_recommender:
+            self.cont_recommender._fit_cache = self.disc_recommender._fit_cache
+
         # Setup a fresh acquisition function for the continuous recommender
         cont_acqf = self.cont_recommender.setup_acquisition_function(
-            searchspace, train_x, train_y
+            searchspace, train_x, train_y, pending_experiments
         )
 
         # Construct the continuous space as a standalone space
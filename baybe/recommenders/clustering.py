@@ -1,16 +1,15 @@
 """Recommendation strategies based on clustering."""
 
+import inspect
 from abc import ABC
-from typing import ClassVar, List, Type, TypeVar
+from typing import Callable, ClassVar, List, Optional, Tuple, Type, TypeVar
 
 import numpy as np
 import pandas as pd
-from attrs import define, field
-from scipy.stats import multivariate_normal
-from sklearn.cluster import KMeans
+from attrs import define, field, validators
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.metrics import pairwise_distances
 from sklearn.mixture import GaussianMixture
-from sklearn.preprocessing import StandardScaler
 from sklearn_extra.cluster import KMedoids
 
 from baybe.recommenders.base import NonPredictiveRecommender
@@ -18,6 +17,96 @@ from baybe.searchspace import SearchSpace, SearchSpaceType
 
 _ScikitLearnModel = TypeVar("_ScikitLearnModel")
 
+_CHUNK_SIZE = 100_000
+"""Number of candidates that are assigned to clusters at once."""
+
+
+def _sample_coreset(
+    points: np.ndarray, size: int, weighted: bool
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Sample a subset of points representing the full set for fitting a clustering.
+
+    If weights can be used, a lightweight coreset is drawn, i.e. points are sampled
+    with probabilities mixing the uniform distribution and the squared distances to
+    the mean, and are weighted by their inverse sampling probabilities (Bachem et al.,
+    "Scalable k-Means Clustering via Lightweight Coresets", 2018). Points are sampled
+    without replacement, so that the coreset contains ``size`` distinct points.
+    Otherwise, a uniform subsample is drawn.
+
+    Args:
+        points: The points to be represented.
+        size: The number of samples to be drawn.
+        weighted: Whether the coreset may be weighted.
+
+    Returns:
+        The positional indices of the selected points and their weights (or ``None``
+        for an unweighted subsample).
+    """
+    if not weighted:
+        return np.random.choice(len(points), size, replace=False), None
+
+    sq_dists = ((points - points.mean(axis=0)) ** 2).sum(axis=1)
+    probabilities = np.full(len(points), 1 / len(points))
+    if sq_dists.sum() > 0:
+        probabilities = 0.5 * probabilities + 0.5 * sq_dists / sq_dists.sum()
+    idxs = np.random.choice(len(points), size, replace=False, p=probabilities)
+    return idxs, 1 / (size * probabilities[idxs])
+
+
+def _select_best_per_cluster(
+    points: np.ndarray,
+    n_clusters: int,
+    assign: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+) -> List[int]:
+    """Select the best-scored point of each cluster in a single chunked pass.
+
+    Args:
+        points: The points to select from.
+        n_clusters: The number of clusters.
+        assign: A callable returning, for a chunk of points, the assigned clusters and
+            the scores of the points with respect to their clusters (higher is better).
+
+    Returns:
+        The positional indices of the selected points, one per non-empty cluster, in
+        the order of the clusters.
+    """
+    best_scores = np.full(n_clusters, -np.inf)
+    best_idxs = np.full(n_clusters, -1)
+    for start in range(0, len(points), _CHUNK_SIZE):
+        clusters, scores = assign(points[start : start + _CHUNK_SIZE])
+
+        # Find the best point of each cluster within the chunk by sorting the points
+        # by cluster and decreasing score
+        order = np.lexsort((-scores, clusters))
+        chunk_clusters, first = np.unique(clusters[order], return_index=True)
+        chunk_best = order[first]
+
+        # Update the overall best points (earlier points win ties)
+        improved = scores[chunk_best] > best_scores[chunk_clusters]
+        best_scores[chunk_clusters[improved]] = scores[chunk_best[improved]]
+        best_idxs[chunk_clusters[improved]] = start + chunk_best[improved]
+    return best_idxs[best_idxs >= 0].tolist()
+
+
+def _select_closest_to_centers(centers: np.ndarray, points: np.ndarray) -> List[int]:
+    """Select the point closest to each cluster center among the points assigned to it.
+
+    Args:
+        centers: The cluster centers.
+        points: The points to select from.
+
+    Returns:
+        The positional indices of the selected points.
+    """
+
+    def assign(chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Assign the points of a chunk to their closest cluster centers."""
+        distances = pairwise_distances(chunk, centers)
+        clusters = distances.argmin(axis=1)
+        return clusters, -distances[np.arange(len(chunk)), clusters]
+
+    return _select_best_per_cluster(points, len(centers), assign)
+
 
 @define
 class SKLearnClusteringRecommender(NonPredictiveRecommender, ABC):
@@ -55,10 +144,18 @@ class SKLearnClusteringRecommender(NonPredictiveRecommender, ABC):
     """The parameters for the used model. This is initialized with reasonable default
     values for the derived child classes."""
 
+    coreset_size: Optional[int] = field(
+        default=None, validator=validators.optional(validators.ge(1))
+    )
+    """If specified, models are fit on a coreset of this many candidates instead of the
+    full candidate set, which is beneficial for large search spaces. For models
+    supporting sample weights, a weighted lightweight coreset is used, otherwise a
+    uniform subsample. The clusters are still assigned to all candidates."""
+
     def _make_selection_default(
         self,
         model: _ScikitLearnModel,
-        candidates_scaled: pd.DataFrame,
+        candidates_scaled: np.ndarray,
     ) -> List[int]:
         """Select one candidate from each cluster uniformly at random.
 
@@ -71,17 +168,22 @@ class SKLearnClusteringRecommender(NonPredictiveRecommender, ABC):
         Returns:
            A list with positional indices of the selected candidates.
         """
-        assigned_clusters = model.predict(candidates_scaled)
-        selection = [
-            np.random.choice(np.argwhere(cluster == assigned_clusters).flatten())
-            for cluster in np.unique(assigned_clusters)
-        ]
-        return selection
+
+        def assign(chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            """Assign clusters and random scores to the candidates of a chunk."""
+            return model.predict(chunk), np.random.random(len(chunk))
+
+        return _select_best_per_cluster(
+            candidates_scaled,
+            getattr(model, self.model_cluster_num_parameter_name),
+            assign,
+        )
 
     def _make_selection_custom(
         self,
         model: _ScikitLearnModel,
-        candidates_scaled: pd.DataFrame,
+        candidates_scaled: np.ndarray,
+        fit_idxs: Optional[np.ndarray] = None,
     ) -> List[int]:
         """Select candidates from the computed clustering.
 
@@ -90,6 +192,8 @@ class SKLearnClusteringRecommender(NonPredictiveRecommender, ABC):
         Args:
             model: The used model.
             candidates_scaled: The already scaled candidates.
+            fit_idxs: The positional indices of the candidates the model was fit on,
+                or ``None`` if it was fit on all candidates.
 
         Returns:
            A list with positional indices of the selected candidates.
@@ -108,23 +212,29 @@ class SKLearnClusteringRecommender(NonPredictiveRecommender, ABC):
     ) -> pd.Index:
         # See base class.
 
-        # Fit scaler on entire search space
-        # TODO [Scaling]: scaling should be handled by search space object
-        scaler = StandardScaler()
-        scaler.fit(searchspace.discrete.comp_rep)
+        # Scale candidates relative to the entire search space
+        stats = searchspace.discrete.comp_rep_statistics
+        candidates_scaled = stats.standardize(candidates_comp)
 
-        candidates_scaled = np.ascontiguousarray(scaler.transform(candidates_comp))
-
-        # Set model parameters and perform fit
+        # Set model parameters and perform fit, optionally on a coreset
         model = self.model_class(
             **{self.model_cluster_num_parameter_name: batch_quantity},
             **self.model_params,
         )
-        model.fit(candidates_scaled)
+        fit_idxs = None
+        if self.coreset_size is not None and self.coreset_size < len(candidates_scaled):
+            weighted = "sample_weight" in inspect.signature(model.fit).parameters
+            fit_idxs, weights = _sample_coreset(
+                candidates_scaled, max(self.coreset_size, batch_quantity), weighted
+            )
+            fit_kwargs = {"sample_weight": weights} if weighted else {}
+            model.fit(candidates_scaled[fit_idxs], **fit_kwargs)
+        else:
+            model.fit(candidates_scaled)
 
         # Perform selection based on assigned clusters
         if self._use_custom_selector:
-            selection = self._make_selection_custom(model, candidates_scaled)
+            selection = self._make_selection_custom(model, candidates_scaled, fit_idxs)
         else:
             selection = self._make_selection_default(model, candidates_scaled)
 
@@ -157,7 +267,8 @@ class PAMClusteringRecommender(SKLearnClusteringRecommender):
     def _make_selection_custom(
         self,
         model: _ScikitLearnModel,
-        candidates_scaled: pd.DataFrame,
+        candidates_scaled: np.ndarray,
+        fit_idxs: Optional[np.ndarray] = None,
     ) -> List[int]:
         """Select candidates from the computed clustering.
 
@@ -167,10 +278,14 @@ class PAMClusteringRecommender(SKLearnClusteringRecommender):
         Args:
             model: The used model.
             candidates_scaled: The already scaled candidates. Unused.
+            fit_idxs: The positional indices of the candidates the model was fit on,
+                or ``None`` if it was fit on all candidates.
 
         Returns:
            A list with positional indices of the selected candidates.
         """
+        if fit_idxs is not None:
+            return fit_idxs[model.medoid_indices_].tolist()
         selection = model.medoid_indices_.tolist()
         return selection
 
@@ -201,30 +316,74 @@ class KMeansClusteringRecommender(SKLearnClusteringRecommender):
     def _make_selection_custom(
         self,
         model: _ScikitLearnModel,
-        candidates_scaled: pd.DataFrame,
+        candidates_scaled: np.ndarray,
+        fit_idxs: Optional[np.ndarray] = None,
     ) -> List[int]:
         """Select candidates from the computed clustering.
 
         For K-means, a reasonable choice is to pick the points closest to each
-        cluster center.
+        cluster center. Only points that are assigned to a cluster are considered
+        for its selection, which assures that one unique point per cluster is chosen.
 
         Args:
             model: The used model.
             candidates_scaled: The already scaled candidates.
+            fit_idxs: The positional indices of the candidates the model was fit on.
+                Unused.
 
         Returns:
            A list with positional indices of the selected candidates.
         """
-        distances = pairwise_distances(candidates_scaled, model.cluster_centers_)
-        # Set the distances of points that were not assigned by the model to that
-        # cluster to infinity. This assures that one unique point per cluster is
-        # assigned.
-        predicted_clusters = model.predict(candidates_scaled)
-        for k_cluster in range(model.cluster_centers_.shape[0]):
-            idxs = predicted_clusters != k_cluster
-            distances[idxs, k_cluster] = np.inf
-        selection = np.argmin(distances, axis=0).tolist()
-        return selection
+        return _select_closest_to_centers(model.cluster_centers_, candidates_scaled)
+
+
+@define
+class MiniBatchKMeansClusteringRecommender(SKLearnClusteringRecommender):
+    """K-means initial clustering strategy fit on mini-batches of the candidates.
+
+    Scales to large candidate sets, since each iteration of the clustering only
+    considers a small random batch of candidates.
+    """
+
+    # Class variables
+    model_class: ClassVar[Type[_ScikitLearnModel]] = MiniBatchKMeans
+    # See base class.
+
+    model_cluster_num_parameter_name: ClassVar[str] = "n_clusters"
+    # See base class.
+
+    _use_custom_selector: ClassVar[bool] = True
+    # See base class.
+
+    # Object variables
+    model_params: dict = field()
+    # See base class.
+
+    @model_params.default
+    def _default_model_params(self) -> dict:
+        """Create the default model parameters."""
+        return {"batch_size": 4096, "max_iter": 100, "n_init": 3}
+
+    def _make_selection_custom(
+        self,
+        model: _ScikitLearnModel,
+        candidates_scaled: np.ndarray,
+        fit_idxs: Optional[np.ndarray] = None,
+    ) -> List[int]:
+        """Select the points closest to each cluster center.
+
+        See :meth:`KMeansClusteringRecommender._make_selection_custom`.
+
+        Args:
+            model: The used model.
+            candidates_scaled: The already scaled candidates.
+            fit_idxs: The positional indices of the candidates the model was fit on.
+                Unused.
+
+        Returns:
+           A list with positional indices of the selected candidates.
+        """
+        return _select_closest_to_centers(model.cluster_centers_, candidates_scaled)
 
 
 @define
@@ -241,32 +400,33 @@ class GaussianMixtureClusteringRecommender(SKLearnClusteringRecommender):
     def _make_selection_custom(
         self,
         model: _ScikitLearnModel,
-        candidates_scaled: pd.DataFrame,
+        candidates_scaled: np.ndarray,
+        fit_idxs: Optional[np.ndarray] = None,
     ) -> List[int]:
         """Select candidates from the computed clustering.
 
         In a GMM, a reasonable choice is to pick the point with the highest
-        probability densities for each cluster.
+        probability densities for each cluster. Only points that are assigned to a
+        cluster by the model are considered for its selection.
 
         Args:
             model: The used model.
             candidates_scaled: The already scaled candidates.
+            fit_idxs: The positional indices of the candidates the model was fit on.
+                Unused.
 
         Returns:
            A list with positional indices of the selected candidates.
         """
-        predicted_clusters = model.predict(candidates_scaled)
-        selection = []
-        for k_cluster in range(model.n_components):
-            density = multivariate_normal(
-                cov=model.covariances_[k_cluster],
-                mean=model.means_[k_cluster],
-            ).logpdf(candidates_scaled)
-
-            # For selecting a point from this cluster we only consider points that were
-            # assigned to the current cluster by the model, hence set the density of
-            # others to 0
-            density[predicted_clusters != k_cluster] = 0.0
-
-            selection.append(np.argmax(density).item())
-        return selection
+
+        def assign(chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            """Assign the candidates of a chunk to their most probable components."""
+            # The weighted log-density of a candidate under a component is the sum of
+            # the log-responsibility and the log-density under the mixture. Within a
+            # component, it ranks the candidates like their component log-density.
+            responsibilities = model.predict_proba(chunk)
+            clusters = responsibilities.argmax(axis=1)
+            scores = np.log(responsibilities[np.arange(len(chunk)), clusters])
+            return clusters, scores + model.score_samples(chunk)
+
+        return _select_best_per_cluster(candidates_scaled, model.n_components, assign)
@@ -2,9 +2,8 @@
 
 from typing import ClassVar, Optional
 
-import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
+from attrs import define, field, validators
 
 from baybe.recommenders.base import NonPredictiveRecommender
 from baybe.searchspace import SearchSpace, SearchSpaceType
@@ -51,6 +50,7 @@ class RandomRecommender(NonPredictiveRecommender):
         return pd.concat([disc_random, cont_random], axis=1)
 
 
+@define
 class FPSRecommender(NonPredictiveRecommender):
     """An initial strategy that selects the candidates via Farthest Point Sampling."""
 
@@ -58,6 +58,16 @@ class FPSRecommender(NonPredictiveRecommender):
     compatibility: ClassVar[SearchSpaceType] = SearchSpaceType.DISCRETE
     # See base class.
 
+    # Object variables
+    initialization: str = field(
+        validator=validators.in_(["farthest", "projection", "random"]),
+        default="farthest",
+    )
+    """Strategy used for selecting the first points, see
+    :func:`baybe.utils.sampling_algorithms.farthest_point_sampling`. For very large
+    candidate sets, ``"projection"`` avoids the quadratic search for the farthest
+    pair of candidates."""
+
     def _recommend_discrete(
         self,
         searchspace: SearchSpace,
@@ -66,10 +76,10 @@ class FPSRecommender(NonPredictiveRecommender):
     ) -> pd.Index:
         # See base class.
 
-        # Fit scaler on entire search space
-        # TODO [Scaling]: scaling should be handled by search space object
-        scaler = StandardScaler()
-        scaler.fit(searchspace.discrete.comp_rep)
-        candidates_scaled = np.ascontiguousarray(scaler.transform(candidates_comp))
-        ilocs = farthest_point_sampling(candidates_scaled, batch_quantity)
+        # Scale candidates relative to the entire search space
+        stats = searchspace.discrete.comp_rep_statistics
+        candidates_scaled = stats.standardize(candidates_comp)
+        ilocs = farthest_point_sampling(
+            candidates_scaled, batch_quantity, initialization=self.initialization
+        )
         return candidates_comp.index[ilocs]
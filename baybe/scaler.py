@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, Tuple, Type
+from typing import Callable, Dict, Optional, Tuple, Type
 
 import pandas as pd
 import torch
@@ -19,6 +19,9 @@ class Scaler(ABC):
 
     Args:
         searchspace: The search space that should be scaled.
+        bounds: Optional precomputed bounds of the search space (minima in the first
+            row, maxima in the second row). If provided, the bounds are not derived
+            from ``searchspace`` during fitting.
     """
 
     type: str
@@ -27,8 +30,9 @@ class Scaler(ABC):
     SUBCLASSES: Dict[str, Type[Scaler]] = {}
     """Class variable for all subclasses"""
 
-    def __init__(self, searchspace: pd.DataFrame):
+    def __init__(self, searchspace: pd.DataFrame, bounds: Optional[Tensor] = None):
         self.searchspace = searchspace
+        self.bounds = bounds
         self.fitted = False
         self.scale_x: _ScaleFun
         self.scale_y: _ScaleFun
@@ -101,15 +105,30 @@ class DefaultScaler(Scaler):
         # See base class.
 
         # Get the searchspace boundaries
-        searchspace = to_tensor(self.searchspace)
-        bounds = torch.vstack(
-            [torch.min(searchspace, dim=0)[0], torch.max(searchspace, dim=0)[0]]
-        )
+        if self.bounds is not None:
+            bounds = self.bounds
+        else:
+            searchspace = to_tensor(self.searchspace)
+            bounds = torch.vstack(
+                [torch.min(searchspace, dim=0)[0], torch.max(searchspace, dim=0)[0]]
+            )
 
         # Compute the mean and standard deviation of the training targets
         mean = torch.mean(y, dim=0)
         std = torch.std(y, dim=0)
 
+        self._statistics = (bounds, mean, std)
+        self._set_scaling_functions()
+
+        # Flag that the scaler has been fitted
+        self.fitted = True
+
+        return self.scale_x(x), self.scale_y(y)
+
+    def _set_scaling_functions(self) -> None:
+        """Create the scaling functions from the fitted statistics."""
+        bounds, mean, std = self._statistics
+
         # Functions for input and target scaling
         self.scale_x = lambda x: (x - bounds[0]) / (bounds[1] - bounds[0])
         self.scale_y = lambda x: (x - mean) / std
@@ -122,7 +141,20 @@ class DefaultScaler(Scaler):
         self.unscale_m = lambda x: x * std + mean
         self.unscale_s = lambda x: x * std**2
 
-        # Flag that the scaler has been fitted
-        self.fitted = True
+    def __getstate__(self) -> dict:
+        """Return the picklable state of the scaler.
 
-        return self.scale_x(x), self.scale_y(y)
+        Only the fitted statistics are stored, from which the scaling functions are
+        recreated upon unpickling. The search space representation is not stored since
+        it (like the optional precomputed bounds) is only required for fitting.
+        """
+        state = {"fitted": self.fitted, "searchspace": None, "bounds": None}
+        if self.fitted:
+            state["_statistics"] = self._statistics
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the scaler from its pickled state."""
+        self.__dict__.update(state)
+        if self.fitted:
+            self._set_scaling_functions()
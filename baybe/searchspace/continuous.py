@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import torch
-from attr import define, field
-from botorch.utils.sampling import get_polytope_samples
+from attr import define, field, setters
+from scipy.linalg import null_space
 
 from baybe.constraints import (
     ContinuousLinearEqualityConstraint,
@@ -17,6 +17,129 @@ from baybe.constraints import (
 from baybe.parameters import NumericalContinuousParameter
 from baybe.searchspace.validation import validate_parameter_names
 from baybe.utils import DTypeFloatTorch
+from baybe.utils.sampling_algorithms import PolytopeSampler
+
+_CONSTRAINT_TOLERANCE = 1e-8
+"""Absolute tolerance for the consistency and redundancy checks of constraints."""
+
+
+def _constraints_to_dense(
+    constraints: List[Any], parameters: List[NumericalContinuousParameter]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert linear constraints into a dense coefficient matrix and rhs vector."""
+    matrix = np.zeros((len(constraints), len(parameters)))
+    rhs = np.zeros(len(constraints))
+    for k, constraint in enumerate(constraints):
+        idxs, coefficients, rhs[k] = constraint.to_botorch(parameters)
+        matrix[k, idxs.numpy()] = coefficients.numpy()
+    return matrix, rhs
+
+
+@define(frozen=True)
+class NullSpaceParameterization:
+    """Parameterization of a continuous subspace eliminating its equality constraints.
+
+    All points satisfying the linear equality constraints ``A x = b`` of a subspace are
+    written as ``x = offset + basis @ z``, where the columns of ``basis`` form an
+    orthonormal basis of the null space of ``A``. Optimizers and samplers can thus work
+    with the unconstrained free coordinates ``z``, in which the parameter bounds and
+    the linear inequality constraints of the subspace turn into the linear inequality
+    constraints ``inequality_matrix @ z >= inequality_rhs``.
+    """
+
+    offset: np.ndarray
+    """The minimum-norm solution of the equality constraints."""
+
+    basis: np.ndarray
+    """The orthonormal null-space basis, with one column per free coordinate."""
+
+    bounds: np.ndarray
+    """Box bounds of the free coordinates (first row: lower, second row: upper)
+    enclosing the feasible region."""
+
+    inequality_matrix: np.ndarray
+    """The coefficients of the inequality constraints in the free coordinates."""
+
+    inequality_rhs: np.ndarray
+    """The right-hand sides of the inequality constraints in the free coordinates."""
+
+    @classmethod
+    def from_subspace(cls, subspace: SubspaceContinuous) -> NullSpaceParameterization:
+        """Compute the parameterization of a given subspace.
+
+        Args:
+            subspace: The continuous subspace to be parameterized.
+
+        Returns:
+            The computed parameterization.
+
+        Raises:
+            ValueError: If the equality constraints of the subspace are inconsistent.
+        """
+        n_dims = len(subspace.parameters)
+        lower, upper = subspace.param_bounds_comp.numpy()
+
+        # Particular solution and null-space basis of the equality constraints
+        eq_matrix, eq_rhs = _constraints_to_dense(
+            subspace.constraints_lin_eq, subspace.parameters
+        )
+        offset = np.linalg.lstsq(eq_matrix, eq_rhs, rcond=None)[0]
+        if not np.allclose(eq_matrix @ offset, eq_rhs, atol=_CONSTRAINT_TOLERANCE):
+            raise ValueError(
+                "The linear equality constraints of the subspace are inconsistent."
+            )
+        basis = null_space(eq_matrix) if len(eq_matrix) else np.eye(n_dims)
+
+        # The parameter bounds and inequality constraints expressed in free coordinates
+        ineq_matrix, ineq_rhs = _constraints_to_dense(
+            subspace.constraints_lin_ineq, subspace.parameters
+        )
+        matrix = np.vstack([basis, -basis, ineq_matrix @ basis])
+        rhs = np.concatenate(
+            [lower - offset, offset - upper, ineq_rhs - ineq_matrix @ offset]
+        )
+        informative = np.abs(matrix).max(axis=1, initial=0.0) > _CONSTRAINT_TOLERANCE
+
+        # Interval arithmetic yields box bounds enclosing the feasible region
+        corners = np.stack([basis.T * (lower - offset), basis.T * (upper - offset)])
+        bounds = np.stack([corners.min(axis=0).sum(1), corners.max(axis=0).sum(1)])
+
+        return cls(offset, basis, bounds, matrix[informative], rhs[informative])
+
+    @property
+    def n_free(self) -> int:
+        """The number of free coordinates."""
+        return self.basis.shape[1]
+
+    def to_reduced(self, points: np.ndarray) -> np.ndarray:
+        """Map points of the subspace to their free coordinates.
+
+        Args:
+            points: The points in the original coordinates, one per row.
+
+        Returns:
+            The free coordinates of the (projected) points.
+        """
+        return (points - self.offset) @ self.basis
+
+    def from_reduced(self, coordinates: np.ndarray) -> np.ndarray:
+        """Map free coordinates back to points of the subspace.
+
+        Args:
+            coordinates: The free coordinates, one point per row.
+
+        Returns:
+            The points in the original coordinates, which satisfy the equality
+            constraints.
+        """
+        return self.offset + coordinates @ self.basis.T
+
+
+def _reset_cached_attributes(instance: SubspaceContinuous, _: Any, value: Any) -> Any:
+    """Invalidate the cached attributes of a subspace whose content is changed."""
+    instance._null_space_parameterization = None
+    instance._sampler = None
+    return value
 
 
 @define
@@ -29,18 +152,31 @@ class SubspaceContinuous:
     """
 
     parameters: List[NumericalContinuousParameter] = field(
-        validator=lambda _1, _2, x: validate_parameter_names(x)
+        validator=lambda _1, _2, x: validate_parameter_names(x),
+        on_setattr=[setters.validate, _reset_cached_attributes],
     )
     """The list of parameters of the subspace."""
 
-    constraints_lin_eq: List[ContinuousLinearEqualityConstraint] = field(factory=list)
+    constraints_lin_eq: List[ContinuousLinearEqualityConstraint] = field(
+        factory=list, on_setattr=_reset_cached_attributes
+    )
     """List of linear equality constraints."""
 
     constraints_lin_ineq: List[ContinuousLinearInequalityConstraint] = field(
-        factory=list
+        factory=list, on_setattr=_reset_cached_attributes
     )
     """List of linear inequality constraints."""
 
+    _null_space_parameterization: Optional[NullSpaceParameterization] = field(
+        init=False, default=None, eq=False, repr=False
+    )
+    """Cached null-space parameterization of the subspace."""
+
+    _sampler: Optional[PolytopeSampler] = field(
+        init=False, default=None, eq=False, repr=False
+    )
+    """Cached sampler of the subspace."""
+
     @classmethod
     def empty(cls) -> SubspaceContinuous:
         """Create an empty continuous subspace."""
@@ -102,6 +238,45 @@ class SubspaceContinuous:
             return torch.empty(2, 0, dtype=DTypeFloatTorch)
         return torch.stack([p.bounds.to_tensor() for p in self.parameters]).T
 
+    @property
+    def null_space_parameterization(self) -> Optional[NullSpaceParameterization]:
+        """Return the parameterization eliminating the equality constraints.
+
+        The parameterization is computed upon first access and cached until the
+        parameters or constraints of the subspace are reassigned. ``None`` is returned
+        if the subspace has no equality constraints.
+        """
+        if not self.constraints_lin_eq:
+            return None
+        if self._null_space_parameterization is None:
+            self._null_space_parameterization = NullSpaceParameterization.from_subspace(
+                self
+            )
+        return self._null_space_parameterization
+
+    @property
+    def sampler(self) -> PolytopeSampler:
+        """Return the sampler used for drawing random points from the subspace.
+
+        If the subspace has equality constraints, the sampler operates in the free
+        coordinates of its :attr:`null_space_parameterization`. The sampler is created
+        upon first access and kept, together with the state of its chains, until the
+        parameters or constraints of the subspace are reassigned.
+        """
+        if self._sampler is None:
+            if (parameterization := self.null_space_parameterization) is None:
+                self._sampler = PolytopeSampler(
+                    self.param_bounds_comp.numpy(),
+                    *_constraints_to_dense(self.constraints_lin_ineq, self.parameters),
+                )
+            else:
+                self._sampler = PolytopeSampler(
+                    parameterization.bounds,
+                    parameterization.inequality_matrix,
+                    parameterization.inequality_rhs,
+                )
+        return self._sampler
+
     def transform(
         self,
         data: pd.DataFrame,
@@ -132,16 +307,18 @@ class SubspaceContinuous:
         if not self.parameters:
             return pd.DataFrame()
 
-        points = get_polytope_samples(
-            n=n_points,
-            bounds=self.param_bounds_comp,
-            equality_constraints=[
-                c.to_botorch(self.parameters) for c in self.constraints_lin_eq
-            ],
-            inequality_constraints=[
-                c.to_botorch(self.parameters) for c in self.constraints_lin_ineq
-            ],
-        )
+        if (parameterization := self.null_space_parameterization) is None:
+            points = self.sampler.sample(n_points)
+            return pd.DataFrame(points, columns=self.param_names)
+
+        # With equality constraints, the points are sampled in the free coordinates of
+        # the subspace, which are mapped back afterwards
+        if parameterization.n_free == 0:
+            coordinates = np.zeros((n_points, 0))
+        else:
+            coordinates = self.sampler.sample(n_points)
+        lower, upper = self.param_bounds_comp.numpy()
+        points = np.clip(parameterization.from_reduced(coordinates), lower, upper)
 
         return pd.DataFrame(points, columns=self.param_names)
 
@@ -7,8 +7,9 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
 import numpy as np
 import pandas as pd
 import torch
-from attr import define, field
+from attr import define, field, setters
 from cattrs import IterableValidationError
+from scipy.spatial import cKDTree
 
 from baybe.constraints import DISCRETE_CONSTRAINTS_FILTERING_ORDER
 from baybe.constraints.base import DiscreteConstraint
@@ -24,6 +25,88 @@ from baybe.utils import df_drop_single_value_columns, eq_dataframe, fuzzy_row_ma
 _METADATA_COLUMNS = ["was_recommended", "was_measured", "dont_recommend"]
 
 
+@define(frozen=True)
+class CompRepStatistics:
+    """Column statistics of the computational representation of a discrete subspace.
+
+    The statistics are computed in a single pass over the computational representation
+    and are shared by all components that need to scale data relative to the search
+    space (e.g. surrogate scalers and non-predictive recommenders).
+    """
+
+    bounds: np.ndarray
+    """The column-wise minima (first row) and maxima (second row)."""
+
+    mean: np.ndarray
+    """The column-wise means."""
+
+    var: np.ndarray
+    """The column-wise (population) variances."""
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> CompRepStatistics:
+        """Compute the statistics of a given computational representation.
+
+        Args:
+            df: The computational representation.
+
+        Returns:
+            The computed statistics.
+        """
+        values = df.to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            nans = np.full(values.shape[1], np.nan)
+            return cls(np.vstack([nans, nans]), nans, nans)
+        mean = values.mean(axis=0)
+        return cls(
+            bounds=np.vstack([values.min(axis=0), values.max(axis=0)]),
+            mean=mean,
+            var=((values - mean) ** 2).mean(axis=0),
+        )
+
+    def normalize(self, data: np.ndarray) -> np.ndarray:
+        """Scale data to the unit range of the columns of the subspace.
+
+        Columns with zero range are only shifted.
+
+        Args:
+            data: The data to be normalized, given in computational representation.
+
+        Returns:
+            The normalized data.
+        """
+        span = self.bounds[1] - self.bounds[0]
+        span[~(span > 0)] = 1.0
+        return (np.asarray(data, dtype=np.float64) - self.bounds[0]) / span
+
+    def standardize(self, data: pd.DataFrame) -> np.ndarray:
+        """Standardize data to zero mean and unit variance relative to the subspace.
+
+        Mirrors :class:`sklearn.preprocessing.StandardScaler` fitted on the full
+        computational representation, i.e. columns with zero variance are only
+        centered.
+
+        Args:
+            data: The data to be standardized, given in computational representation.
+
+        Returns:
+            The standardized data as contiguous array.
+        """
+        scale = np.sqrt(self.var)
+        scale[~(scale > 10 * np.finfo(scale.dtype).eps)] = 1.0
+        return np.ascontiguousarray(
+            (data.to_numpy(dtype=np.float64) - self.mean) / scale
+        )
+
+
+def _reset_cached_statistics(instance: SubspaceDiscrete, _: Any, value: Any) -> Any:
+    """Invalidate the cached statistics of a subspace whose content is changed."""
+    instance._comp_rep_statistics = None
+    instance._comp_rep_tree = None
+    instance._param_bounds_comp = None
+    return value
+
+
 @define
 class SubspaceDiscrete:
     """Class for managing discrete subspaces.
@@ -34,7 +117,8 @@ class SubspaceDiscrete:
     """
 
     parameters: List[DiscreteParameter] = field(
-        validator=lambda _1, _2, x: validate_parameter_names(x)
+        validator=lambda _1, _2, x: validate_parameter_names(x),
+        on_setattr=[setters.validate, _reset_cached_statistics],
     )
     """The list of parameters of the subspace."""
 
@@ -50,12 +134,27 @@ class SubspaceDiscrete:
     constraints: List[DiscreteConstraint] = field(factory=list)
     """A list of constraints for restricting the space."""
 
-    comp_rep: pd.DataFrame = field(eq=eq_dataframe)
+    comp_rep: pd.DataFrame = field(eq=eq_dataframe, on_setattr=_reset_cached_statistics)
     """The computational representation of the space. Technically not required but added
     as an optional initializer argument to allow ingestion from e.g. serialized objects
     and thereby speed up construction. If not provided, the default hook will derive it
     from ``exp_rep``."""
 
+    _comp_rep_statistics: Optional[CompRepStatistics] = field(
+        init=False, default=None, eq=False, repr=False
+    )
+    """Cached statistics of the computational representation."""
+
+    _comp_rep_tree: Optional[cKDTree] = field(
+        init=False, default=None, eq=False, repr=False
+    )
+    """Cached KD-tree of the normalized computational representation."""
+
+    _param_bounds_comp: Optional[torch.Tensor] = field(
+        init=False, default=None, eq=False, repr=False
+    )
+    """Cached parameter bounds in computational representation."""
+
     @exp_rep.validator
     def _validate_exp_rep(  # noqa: DOC101, DOC103
         self, _: Any, exp_rep: pd.DataFrame
@@ -259,15 +358,47 @@ class SubspaceDiscrete:
         """
         if not self.parameters:
             return torch.empty(2, 0)
-        bounds = np.hstack(
-            [
-                np.vstack([p.comp_df[col].min(), p.comp_df[col].max()])
-                for p in self.parameters
-                for col in p.comp_df
-                if col in self.comp_rep.columns
-            ]
-        )
-        return torch.from_numpy(bounds)
+        if self._param_bounds_comp is None:
+            columns = set(self.comp_rep.columns)
+            bounds = np.hstack(
+                [
+                    np.vstack([p.comp_df[col].min(), p.comp_df[col].max()])
+                    for p in self.parameters
+                    for col in p.comp_df
+                    if col in columns
+                ]
+            )
+            self._param_bounds_comp = torch.from_numpy(bounds)
+        return self._param_bounds_comp.clone()
+
+    @property
+    def comp_rep_statistics(self) -> CompRepStatistics:
+        """Return the column statistics of the computational representation.
+
+        The statistics are computed upon first access and cached until the
+        computational representation (or the parameters) of the subspace are
+        reassigned. Note that in-place modifications of :attr:`comp_rep` are not
+        tracked.
+        """
+        if self._comp_rep_statistics is None:
+            self._comp_rep_statistics = CompRepStatistics.from_dataframe(self.comp_rep)
+        return self._comp_rep_statistics
+
+    @property
+    def comp_rep_tree(self) -> cKDTree:
+        """Return a KD-tree of the normalized computational representation.
+
+        The computational representation is normalized to the unit range of its
+        columns (see :meth:`CompRepStatistics.normalize`), so that the tree allows
+        nearest neighbor lookups relative to the extent of the subspace (see
+        :func:`baybe.utils.optimization.match_candidates`). The tree is built upon
+        first access and cached like :attr:`comp_rep_statistics`.
+        """
+        if self._comp_rep_tree is None:
+            self._comp_rep_tree = cKDTree(
+                self.comp_rep_statistics.normalize(self.comp_rep.to_numpy())
+            )
+        return self._comp_rep_tree
 
     def mark_as_measured(
         self,
@@ -50,6 +50,7 @@ class Strategy(SerialMixin, ABC):
         batch_quantity: int = 1,
         train_x: Optional[pd.DataFrame] = None,
         train_y: Optional[pd.DataFrame] = None,
+        pending_experiments: Optional[pd.DataFrame] = None,
     ) -> pd.DataFrame:
         """Recommend the next experiments to be conducted.
 
@@ -58,6 +59,8 @@ class Strategy(SerialMixin, ABC):
             batch_quantity: The number of experiments to be conducted in parallel.
             train_x: The features of the conducted experiments.
             train_y: The corresponding response values.
+            pending_experiments: The features of experiments that have been started
+                but whose response values are not yet available.
 
         Returns:
             The DataFrame with the specific experiments recommended.
@@ -75,6 +78,7 @@ class Strategy(SerialMixin, ABC):
             train_y,
             self.allow_repeated_recommendations,
             self.allow_recommending_already_measured,
+            pending_experiments,
         )
 
 
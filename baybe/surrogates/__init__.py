@@ -1,6 +1,6 @@
 """BayBE surrogates."""
 
-from baybe.surrogates.base import get_available_surrogates
+from baybe.surrogates.base import get_available_surrogates, trusted_fitted_states
 from baybe.surrogates.custom import _ONNX_INSTALLED, register_custom_architecture
 from baybe.surrogates.gaussian_process import GaussianProcessSurrogate
 from baybe.surrogates.linear import BayesianLinearSurrogate
@@ -11,6 +11,7 @@ from baybe.surrogates.random_forest import RandomForestSurrogate
 __all__ = [
     "get_available_surrogates",
     "register_custom_architecture",
+    "trusted_fitted_states",
     "BayesianLinearSurrogate",
     "GaussianProcessSurrogate",
     "MeanPredictionSurrogate",
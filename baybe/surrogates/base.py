@@ -1,16 +1,25 @@
 """Base functionality for all BayBE surrogates."""
 
+import base64
 import gc
+import pickle
 import sys
+import warnings
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, Dict, List, Tuple, Type
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Tuple, Type
 
 import torch
-from attr import define, field
+from attr import define, field, fields
 from torch import Tensor
 
 from baybe.searchspace import SearchSpace
-from baybe.surrogates.utils import _prepare_inputs, _prepare_targets
+from baybe.surrogates.utils import (
+    _prepare_candidates,
+    _prepare_inputs,
+    _prepare_targets,
+)
 from baybe.utils import SerialMixin
 from baybe.utils.serialization import converter, get_subclasses, unstructure_base
 
@@ -36,6 +45,33 @@ bytes to string and back, since the specification is a bijection between
 """
 
 
+_TRUSTED_FITTED_STATES: "ContextVar[bool]" = ContextVar(
+    "_TRUSTED_FITTED_STATES", default=False
+)
+"""Flag indicating whether persisted fitted states are restored when deserializing
+surrogates (see :func:`trusted_fitted_states`)."""
+
+
+@contextmanager
+def trusted_fitted_states() -> Iterator[None]:
+    """Restore the persisted fitted states of surrogates deserialized in this context.
+
+    Fitted states are persisted in pickled form (see
+    :attr:`baybe.surrogates.base.Surrogate.persist_fitted_state`), and unpickling
+    data can execute arbitrary code. Hence, persisted states are ignored when
+    deserializing surrogates, unless the deserialization takes place within this
+    context. It should only be entered for serialized objects from trusted sources.
+
+    Yields:
+        Nothing.
+    """
+    token = _TRUSTED_FITTED_STATES.set(True)
+    try:
+        yield
+    finally:
+        _TRUSTED_FITTED_STATES.reset(token)
+
+
 @define
 class Surrogate(ABC, SerialMixin):
     """Abstract base class for all surrogate models."""
@@ -48,6 +84,19 @@ class Surrogate(ABC, SerialMixin):
     """Class variable encoding whether or not the surrogate supports transfer
     learning."""
 
+    supports_batched_posterior: ClassVar[bool] = False
+    """Class variable encoding whether or not the posterior computation natively
+    supports t-batched inputs of shape ``(*t, q, d)``. If so, batched inputs are passed
+    to the posterior as a whole instead of being split by
+    :func:`baybe.surrogates.utils.batchify`."""
+
+    posterior_memory_limit: ClassVar[int] = 2**27
+    """Class variable specifying the maximum memory (in bytes) of the covariance
+    matrices computed in a single posterior call when
+    :func:`baybe.surrogates.utils.batchify` groups several t-batches of a joint
+    posterior model into one call. For posteriors that cannot be vectorized, this
+    includes the covariances between the grouped t-batches."""
+
     # Object variables
     # TODO: In a next refactoring, the user friendliness could be improved by directly
     #   exposing the individual model parameters via the constructor, instead of
@@ -56,6 +105,18 @@ class Surrogate(ABC, SerialMixin):
     model_params: Dict[str, Any] = field(factory=dict)
     """Optional model parameters."""
 
+    _fit_fingerprint: Optional[str] = field(init=False, default=None, eq=False)
+    """The fingerprint of the data and configuration of the last fit performed via a
+    recommender (see :func:`baybe.surrogates.utils.compute_fit_fingerprint`), which
+    allows to skip refitting on unchanged data. Reset by every call to ``fit``."""
+
+    persist_fitted_state: bool = field(default=False, kw_only=True)
+    """Flag indicating whether the fitted model state is included in the serialized
+    surrogate, together with the fingerprint of the corresponding fit. A recommender
+    using a deserialized surrogate skips the refit when the fingerprint matches its
+    training data. Since the state is stored in pickled form, it is only restored
+    when deserializing within :func:`baybe.surrogates.base.trusted_fitted_states`."""
+
     def posterior(self, candidates: Tensor) -> Tuple[Tensor, Tensor]:
         """Evaluate the surrogate model at the given candidate points.
 
@@ -67,13 +128,15 @@ class Surrogate(ABC, SerialMixin):
 
         Returns:
             The posterior means and posterior covariance matrices of the t-batched
-            candidate points.
+            candidate points, represented in the current scoring precision (see
+            :func:`baybe.utils.numeric.scoring_precision`).
         """
         # Prepare the input
-        candidates = _prepare_inputs(candidates)
+        candidates = _prepare_candidates(candidates)
 
-        # Evaluate the posterior distribution
+        # Evaluate the posterior distribution in the precision of the candidates
         mean, covar = self._posterior(candidates)
+        mean, covar = mean.to(candidates.dtype), covar.to(candidates.dtype)
 
         # Apply covariance transformation for marginal posterior models
         if not self.joint_posterior:
@@ -85,6 +148,57 @@ class Surrogate(ABC, SerialMixin):
 
         return mean, covar
 
+    def marginal_posterior(self, candidates: Tensor) -> Tuple[Tensor, Tensor]:
+        """Evaluate the marginal posterior distributions at the given candidate points.
+
+        In contrast to :func:`baybe.surrogates.Surrogate.posterior`, only the marginal
+        variances of the candidates are returned. For surrogates without joint
+        posterior, this avoids the construction of dense covariance matrices.
+
+        Args:
+            candidates: The candidate points, represented as a tensor of shape
+                ``(*t, q, d)`` (see :func:`baybe.surrogates.Surrogate.posterior`).
+
+        Returns:
+            The posterior means and posterior variances of the t-batched candidate
+            points, both of shape ``(*t, q)``.
+        """
+        # Prepare the input
+        candidates = _prepare_candidates(candidates)
+
+        # Evaluate the posterior distribution in the precision of the candidates
+        mean, covar = self._posterior(candidates)
+        mean, covar = mean.to(candidates.dtype), covar.to(candidates.dtype)
+
+        # Extract the marginal variances of joint posterior models
+        var = covar.diagonal(dim1=-2, dim2=-1) if self.joint_posterior else covar
+
+        # Add small variances for numerical stability
+        return mean, var + _MIN_VARIANCE
+
+    def sample_posterior_paths(self, n_samples: int) -> Callable[[Tensor], Tensor]:
+        """Draw functions from the posterior distribution of the surrogate model.
+
+        In contrast to sampling the posterior at a fixed set of points, each drawn
+        function can be evaluated consistently at arbitrary points, e.g. when scoring
+        a large candidate set in chunks.
+
+        Args:
+            n_samples: The number of functions to be drawn.
+
+        Returns:
+            A callable that maps candidates of shape ``(n, d)`` to the values of the
+            drawn functions, represented as a tensor of shape ``(n_samples, n)``.
+
+        Raises:
+            NotImplementedError: If the surrogate does not support drawing functions
+                from its posterior.
+        """
+        raise NotImplementedError(
+            f"'{self.__class__.__name__}' does not support drawing functions from "
+            f"its posterior."
+        )
+
     @abstractmethod
     def _posterior(self, candidates: Tensor) -> Tuple[Tensor, Tensor]:
         """Perform the actual posterior evaluation logic.
@@ -143,6 +257,9 @@ class Surrogate(ABC, SerialMixin):
         train_x = _prepare_inputs(train_x)
         train_y = _prepare_targets(train_y)
 
+        # The fingerprint of a previous fit becomes invalid
+        self._fit_fingerprint = None
+
         return self._fit(searchspace, train_x, train_y)
 
     @abstractmethod
@@ -156,6 +273,31 @@ class Surrogate(ABC, SerialMixin):
         See :func:`baybe.surrogates.Surrogate.fit` for details on the parameters.
         """
 
+    def _get_fitted_state(self) -> Dict[str, Any]:
+        """Collect the state created by fitting the surrogate.
+
+        By default, the state consists of all attributes that are not set via the
+        constructor (except the fit fingerprint). Surrogates with non-picklable or
+        non-fitted internal attributes need to override this method.
+
+        Returns:
+            A picklable dictionary of the fitted state.
+        """
+        return {
+            fld.name: getattr(self, fld.name)
+            for fld in fields(self.__class__)
+            if (not fld.init) and (fld.name != "_fit_fingerprint")
+        }
+
+    def _set_fitted_state(self, state: Dict[str, Any]) -> None:
+        """Restore a state collected via ``_get_fitted_state``.
+
+        Args:
+            state: The fitted state.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
 
 def _decode_onnx_str(raw_unstructure_hook):
     """Decode ONNX string for serialization purposes."""
@@ -189,6 +331,23 @@ def _block_serialize_custom_architecture(raw_unstructure_hook):
     return wrapper
 
 
+def _attach_fitted_state(raw_unstructure_hook):
+    """Attach the fitted state to the serialized surrogate if requested."""
+
+    def wrapper(obj):
+        dict_ = raw_unstructure_hook(obj)
+        if obj.persist_fitted_state and (obj._fit_fingerprint is not None):
+            state = pickle.dumps(obj._get_fitted_state())
+            dict_["fitted_state"] = {
+                "fingerprint": obj._fit_fingerprint,
+                "state": base64.b64encode(state).decode("utf-8"),
+            }
+
+        return dict_
+
+    return wrapper
+
+
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>> Temporary workaround >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
 def _structure_surrogate(val, _):
     """Structure a surrogate model."""
@@ -217,7 +376,24 @@ def _structure_surrogate(val, _):
     if onnx_str and isinstance(onnx_str, str):
         val["onnx_str"] = onnx_str.encode(_ONNX_ENCODING)
 
-    return converter.structure_attrs_fromdict(val, cls)
+    fitted_state = val.pop("fitted_state", None)
+    surrogate = converter.structure_attrs_fromdict(val, cls)
+
+    # Restore the persisted fit, which requires unpickling and is hence only done
+    # for trusted sources
+    if (fitted_state is not None) and (not _TRUSTED_FITTED_STATES.get()):
+        warnings.warn(
+            f"The persisted fitted state of the '{_type}' surrogate is ignored and the "
+            f"surrogate will be refitted. To restore the state of a serialized object "
+            f"from a trusted source, deserialize it within 'trusted_fitted_states'.",
+            UserWarning,
+        )
+    elif fitted_state is not None:
+        state = base64.b64decode(fitted_state["state"].encode("utf-8"))
+        surrogate._set_fitted_state(pickle.loads(state))
+        surrogate._fit_fingerprint = fitted_state["fingerprint"]
+
+    return surrogate
 
 
 def get_available_surrogates() -> List[Type[Surrogate]]:
@@ -246,11 +422,15 @@ def get_available_surrogates() -> List[Type[Surrogate]]:
     return [cl for cl in available_classes if cl is not None]
 
 
+_unstructure_surrogate_config = _decode_onnx_str(
+    _block_serialize_custom_architecture(unstructure_base)
+)
+"""Unstructure the configuration of a surrogate, i.e. without its fitted state."""
+
 # Register (un-)structure hooks
 # TODO: Needs to be refactored
 converter.register_unstructure_hook(
-    Surrogate,
-    _decode_onnx_str(_block_serialize_custom_architecture(unstructure_base)),
+    Surrogate, _attach_fitted_state(_unstructure_surrogate_config)
 )
 converter.register_structure_hook(Surrogate, _structure_surrogate)
 
@@ -8,8 +8,9 @@ trained and attempts to do so for each new DOE iteration.
 It is planned to solve this issue in the future.
 """
 
-from typing import Callable, ClassVar, Tuple
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 
+import numpy as np
 import torch
 from attrs import define, field, validators
 from torch import Tensor
@@ -41,6 +42,8 @@ def register_custom_architecture(
     joint_posterior_attr: bool = False,
     constant_target_catching: bool = True,
     batchify_posterior: bool = True,
+    batched_posterior_attr: bool = False,
+    posterior_memory_limit_attr: int = Surrogate.posterior_memory_limit,
 ) -> Callable:
     """Wrap a given custom model architecture class into a ```Surrogate```.
 
@@ -51,6 +54,12 @@ def register_custom_architecture(
             constant target values and needs the @catch_constant_targets decorator.
         batchify_posterior: Boolean indicating if the model is incompatible
             with t- and q-batching and needs the @batchify decorator for its posterior.
+        batched_posterior_attr: Boolean indicating if the posterior natively supports
+            t-batched inputs of shape ``(*t, q, d)``, in which case batched inputs are
+            passed through by the @batchify decorator.
+        posterior_memory_limit_attr: The maximum memory (in bytes) of the covariance
+            matrices computed in a single posterior call when the @batchify decorator
+            groups several t-batches of a joint posterior model into one call.
 
     Returns:
         A function that wraps around a model class based on the specifications.
@@ -65,6 +74,8 @@ def register_custom_architecture(
 
             joint_posterior: ClassVar[bool] = joint_posterior_attr
             supports_transfer_learning: ClassVar[bool] = False
+            supports_batched_posterior: ClassVar[bool] = batched_posterior_attr
+            posterior_memory_limit: ClassVar[int] = posterior_memory_limit_attr
 
             def __init__(self, *args, **kwargs):
                 self.model = model_cls(*args, **kwargs)
@@ -111,6 +122,13 @@ def register_custom_architecture(
 
 
 if _ONNX_INSTALLED:
+    _GRAPH_OPTIMIZATION_LEVELS = {
+        "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }
+    """The available graph optimization levels of the ONNX inference session."""
 
     @define(kw_only=True)
     class CustomONNXSurrogate(Surrogate):
@@ -133,14 +151,61 @@ if _ONNX_INSTALLED:
         onnx_str: bytes = field(validator=validators.instance_of(bytes))
         """The ONNX byte str representing the model."""
 
+        intra_op_num_threads: Optional[int] = field(
+            default=None, validator=validators.optional(validators.gt(0))
+        )
+        """The number of threads used for parallelizing the execution within
+        operators. ``None`` uses the onnxruntime default."""
+
+        inter_op_num_threads: Optional[int] = field(
+            default=None, validator=validators.optional(validators.gt(0))
+        )
+        """The number of threads used for parallelizing the execution of independent
+        operators. ``None`` uses the onnxruntime default."""
+
+        graph_optimization_level: str = field(
+            default="all", validator=validators.in_(_GRAPH_OPTIMIZATION_LEVELS)
+        )
+        """The graph optimization level of the inference session (``"disable"``,
+        ``"basic"``, ``"extended"`` or ``"all"``)."""
+
+        chunk_size: int = field(default=65_536, validator=validators.gt(0))
+        """The maximum number of candidates passed to the inference session at once.
+        The input and output buffers of this size are allocated once and reused across
+        all chunks and posterior calls."""
+
+        warm_up: bool = field(default=True, validator=validators.instance_of(bool))
+        """Flag indicating whether a full chunk is evaluated once upon creation of the
+        inference session, so that the buffers and the memory arena of the session are
+        allocated before the first actual posterior call."""
+
         _model: ort.InferenceSession = field(init=False, eq=False)
         """The internal model."""
 
+        _buffers: Optional[Tuple[np.ndarray, List[np.ndarray]]] = field(
+            init=False, default=None, eq=False
+        )
+        """The reused input buffer and output buffers (allocated upon first use).
+        Because of the shared buffers, posterior calls must not run concurrently on
+        the same surrogate object."""
+
         @_model.default
         def default_model(self) -> ort.InferenceSession:
             """Instantiate the ONNX inference session."""
+            options = ort.SessionOptions()
+            options.graph_optimization_level = _GRAPH_OPTIMIZATION_LEVELS[
+                self.graph_optimization_level
+            ]
+            if self.intra_op_num_threads is not None:
+                options.intra_op_num_threads = self.intra_op_num_threads
+            if self.inter_op_num_threads is not None:
+                options.inter_op_num_threads = self.inter_op_num_threads
             try:
-                return ort.InferenceSession(self.onnx_str)
+                return ort.InferenceSession(
+                    self.onnx_str,
+                    sess_options=options,
+                    providers=["CPUExecutionProvider"],
+                )
             except Exception as exc:
                 raise ValueError("Invalid ONNX string") from exc
 
@@ -150,22 +215,99 @@ if _ONNX_INSTALLED:
             if self.model_params or not isinstance(self.model_params, dict):
                 raise ModelParamsNotSupportedError()
 
+            # The warm-up requires a statically known input dimension
+            input_dim = self._model.get_inputs()[0].shape[-1]
+            if self.warm_up and isinstance(input_dim, int):
+                self._run_chunk(np.zeros((self.chunk_size, input_dim), DTypeFloatONNX))
+
         @batchify
         def _posterior(self, candidates: Tensor) -> Tuple[Tensor, Tensor]:
-            model_inputs = {
-                self.onnx_input_name: candidates.numpy().astype(DTypeFloatONNX)
-            }
-            results = self._model.run(None, model_inputs)
+            # See base class.
 
             # IMPROVE: At the moment, we assume that the second model output contains
             #   standard deviations. Currently, most available ONNX converters care
             #   about the mean only and it's not clear how this will be handled in the
             #   future. Once there are more choices available, this should be revisited.
+            candidates = candidates.numpy()
+            mean = np.empty(len(candidates), dtype=candidates.dtype)
+            var = np.empty(len(candidates), dtype=candidates.dtype)
+            for start in range(0, len(candidates), self.chunk_size):
+                stop = min(start + self.chunk_size, len(candidates))
+                chunk_mean, chunk_std = self._run_chunk(candidates[start:stop])
+                mean[start:stop] = chunk_mean.reshape(-1)
+                np.square(chunk_std.reshape(-1), out=var[start:stop])
+
             return (
-                torch.from_numpy(results[0]).to(DTypeFloatTorch),
-                torch.from_numpy(results[1]).pow(2).to(DTypeFloatTorch),
+                torch.from_numpy(mean).to(DTypeFloatTorch),
+                torch.from_numpy(var).to(DTypeFloatTorch),
             )
 
+        def _run_chunk(self, chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            """Evaluate the inference session on a chunk of candidates.
+
+            The chunk is copied into the preallocated input buffer and the session
+            writes its results directly into the preallocated output buffers via IO
+            binding.
+
+            Args:
+                chunk: The candidates, containing at most ``chunk_size`` rows.
+
+            Returns:
+                Views on the output buffers holding the mean and standard deviation
+                predictions of the chunk. The views are only valid until the next call.
+            """
+            input_buffer, output_buffers = self._get_buffers(chunk.shape[-1])
+            n_rows = len(chunk)
+
+            # Leading slices of C-contiguous buffers are C-contiguous themselves and
+            # can thus be bound directly
+            inputs = input_buffer[:n_rows]
+            np.copyto(inputs, chunk, casting="same_kind")
+            outputs = [buffer[:n_rows] for buffer in output_buffers]
+
+            binding = self._model.io_binding()
+            binding.bind_cpu_input(self.onnx_input_name, inputs)
+            for meta, output in zip(self._model.get_outputs(), outputs):
+                binding.bind_output(
+                    name=meta.name,
+                    device_type="cpu",
+                    device_id=0,
+                    element_type=DTypeFloatONNX,
+                    shape=output.shape,
+                    buffer_ptr=output.ctypes.data,
+                )
+            self._model.run_with_iobinding(binding)
+
+            return outputs[0], outputs[1]
+
+        def _get_buffers(self, input_dim: int) -> Tuple[np.ndarray, List[np.ndarray]]:
+            """Get the reused input and output buffers, allocating them if needed.
+
+            Args:
+                input_dim: The input dimension of the candidates.
+
+            Returns:
+                The input buffer and the buffers for the mean and standard deviation
+                outputs, each holding ``chunk_size`` rows.
+            """
+            if (self._buffers is None) or (self._buffers[0].shape[-1] != input_dim):
+                input_buffer = np.empty((self.chunk_size, input_dim), DTypeFloatONNX)
+
+                # Outputs are either vectors or column vectors, depending on the
+                # converter that created the model
+                output_buffers = [
+                    np.empty(
+                        (self.chunk_size, 1)
+                        if len(meta.shape) > 1
+                        else (self.chunk_size,),
+                        DTypeFloatONNX,
+                    )
+                    for meta in self._model.get_outputs()[:2]
+                ]
+                self._buffers = (input_buffer, output_buffers)
+
+            return self._buffers
+
         def _fit(
             self, searchspace: SearchSpace, train_x: Tensor, train_y: Tensor
         ) -> None:
@@ -177,6 +319,11 @@ if _ONNX_INSTALLED:
             #   "static" surrogates and account for them in the exposed APIs.
             pass
 
+        def _get_fitted_state(self) -> Dict[str, Any]:
+            # See base class.
+            # The model is pretrained and thus not affected by fitting
+            return {}
+
         @classmethod
         def validate_compatibility(cls, searchspace: SearchSpace) -> None:
             """Validate if the class is compatible with a given search space.
@@ -0,0 +1,459 @@
+"""Export of fitted surrogates to ONNX.
+
+The exported graphs take the computational representation of the candidates as input
+and output the posterior mean and standard deviation of each candidate, so that they
+can be loaded into a :class:`baybe.surrogates.custom.CustomONNXSurrogate` in scoring
+processes that only require ``onnxruntime``.
+
+Supported are (fitted) :class:`baybe.surrogates.RandomForestSurrogate`,
+:class:`baybe.surrogates.BayesianLinearSurrogate` and
+:class:`baybe.surrogates.GaussianProcessSurrogate` models. For the latter, the
+posterior is exported at the fitted hyperparameters, i.e. the training data is
+embedded into the graph in form of precomputed weights.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+from botorch.models.transforms import Normalize, Standardize
+from gpytorch.kernels import MaternKernel, RBFKernel, ScaleKernel
+from onnx import TensorProto, helper, numpy_helper
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import ARDRegression
+
+from baybe.scaler import DefaultScaler
+from baybe.surrogates.base import Surrogate
+from baybe.surrogates.gaussian_process import GaussianProcessSurrogate
+from baybe.surrogates.naive import MeanPredictionSurrogate
+from baybe.surrogates.utils import _ConstantTargetsWrapper, _ScalingWrapper
+from baybe.utils import DTypeFloatONNX
+
+_OPSET = 17
+"""The version of the default ONNX operator set used by the exported graphs."""
+
+_ML_OPSET = 3
+"""The version of the ``ai.onnx.ml`` operator set used by the exported graphs."""
+
+_IR_VERSION = 8
+"""The ONNX IR version of the exported models (supported by ``onnxruntime>=1.15``)."""
+
+_MEAN_OUTPUT = "mean"
+"""The name of the graph output holding the posterior means."""
+
+_STD_OUTPUT = "std"
+"""The name of the graph output holding the posterior standard deviations."""
+
+
+class _GraphBuilder:
+    """A minimal helper for assembling ONNX graphs node by node.
+
+    Args:
+        input_name: The name of the graph input.
+    """
+
+    def __init__(self, input_name: str):
+        self.input_name = input_name
+        self.input_dim: Optional[int] = None
+        self.nodes: List[Any] = []
+        self.initializers: List[Any] = []
+        self._counter = 0
+
+    def _name(self, prefix: str) -> str:
+        """Create a unique name for a graph value."""
+        self._counter += 1
+        return f"{prefix}_{self._counter}"
+
+    def constant(self, value: Any) -> str:
+        """Add a float constant to the graph and return its name."""
+        name = self._name("const")
+        array = np.asarray(value, dtype=DTypeFloatONNX)
+        self.initializers.append(numpy_helper.from_array(array, name=name))
+        return name
+
+    def int_constant(self, value: Any) -> str:
+        """Add an integer constant to the graph and return its name."""
+        name = self._name("const")
+        array = np.asarray(value, dtype=np.int64)
+        self.initializers.append(numpy_helper.from_array(array, name=name))
+        return name
+
+    def node(self, op_type: str, *inputs: str, domain: str = "", **attrs) -> str:
+        """Add a single-output node to the graph and return the name of its output."""
+        output = self._name(op_type.lower())
+        self.nodes.append(
+            helper.make_node(
+                op_type, list(inputs), [output], domain=domain or None, **attrs
+            )
+        )
+        return output
+
+    def build(self, mean: str, var: str) -> bytes:
+        """Finalize the graph, converting the variances to standard deviations.
+
+        Args:
+            mean: The name of the value holding the posterior means.
+            var: The name of the value holding the posterior variances.
+
+        Returns:
+            The serialized ONNX model.
+        """
+        self.nodes.append(helper.make_node("Identity", [mean], [_MEAN_OUTPUT]))
+        self.nodes.append(helper.make_node("Sqrt", [var], [_STD_OUTPUT]))
+        graph = helper.make_graph(
+            self.nodes,
+            "baybe_surrogate",
+            [
+                helper.make_tensor_value_info(
+                    self.input_name, TensorProto.FLOAT, [None, self.input_dim]
+                )
+            ],
+            [
+                helper.make_tensor_value_info(name, TensorProto.FLOAT, [None])
+                for name in (_MEAN_OUTPUT, _STD_OUTPUT)
+            ],
+            self.initializers,
+        )
+        model = helper.make_model(
+            graph,
+            opset_imports=[
+                helper.make_opsetid("", _OPSET),
+                helper.make_opsetid("ai.onnx.ml", _ML_OPSET),
+            ],
+            producer_name="baybe",
+        )
+        model.ir_version = _IR_VERSION
+        return model.SerializeToString()
+
+
+def export_onnx(surrogate: Surrogate, onnx_input_name: str = "input") -> bytes:
+    """Export a fitted surrogate to an ONNX graph.
+
+    The graph expects a two-dimensional float input holding the computational
+    representation of the candidates and has two outputs, ``"mean"`` and ``"std"``,
+    holding the posterior mean and standard deviation of each candidate.
+
+    Args:
+        surrogate: The fitted surrogate.
+        onnx_input_name: The name of the graph input.
+
+    Returns:
+        The serialized ONNX model.
+    """
+    builder = _GraphBuilder(onnx_input_name)
+    mean, var = _export(builder, surrogate, onnx_input_name)
+    return builder.build(mean, var)
+
+
+def export_onnx_surrogate(
+    surrogate: Surrogate, onnx_input_name: str = "input", **kwargs
+) -> Surrogate:
+    """Export a fitted surrogate into a :class:`baybe.surrogates.CustomONNXSurrogate`.
+
+    Args:
+        surrogate: The fitted surrogate.
+        onnx_input_name: The name of the graph input.
+        **kwargs: Additional arguments passed to the ONNX surrogate, such as its
+            session options.
+
+    Returns:
+        The ONNX surrogate equivalent to the fitted surrogate.
+    """
+    from baybe.surrogates.custom import CustomONNXSurrogate
+
+    return CustomONNXSurrogate(
+        onnx_input_name=onnx_input_name,
+        onnx_str=export_onnx(surrogate, onnx_input_name),
+        **kwargs,
+    )
+
+
+def _export(builder: _GraphBuilder, surrogate: Surrogate, x: str) -> Tuple[str, str]:
+    """Add the posterior computation of a surrogate to the graph.
+
+    Args:
+        builder: The graph builder.
+        surrogate: The fitted surrogate.
+        x: The name of the value holding the inputs.
+
+    Returns:
+        The names of the values holding the posterior means and variances.
+
+    Raises:
+        ValueError: If the surrogate has not been fitted.
+        NotImplementedError: If the surrogate type is not supported.
+    """
+    # Wrapper classes (see `baybe.surrogates.utils`) are resolved via their internal
+    # model instances
+    if isinstance(surrogate, _ConstantTargetsWrapper):
+        return _export(builder, surrogate.model, x)
+    if isinstance(surrogate, _ScalingWrapper):
+        return _export_scaled(builder, surrogate, x)
+
+    if isinstance(surrogate, MeanPredictionSurrogate):
+        if surrogate.target_value is None:
+            raise ValueError("Only fitted surrogates can be exported.")
+        return _export_constant(builder, surrogate, x)
+
+    model = getattr(surrogate, "_model", None)
+    if model is None:
+        raise ValueError("Only fitted surrogates can be exported.")
+    if isinstance(model, RandomForestRegressor):
+        return _export_random_forest(builder, model, x)
+    if isinstance(model, ARDRegression):
+        return _export_ard(builder, model, x)
+    if isinstance(surrogate, GaussianProcessSurrogate):
+        return _export_gaussian_process(builder, surrogate, x)
+
+    raise NotImplementedError(
+        f"Exporting surrogates of type '{surrogate.__class__.__name__}' to ONNX is "
+        f"not supported."
+    )
+
+
+def _export_scaled(
+    builder: _GraphBuilder, surrogate: Surrogate, x: str
+) -> Tuple[str, str]:
+    """Add the input scaling and output unscaling of a scaled model to the graph."""
+    scaler = surrogate.scaler
+    if not isinstance(scaler, DefaultScaler) or not scaler.fitted:
+        raise ValueError("Only fitted surrogates can be exported.")
+    bounds, y_mean, y_std = (t.numpy() for t in scaler._statistics)
+
+    x = builder.node("Sub", x, builder.constant(bounds[0]))
+    x = builder.node("Div", x, builder.constant(bounds[1] - bounds[0]))
+    mean, var = _export(builder, surrogate.model, x)
+    mean = builder.node("Mul", mean, builder.constant(y_std.reshape(-1)))
+    mean = builder.node("Add", mean, builder.constant(y_mean.reshape(-1)))
+    var = builder.node("Mul", var, builder.constant(y_std.reshape(-1) ** 2))
+    return mean, var
+
+
+def _export_constant(
+    builder: _GraphBuilder, surrogate: MeanPredictionSurrogate, x: str
+) -> Tuple[str, str]:
+    """Add the posterior of a mean prediction surrogate to the graph."""
+    # A zero vector of the batch size is obtained from the first input column
+    column = builder.node("Gather", x, builder.int_constant(0), axis=1)  # shape: (n,)
+    zeros = builder.node("Mul", column, builder.constant(0.0))
+    mean = builder.node("Add", zeros, builder.constant(surrogate.target_value))
+    var = builder.node("Add", zeros, builder.constant(1.0))
+    return mean, var
+
+
+def _export_random_forest(
+    builder: _GraphBuilder, model: RandomForestRegressor, x: str
+) -> Tuple[str, str]:
+    """Add the posterior of a random forest to the graph.
+
+    All trees are encoded into a single tree ensemble node with one output per tree,
+    from which the mean and the (unbiased) variance across trees are computed.
+    """
+    builder.input_dim = model.n_features_in_
+    attrs: Dict[str, List] = {
+        key: []
+        for key in [
+            "nodes_treeids",
+            "nodes_nodeids",
+            "nodes_featureids",
+            "nodes_values",
+            "nodes_modes",
+            "nodes_truenodeids",
+            "nodes_falsenodeids",
+            "target_treeids",
+            "target_nodeids",
+            "target_ids",
+            "target_weights",
+        ]
+    }
+    for tree_id, estimator in enumerate(model.estimators_):
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        is_leaf = tree.children_left == -1
+        attrs["nodes_treeids"] += [tree_id] * n_nodes
+        attrs["nodes_nodeids"] += list(range(n_nodes))
+        attrs["nodes_featureids"] += np.where(is_leaf, 0, tree.feature).tolist()
+        attrs["nodes_values"] += np.where(is_leaf, 0.0, tree.threshold).tolist()
+        attrs["nodes_modes"] += ["LEAF" if leaf else "BRANCH_LEQ" for leaf in is_leaf]
+        attrs["nodes_truenodeids"] += np.where(is_leaf, 0, tree.children_left).tolist()
+        attrs["nodes_falsenodeids"] += np.where(
+            is_leaf, 0, tree.children_right
+        ).tolist()
+
+        leaves = np.flatnonzero(is_leaf)
+        attrs["target_treeids"] += [tree_id] * len(leaves)
+        attrs["target_nodeids"] += leaves.tolist()
+        attrs["target_ids"] += [tree_id] * len(leaves)
+        attrs["target_weights"] += tree.value[leaves, 0, 0].tolist()
+
+    n_trees = len(model.estimators_)
+    predictions = builder.node(
+        "TreeEnsembleRegressor",
+        x,
+        domain="ai.onnx.ml",
+        n_targets=n_trees,
+        aggregate_function="SUM",
+        post_transform="NONE",
+        **attrs,
+    )  # shape: (n, n_trees)
+
+    mean = builder.node("ReduceMean", predictions, axes=[1], keepdims=1)
+    if n_trees > 1:
+        deviations = builder.node("Sub", predictions, mean)
+        squares = builder.node("Mul", deviations, deviations)
+        var = builder.node("ReduceSum", squares, builder.int_constant([1]), keepdims=0)
+        var = builder.node("Div", var, builder.constant(n_trees - 1))
+    else:
+        var = builder.node(
+            "ReduceSum", predictions, builder.int_constant([1]), keepdims=0
+        )
+        var = builder.node("Mul", var, builder.constant(0.0))
+    mean = builder.node("Squeeze", mean, builder.int_constant([1]))
+    return mean, var
+
+
+def _export_ard(
+    builder: _GraphBuilder, model: ARDRegression, x: str
+) -> Tuple[str, str]:
+    """Add the posterior of a Bayesian linear (ARD) regression to the graph."""
+    builder.input_dim = model.n_features_in_
+    mean = builder.node("MatMul", x, builder.constant(model.coef_))
+    mean = builder.node("Add", mean, builder.constant(model.intercept_))
+
+    noise = builder.constant(1.0 / model.alpha_)
+    active = np.flatnonzero(model.lambda_ < model.threshold_lambda)
+    if len(active) == 0:
+        var = builder.node("Mul", mean, builder.constant(0.0))
+        return mean, builder.node("Add", var, noise)
+
+    x = builder.node("Gather", x, builder.int_constant(active), axis=1)
+    projected = builder.node("MatMul", x, builder.constant(model.sigma_))
+    var = builder.node("Mul", projected, x)
+    var = builder.node("ReduceSum", var, builder.int_constant([1]), keepdims=0)
+    var = builder.node("Add", var, noise)
+    return mean, var
+
+
+def _export_gaussian_process(
+    builder: _GraphBuilder, surrogate: GaussianProcessSurrogate, x: str
+) -> Tuple[str, str]:
+    """Add the posterior of a Gaussian process at fixed hyperparameters to the graph.
+
+    Using the (standardized) training data, the weights of the posterior mean and the
+    inverse of the Cholesky factor of the training covariance are precomputed, so that
+    the graph only needs to evaluate the cross-covariances between candidates and
+    training points. The posterior variance is computed as the prior variance reduced
+    by the squared norm of the whitened cross-covariances, which, in contrast to
+    using the inverse training covariance, is numerically stable in single precision.
+
+    Raises:
+        NotImplementedError: If the Gaussian process uses a kernel structure other than
+            a scaled Matérn or RBF kernel on all input dimensions (e.g. for transfer
+            learning or sparse approximations).
+    """
+    model = surrogate._model
+    covar_module = model.covar_module
+    if not (
+        isinstance(covar_module, ScaleKernel)
+        and isinstance(covar_module.base_kernel, (MaternKernel, RBFKernel))
+        and isinstance(model.input_transform, Normalize)
+        and isinstance(model.outcome_transform, Standardize)
+    ):
+        raise NotImplementedError(
+            "Only Gaussian processes with a scaled Matérn or RBF kernel can be "
+            "exported to ONNX."
+        )
+    kernel = covar_module.base_kernel
+    builder.input_dim = surrogate._train_x.shape[-1]
+
+    with torch.no_grad():
+        input_transform = model.input_transform
+        train_x = (surrogate._train_x - input_transform.offset) / (
+            input_transform.coefficient
+        )
+        train_y = (
+            surrogate._train_y - model.outcome_transform.means
+        ) / model.outcome_transform.stdvs
+        lengthscale = kernel.lengthscale.reshape(-1)
+        outputscale = covar_module.outputscale.reshape(())
+        constant = model.mean_module.constant.reshape(())
+        noise = model.likelihood.noise.reshape(())
+
+        # Precompute the weights of the posterior mean and the inverse covariance
+        covar = covar_module(train_x).to_dense() + noise * torch.eye(len(train_x))
+        cholesky = torch.linalg.cholesky(covar)
+        weights = torch.cholesky_solve(train_y - constant, cholesky)
+        cholesky_inv = torch.linalg.solve_triangular(
+            cholesky, torch.eye(len(train_x), dtype=cholesky.dtype), upper=False
+        )
+
+        scaled_train_x = train_x / lengthscale
+        y_means = model.outcome_transform.means.reshape(-1)
+        y_stdvs = model.outcome_transform.stdvs.reshape(-1)
+
+    # Scale the candidates in the same way as the training inputs
+    x = builder.node("Sub", x, builder.constant(input_transform.offset.reshape(-1)))
+    x = builder.node(
+        "Div", x, builder.constant(input_transform.coefficient.reshape(-1))
+    )
+    x = builder.node("Div", x, builder.constant(lengthscale.numpy()))
+
+    # Squared distances between candidates and training points
+    cross = builder.node(
+        "MatMul", x, builder.constant(scaled_train_x.T.numpy())
+    )  # shape: (n, n_train)
+    x_norms = builder.node(
+        "ReduceSum", builder.node("Mul", x, x), builder.int_constant([1]), keepdims=1
+    )
+    dist2 = builder.node("Mul", cross, builder.constant(-2.0))
+    dist2 = builder.node("Add", dist2, x_norms)
+    dist2 = builder.node(
+        "Add", dist2, builder.constant((scaled_train_x**2).sum(dim=-1).numpy())
+    )
+    dist2 = builder.node("Relu", dist2)
+
+    # Cross-covariances
+    if isinstance(kernel, RBFKernel):
+        scaled = builder.node("Mul", dist2, builder.constant(-0.5))
+        k_cross = builder.node("Exp", scaled)
+    else:
+        dist = builder.node("Sqrt", dist2)
+        k_cross = _matern_from_distance(builder, dist, dist2, kernel.nu)
+    k_cross = builder.node("Mul", k_cross, builder.constant(outputscale.item()))
+
+    # Standardized posterior mean and variance
+    mean = builder.node("MatMul", k_cross, builder.constant(weights.reshape(-1)))
+    mean = builder.node("Add", mean, builder.constant(constant.item()))
+    whitened = builder.node("MatMul", k_cross, builder.constant(cholesky_inv.T.numpy()))
+    reduction = builder.node("Mul", whitened, whitened)
+    reduction = builder.node(
+        "ReduceSum", reduction, builder.int_constant([1]), keepdims=0
+    )
+    var = builder.node("Sub", builder.constant(outputscale.item()), reduction)
+    var = builder.node("Relu", var)
+
+    # Undo the outcome standardization
+    mean = builder.node("Mul", mean, builder.constant(y_stdvs.numpy()))
+    mean = builder.node("Add", mean, builder.constant(y_means.numpy()))
+    var = builder.node("Mul", var, builder.constant((y_stdvs**2).numpy()))
+    return mean, var
+
+
+def _matern_from_distance(
+    builder: _GraphBuilder, dist: str, dist2: str, nu: float
+) -> str:
+    """Add the (unscaled) Matérn kernel evaluated at given distances to the graph."""
+    if nu not in (0.5, 1.5, 2.5):
+        raise NotImplementedError(f"Matérn kernels with nu={nu} are not supported.")
+
+    factor = float(np.sqrt(2 * nu))
+    scaled = builder.node("Mul", dist, builder.constant(factor))
+    decay = builder.node("Exp", builder.node("Neg", scaled))
+    if nu == 0.5:
+        return decay
+
+    polynomial = builder.node("Add", scaled, builder.constant(1.0))
+    if nu == 2.5:
+        quadratic = builder.node("Mul", dist2, builder.constant(5.0 / 3.0))
+        polynomial = builder.node("Add", polynomial, quadratic)
+    return builder.node("Mul", polynomial, decay)
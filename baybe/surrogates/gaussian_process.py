@@ -1,17 +1,41 @@
 """Gaussian process surrogates."""
 
-from typing import Any, ClassVar, Dict, Optional, Tuple
+import hashlib
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from copy import deepcopy
+from typing import Any, Callable, ClassVar, Dict, Literal, Optional, Tuple
 
 import torch
 from attr import define, field
+from attr.validators import ge, gt, in_, instance_of, optional
 from botorch.models import SingleTaskGP
 from botorch.models.transforms import Normalize, Standardize
-from botorch.optim.fit import fit_gpytorch_mll_torch
-from gpytorch import ExactMarginalLogLikelihood
-from gpytorch.kernels import IndexKernel, MaternKernel, ScaleKernel
+from botorch.models.transforms.input import InputTransform
+from botorch.models.transforms.outcome import OutcomeTransform
+from botorch.optim.core import OptimizationResult
+from botorch.optim.fit import fit_gpytorch_mll_scipy, fit_gpytorch_mll_torch
+from botorch.optim.stopping import ExpMAStoppingCriterion
+from botorch.optim.utils import sample_all_priors
+from botorch.sampling.pathwise import draw_matheron_paths
+from botorch.sampling.pathwise.paths import (
+    GeneralizedLinearPath,
+    PathDict,
+    SamplePath,
+)
+from gpytorch import ExactMarginalLogLikelihood, settings
+from gpytorch.kernels import (
+    IndexKernel,
+    InducingPointKernel,
+    MaternKernel,
+    ScaleKernel,
+)
 from gpytorch.likelihoods import GaussianLikelihood
 from gpytorch.means import ConstantMean
 from gpytorch.priors import GammaPrior
+from linear_operator import to_dense
 from torch import Tensor
 
 from baybe.searchspace import SearchSpace
@@ -19,6 +43,29 @@ from baybe.surrogates.base import Surrogate
 from baybe.surrogates.validation import get_model_params_validator
 
 
+@define(frozen=True)
+class FitDiagnostics:
+    """Diagnostic information about a surrogate model fit."""
+
+    n_steps: int = field()
+    """The number of optimization steps of the selected hyperparameter optimization
+    run. Zero if the model has been updated incrementally."""
+
+    loss: Optional[float] = field()
+    """The final loss of the selected optimization run, i.e. the negative marginal
+    log likelihood. ``None`` if the model has been updated incrementally."""
+
+    runtime: float = field()
+    """The wall-clock time of the fit in seconds."""
+
+    status: str = field()
+    """The termination status of the selected optimization run."""
+
+    n_restarts: int = field(default=0)
+    """The number of additional optimization runs started from random
+    hyperparameters."""
+
+
 @define
 class GaussianProcessSurrogate(Surrogate):
     """A Gaussian process surrogate model."""
@@ -38,27 +85,397 @@ class GaussianProcessSurrogate(Surrogate):
     )
     # See base class.
 
+    warm_start: bool = field(default=False, validator=instance_of(bool))
+    """Flag indicating if the hyperparameter optimization starts from the
+    hyperparameters of the previous fit instead of the prior defaults."""
+
+    incremental_update_ratio: float = field(default=0.0, validator=ge(0.0))
+    """The maximum ratio between the number of new and previously seen training points
+    for which the fitted model is updated via low-rank conditioning on the new
+    observations instead of being refit. A value of zero disables incremental
+    updates."""
+
+    max_incremental_updates: int = field(default=10, validator=ge(0))
+    """The maximum number of consecutive incremental updates after which a full refit
+    is enforced."""
+
+    fit_method: Literal["torch", "scipy"] = field(
+        default="torch", validator=in_(("torch", "scipy"))
+    )
+    """The engine used for the hyperparameter optimization. Either ``"torch"`` for
+    the Adam optimizer of ``torch.optim`` or ``"scipy"`` for scipy's L-BFGS-B."""
+
+    fit_step_limit: int = field(default=100, validator=gt(0))
+    """The maximum number of optimization steps per optimization run."""
+
+    fit_tolerance: float = field(default=1e-5, validator=gt(0.0))
+    """The relative tolerance on the loss used for detecting convergence."""
+
+    fit_timeout: Optional[float] = field(default=None, validator=optional(gt(0.0)))
+    """An optional wall-clock budget in seconds for the hyperparameter
+    optimization. Note that optimization runs stopped due to the timeout can result in
+    poor fits."""
+
+    fit_restarts: int = field(default=0, validator=ge(0))
+    """The number of additional optimization runs started from hyperparameters drawn
+    from their priors. All runs are executed in parallel threads and the
+    hyperparameters with the lowest final loss are selected."""
+
+    sparse_threshold: Optional[int] = field(default=5000, validator=optional(gt(0)))
+    """The number of training points above which the exact covariance is replaced by
+    a sparse inducing point approximation (SGPR), reducing the cost of fitting and
+    prediction from cubic to linear in the number of training points. ``None``
+    disables the approximation."""
+
+    n_inducing_points: int = field(default=500, validator=gt(0))
+    """The number of inducing points used by the sparse approximation."""
+
+    fast_pred_var: bool = field(default=False, validator=instance_of(bool))
+    """Flag indicating if predictive variances are computed via LOVE (see
+    :class:`gpytorch.settings.fast_pred_var`). If enabled, the solves against the
+    training data and the low-rank decomposition of the predictive covariance are
+    computed once directly after the fit and reused by all subsequent predictions, and
+    single-point candidate batches are scored jointly against these caches, which
+    drastically increases the throughput when scoring large candidate sets. Note that
+    the resulting variances are approximate once the training set exceeds the size of
+    the low-rank decomposition, which is why the flag is disabled by default."""
+
+    fast_pred_var_rank: Optional[int] = field(default=None, validator=optional(gt(0)))
+    """The maximum rank of the cached low-rank (LOVE) decomposition. Lower ranks
+    increase the scoring throughput at the price of less accurate variances. ``None``
+    uses the gpytorch default. Only used if ``fast_pred_var`` is enabled."""
+
     _model: Optional[SingleTaskGP] = field(init=False, default=None)
     """The actual model."""
 
+    _fit_diagnostics: Optional[FitDiagnostics] = field(
+        init=False, default=None, eq=False
+    )
+    """Diagnostic information about the last fit."""
+
+    _train_x: Optional[Tensor] = field(init=False, default=None, eq=False)
+    """The training inputs the current model is conditioned on."""
+
+    _train_y: Optional[Tensor] = field(init=False, default=None, eq=False)
+    """The training targets the current model is conditioned on."""
+
+    _bounds: Optional[Tensor] = field(init=False, default=None, eq=False)
+    """The search space bounds used for the input scaling of the current model."""
+
+    _n_incremental_updates: int = field(init=False, default=0, eq=False)
+    """The number of incremental updates since the last full refit."""
+
+    _scoring_models: Dict[torch.dtype, SingleTaskGP] = field(
+        init=False, factory=dict, eq=False
+    )
+    """Copies of the current model for scoring candidates in reduced precision (see
+    :func:`baybe.utils.numeric.scoring_precision`), created upon first use."""
+
+    @property
+    def fit_diagnostics(self) -> Optional[FitDiagnostics]:
+        """Diagnostic information about the last fit (``None`` if not fitted)."""
+        return self._fit_diagnostics
+
     def _posterior(self, candidates: Tensor) -> Tuple[Tensor, Tensor]:
         # See base class.
-        posterior = self._model.posterior(candidates)
-        return posterior.mvn.mean, posterior.mvn.covariance_matrix
+        model = self._get_scoring_model(candidates.dtype)
+        with self._prediction_context():
+            # For single-point t-batches, evaluating all points jointly and extracting
+            # the marginals avoids broadcasting the training data to the batch shape
+            # and lets all points share the cached solves against the training data.
+            # Lazy kernel evaluation ensures that the (unneeded) covariances between
+            # the points are never computed.
+            if (
+                self.fast_pred_var
+                and (candidates.ndim > 2)
+                and (candidates.shape[-2] == 1)
+            ):
+                with settings.max_eager_kernel_size(0):
+                    posterior = model.posterior(
+                        candidates.reshape(-1, candidates.shape[-1])
+                    )
+                batch_shape = candidates.shape[:-2]
+                mean = posterior.mvn.mean.reshape(*batch_shape, 1)
+                var = posterior.mvn.variance.reshape(*batch_shape, 1, 1)
+                return mean, var
+
+            posterior = model.posterior(candidates)
+            return posterior.mvn.mean, posterior.mvn.covariance_matrix
+
+    def sample_posterior_paths(  # noqa: D102
+        self, n_samples: int
+    ) -> Callable[[Tensor], Tensor]:
+        # See base class.
+
+        # The functions are drawn via Matheron's rule, i.e. by updating functions drawn
+        # from the prior (approximated via random Fourier features) with the training
+        # data. Kernels without a feature representation (e.g. the sparse
+        # approximation or multi-task kernels) raise a NotImplementedError.
+        paths = _evaluate_jointly(
+            draw_matheron_paths(self._model, sample_shape=torch.Size([n_samples]))
+        )
+        dtype = self._train_x.dtype
+
+        def evaluate(candidates: Tensor) -> Tensor:
+            with torch.no_grad():
+                return paths(candidates.to(dtype))
+
+        return evaluate
+
+    def _get_scoring_model(self, dtype: torch.dtype) -> SingleTaskGP:
+        """Get the model for scoring candidates in the given precision.
+
+        The model itself always operates in the precision of its training data. For
+        other precisions, a converted copy of the model is created and kept until the
+        next fit. Its prediction caches are recomputed in the target precision.
+
+        Args:
+            dtype: The floating point data type of the candidates.
+
+        Returns:
+            The model operating in the requested precision.
+        """
+        if dtype == self._train_x.dtype:
+            return self._model
+        if dtype not in self._scoring_models:
+            model = deepcopy(self._model)
+            model.prediction_strategy = None
+            self._scoring_models[dtype] = model.to(dtype).eval()
+        return self._scoring_models[dtype]
+
+    def _prediction_context(self) -> ExitStack:
+        """Create the gpytorch settings context used for model predictions.
+
+        Returns:
+            The context.
+        """
+        stack = ExitStack()
+        if self.fast_pred_var:
+            stack.enter_context(settings.fast_pred_var())
+            if self.fast_pred_var_rank is not None:
+                stack.enter_context(
+                    settings.max_root_decomposition_size(self.fast_pred_var_rank)
+                )
+        return stack
+
+    def _prime_prediction_caches(self, train_x: Tensor) -> None:
+        """Precompute the prediction caches of the model if fast variances are used.
+
+        The caches are attached to the model and reused by all predictions until the
+        model is refit, so that their cost is not paid by the first scored chunk of
+        candidates.
+
+        Args:
+            train_x: The training inputs, one of which is used for a dummy prediction.
+        """
+        if not self.fast_pred_var:
+            return
+        self._model.eval()
+        with torch.no_grad():
+            # The LOVE cache is created upon the first variance computation
+            self._posterior(train_x[:1])
 
     def _fit(self, searchspace: SearchSpace, train_x: Tensor, train_y: Tensor) -> None:
         # See base class.
 
+        # Models for reduced-precision scoring are recreated from the new model
+        self._scoring_models = {}
+
+        # get the input bounds from the search space in BoTorch Format
+        bounds = searchspace.param_bounds_comp
+        # TODO: use target value bounds when explicitly provided
+
+        # If only a few measurements have been added since the last fit, update the
+        # existing model instead of refitting it from scratch
+        if self._is_incremental_update(train_x, train_y, bounds):
+            start = time.perf_counter()
+            self._update_model(train_x, train_y)
+            self._fit_diagnostics = FitDiagnostics(
+                n_steps=0,
+                loss=None,
+                runtime=time.perf_counter() - start,
+                status="INCREMENTAL",
+            )
+            self._prime_prediction_caches(train_x)
+            return
+
+        # Keep the previous model for initializing the hyperparameters
+        previous_model = self._model if self.warm_start else None
+
+        model = self._create_model(searchspace, train_x, train_y, bounds)
+        if previous_model is not None:
+            _transfer_hyperparameters(previous_model, model)
+
+        self._model, self._fit_diagnostics = self._optimize_hyperparameters(model)
+
+        # Remember the data the model has been fitted to
+        self._train_x, self._train_y, self._bounds = train_x, train_y, bounds
+        self._n_incremental_updates = 0
+
+        self._prime_prediction_caches(train_x)
+
+    def _optimize_hyperparameters(
+        self, model: SingleTaskGP
+    ) -> Tuple[SingleTaskGP, FitDiagnostics]:
+        """Optimize the hyperparameters of a model, possibly using several restarts.
+
+        The first optimization run starts from the current hyperparameters of the given
+        model, all additional runs start from hyperparameters sampled from their priors.
+
+        Args:
+            model: The model whose hyperparameters are to be optimized.
+
+        Returns:
+            The model with the lowest final loss and the corresponding fit diagnostics.
+        """
+        start = time.perf_counter()
+
+        # Create the starting points of all optimization runs
+        models = [model]
+        for _ in range(self.fit_restarts):
+            restart = deepcopy(model)
+            sample_all_priors(restart)
+            models.append(restart)
+
+        # Run the optimizations, using parallel threads in case of several runs
+        if len(models) == 1:
+            results = [self._run_hyperparameter_optimization(model)]
+        else:
+            with ThreadPoolExecutor(max_workers=len(models)) as executor:
+                results = list(
+                    executor.map(self._run_hyperparameter_optimization, models)
+                )
+
+        # Select the run with the lowest loss (treating failed runs as worst)
+        losses = [r.fval if math.isfinite(r.fval) else math.inf for r in results]
+        best = losses.index(min(losses))
+        diagnostics = FitDiagnostics(
+            n_steps=results[best].step,
+            loss=float(results[best].fval),
+            runtime=time.perf_counter() - start,
+            status=results[best].status.name,
+            n_restarts=self.fit_restarts,
+        )
+
+        return models[best], diagnostics
+
+    def _run_hyperparameter_optimization(
+        self, model: SingleTaskGP
+    ) -> OptimizationResult:
+        """Run a single hyperparameter optimization with the configured engine.
+
+        Args:
+            model: The model whose hyperparameters are optimized in-place.
+
+        Returns:
+            The result of the optimization run.
+        """
+        mll = ExactMarginalLogLikelihood(model.likelihood, model)
+        mll.train()
+
+        if self.fit_method == "scipy":
+            return fit_gpytorch_mll_scipy(
+                mll,
+                options={"maxiter": self.fit_step_limit, "ftol": self.fit_tolerance},
+                timeout_sec=self.fit_timeout,
+            )
+
+        return fit_gpytorch_mll_torch(
+            mll,
+            step_limit=self.fit_step_limit,
+            stopping_criterion=ExpMAStoppingCriterion(
+                maxiter=self.fit_step_limit, rel_tol=self.fit_tolerance
+            ),
+            timeout_sec=self.fit_timeout,
+        )
+
+    def _is_incremental_update(
+        self, train_x: Tensor, train_y: Tensor, bounds: Tensor
+    ) -> bool:
+        """Check if the model can be updated by conditioning on the new data only.
+
+        This is the case if the given training data extends the data of the previous
+        fit by a sufficiently small number of new points and if the limit of
+        consecutive incremental updates has not been reached yet.
+
+        Args:
+            train_x: The training inputs.
+            train_y: The training targets.
+            bounds: The input bounds of the search space.
+
+        Returns:
+            ``True`` if an incremental update is possible, ``False`` otherwise.
+        """
+        if (self._model is None) or (self._train_x is None):
+            return False
+        if isinstance(self._model.covar_module, InducingPointKernel):
+            return False
+        if self._n_incremental_updates >= self.max_incremental_updates:
+            return False
+
+        n_old = len(self._train_x)
+        n_new = len(train_x) - n_old
+        if not 0 < n_new <= self.incremental_update_ratio * n_old:
+            return False
+
+        return (
+            torch.equal(bounds, self._bounds)
+            and torch.equal(train_x[:n_old], self._train_x)
+            and torch.equal(train_y[:n_old], self._train_y)
+        )
+
+    def _update_model(self, train_x: Tensor, train_y: Tensor) -> None:
+        """Condition the fitted model on the training points added since the last fit.
+
+        The hyperparameters are kept fixed and the model caches are updated via
+        low-rank updates, which avoids a full refit.
+
+        Args:
+            train_x: The training inputs, extending the inputs of the previous fit.
+            train_y: The training targets, extending the targets of the previous fit.
+        """
+        new_x = train_x[len(self._train_x) :]
+        new_y = train_y[len(self._train_y) :]
+
+        # The caches required for the update are only created with the first
+        # prediction of the model
+        self._model.eval()
+        if self._model.prediction_strategy is None:
+            with torch.no_grad():
+                self._model.posterior(new_x[:1])
+
+        # In eval mode, the model stores its training inputs in transformed form
+        self._model = self._model.condition_on_observations(
+            self._model.transform_inputs(new_x), new_y
+        )
+
+        self._train_x, self._train_y = train_x, train_y
+        self._n_incremental_updates += 1
+
+    def _create_model(
+        self,
+        searchspace: SearchSpace,
+        train_x: Tensor,
+        train_y: Tensor,
+        bounds: Tensor,
+    ) -> SingleTaskGP:
+        """Create an unfitted model with prior-based hyperparameter initialization.
+
+        Args:
+            searchspace: The search space in which experiments are conducted.
+            train_x: The training inputs.
+            train_y: The training targets.
+            bounds: The input bounds of the search space.
+
+        Returns:
+            The created model.
+        """
         # identify the indexes of the task and numeric dimensions
         # TODO: generalize to multiple task parameters
         task_idx = searchspace.task_idx
         n_task_params = 1 if task_idx else 0
         numeric_idxs = [i for i in range(train_x.shape[1]) if i != task_idx]
 
-        # get the input bounds from the search space in BoTorch Format
-        bounds = searchspace.param_bounds_comp
-        # TODO: use target value bounds when explicitly provided
-
         # define the input and outcome transforms
         # TODO [Scaling]: scaling should be handled by search space object
         input_transform = Normalize(
@@ -137,8 +554,22 @@ class GaussianProcessSurrogate(Surrogate):
         )
         likelihood.noise = torch.tensor([noise_prior[1]])
 
-        # construct and fit the Gaussian process
-        self._model = SingleTaskGP(
+        # use a sparse approximation of the covariance for large training sets
+        if (self.sparse_threshold is not None) and (
+            len(train_x) > self.sparse_threshold
+        ):
+            covar_module = InducingPointKernel(
+                covar_module,
+                inducing_points=_select_inducing_points(
+                    input_transform(train_x), self.n_inducing_points
+                ),
+                likelihood=likelihood,
+            )
+            # The inducing points are kept fixed so that task indices remain valid
+            covar_module.inducing_points.requires_grad_(False)
+
+        # construct the Gaussian process
+        return SingleTaskGP(
             train_x,
             train_y,
             input_transform=input_transform,
@@ -147,8 +578,117 @@ class GaussianProcessSurrogate(Surrogate):
             covar_module=covar_module,
             likelihood=likelihood,
         )
-        mll = ExactMarginalLogLikelihood(self._model.likelihood, self._model)
-        # IMPROVE: The step_limit=100 stems from the former (deprecated)
-        #  `fit_gpytorch_torch` function, for which this was the default. Probably,
-        #   one should use a smarter logic here.
-        fit_gpytorch_mll_torch(mll, step_limit=100)
+
+
+def _evaluate_jointly(paths: SamplePath) -> Callable[[Tensor], Tensor]:
+    """Evaluate sample paths that sum linear paths via a single matrix product.
+
+    BoTorch combines the features of each linear path with the weights of the
+    individual samples via batched matrix-vector products, whose cost grows linearly
+    with the number of samples even though all samples share the same features.
+    Instead, the features of all linear paths are concatenated and combined with the
+    stacked weights of all samples at once.
+
+    Args:
+        paths: The sample paths.
+
+    Returns:
+        A callable evaluating the sample paths at a 2D tensor of points. Sample paths
+        of a different structure are evaluated by BoTorch.
+    """
+    linear_paths = list(paths.paths.values()) if isinstance(paths, PathDict) else []
+    if (
+        not linear_paths
+        or (paths.join is not sum)
+        or (paths.input_transform is not None)
+        or not all(
+            isinstance(path, GeneralizedLinearPath)
+            and (path.weight.ndim == 2)
+            and (path.output_transform is None)
+            for path in linear_paths
+        )
+    ):
+        return paths
+
+    weight = torch.cat([path.weight for path in linear_paths], dim=-1)
+
+    def evaluate(x: Tensor) -> Tensor:
+        features, bias = [], 0
+        for path in linear_paths:
+            z = _apply_transform(path.input_transform, x)
+            # Kernel evaluations (e.g. of the update paths) may be lazy
+            features.append(to_dense(path.feature_map(z)))
+            if path.bias_module is not None:
+                bias = bias + path.bias_module(z)
+        if any(feat.ndim != 2 for feat in features):
+            return paths(x)
+        out = (torch.cat(features, dim=-1) @ weight.T).T + bias
+        if paths.output_transform is None:
+            return out
+        if isinstance(paths.output_transform, OutcomeTransform):
+            return paths.output_transform.untransform(out)[0]
+        return paths.output_transform(out)
+
+    return evaluate
+
+
+def _apply_transform(transform: Optional[Callable], x: Tensor) -> Tensor:
+    """Apply the (optional) input transform of a sample path to a tensor of points.
+
+    Args:
+        transform: The input transform.
+        x: The points to be transformed.
+
+    Returns:
+        The transformed points.
+    """
+    if transform is None:
+        return x
+    if isinstance(transform, InputTransform):
+        return transform.forward(x)
+    return transform(x)
+
+
+def _transfer_hyperparameters(source: SingleTaskGP, target: SingleTaskGP) -> None:
+    """Initialize the hyperparameters of a model with those of another model.
+
+    Only the parameters of the mean, covariance and likelihood modules are transferred,
+    and only if their shapes are compatible. Data-dependent states (such as the
+    statistics of the outcome transform) are left untouched.
+
+    Args:
+        source: The model providing the hyperparameter values.
+        target: The model whose hyperparameters are initialized.
+    """
+    target_state = target.state_dict()
+    hyperparameters = {
+        name: value
+        for name, value in source.state_dict().items()
+        if name.startswith(("mean_module.", "covar_module.", "likelihood."))
+        and not name.endswith("inducing_points")
+        and (name in target_state)
+        and (target_state[name].shape == value.shape)
+    }
+    target.load_state_dict(hyperparameters, strict=False)
+
+
+def _select_inducing_points(train_x: Tensor, n_points: int) -> Tensor:
+    """Select the inducing points of a sparse approximation from the training inputs.
+
+    The inducing points are drawn uniformly at random from the unique training inputs,
+    which guarantees that categorical encodings (e.g. task indices) remain valid. The
+    random generator is seeded with a hash of the training inputs, so that repeated
+    fits to the same data are reproducible.
+
+    Args:
+        train_x: The (transformed) training inputs.
+        n_points: The maximum number of inducing points.
+
+    Returns:
+        The selected inducing points.
+    """
+    unique_x = torch.unique(train_x.detach(), dim=0)
+    digest = hashlib.sha256(unique_x.cpu().numpy().tobytes()).digest()
+    generator = torch.Generator().manual_seed(int.from_bytes(digest[:8], "little"))
+    idxs = torch.randperm(len(unique_x), generator=generator)[:n_points]
+    return unique_x[idxs].clone()
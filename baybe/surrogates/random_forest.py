@@ -7,12 +7,15 @@ Since we plan to refactor the surrogates, this part of the documentation will be
 available in the future. Thus, please have a look in the source code directly.
 """
 
+from threading import Lock
 from typing import Any, ClassVar, Dict, Optional, Tuple
 
 import numpy as np
 import torch
 from attr import define, field
+from joblib import Parallel, delayed
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
 from torch import Tensor
 
 from baybe.searchspace import SearchSpace
@@ -49,26 +52,55 @@ class RandomForestSurrogate(Surrogate):
     def _posterior(self, candidates: Tensor) -> Tuple[Tensor, Tensor]:
         # See base class.
 
-        # Evaluate all trees
-        # NOTE: explicit conversion to ndarray is needed due to a pytorch issue:
-        # https://github.com/pytorch/pytorch/pull/51731
-        # https://github.com/pytorch/pytorch/issues/13918
-        predictions = torch.from_numpy(
-            np.asarray(
-                [
-                    self._model.estimators_[tree].predict(candidates)
-                    for tree in range(self._model.n_estimators)
-                ]
-            )
+        # The trees operate on float32 inputs, so the conversion is done only once
+        # instead of once per tree
+        x = np.ascontiguousarray(candidates.numpy(), dtype=np.float32)
+
+        # Accumulate the first two moments of the tree predictions in parallel threads,
+        # without storing the predictions of the individual trees
+        moments = np.zeros((3, len(x)))
+        lock = Lock()
+        Parallel(n_jobs=self._model.n_jobs, prefer="threads")(
+            delayed(_accumulate_moments)(tree, x, moments, lock)
+            for tree in self._model.estimators_
         )
 
-        # Compute posterior mean and variance
-        mean = predictions.mean(dim=0)
-        var = predictions.var(dim=0)
+        # Compute posterior mean and (unbiased) variance
+        n_trees, mean, sum_sq_dev = moments
+        if len(self._model.estimators_) > 1:
+            var = sum_sq_dev / (n_trees - 1)
+        else:
+            var = np.zeros_like(mean)
 
-        return mean, var
+        return torch.from_numpy(mean), torch.from_numpy(var)
 
     def _fit(self, searchspace: SearchSpace, train_x: Tensor, train_y: Tensor) -> None:
         # See base class.
         self._model = RandomForestRegressor(**(self.model_params))
         self._model.fit(train_x, train_y.ravel())
+
+
+def _accumulate_moments(
+    tree: DecisionTreeRegressor, x: np.ndarray, moments: np.ndarray, lock: Lock
+) -> None:
+    """Add the predictions of a tree to the running moments of the predictions.
+
+    The moments are updated via Welford's algorithm, which avoids the catastrophic
+    cancellation of computing the variance from the sums of predictions and squared
+    predictions when the variance is small compared to the mean.
+
+    Args:
+        tree: The tree whose predictions are accumulated.
+        x: The input points, represented as a C-contiguous float32 array.
+        moments: A ``3 x n`` array holding the number of accumulated predictions, their
+            mean, and the sum of their squared deviations from the mean, which is
+            updated in-place.
+        lock: The lock synchronizing the updates of the moments.
+    """
+    prediction = tree.predict(x, check_input=False)
+    with lock:
+        count, mean, sum_sq_dev = moments
+        count += 1
+        delta = prediction - mean
+        mean += delta / count
+        sum_sq_dev += delta * (prediction - mean)
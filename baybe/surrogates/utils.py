@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
+import copyreg
+import hashlib
+import importlib
+import json
+import math
 from functools import wraps
-from typing import TYPE_CHECKING, Callable, ClassVar, Tuple, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Tuple,
+    Type,
+)
 
 import torch
+from attrs import fields
 from torch import Tensor
 
 from baybe.scaler import DefaultScaler
 from baybe.searchspace import SearchSpace
+from baybe.utils.numeric import get_scoring_dtype
 
 if TYPE_CHECKING:
     from baybe.surrogates.base import Surrogate
@@ -19,6 +35,13 @@ _DTYPE = torch.float64
 
 _MIN_TARGET_STD = 1e-6
 
+_VMAP_INCOMPATIBILITIES = (
+    "Cannot access data pointer of Tensor that doesn't have storage",
+    "vmap:",
+)
+"""Error messages by which ``torch.func.vmap`` rejects functions it cannot vectorize,
+e.g. functions converting tensors to numpy arrays or Python scalars."""
+
 
 def _prepare_inputs(x: Tensor) -> Tensor:
     """Validate and prepare the model input.
@@ -37,6 +60,26 @@ def _prepare_inputs(x: Tensor) -> Tensor:
     return x.to(_DTYPE)
 
 
+def _prepare_candidates(x: Tensor) -> Tensor:
+    """Validate and prepare the candidates for a posterior evaluation.
+
+    In contrast to the training inputs, the candidates are represented in the current
+    scoring precision (see :func:`baybe.utils.numeric.scoring_precision`).
+
+    Args:
+        x: The "raw" candidates.
+
+    Returns:
+        The prepared candidates.
+
+    Raises:
+        ValueError: If the candidate set is empty.
+    """
+    if len(x) == 0:
+        raise ValueError("The model input must be non-empty.")
+    return x.to(get_scoring_dtype())
+
+
 def _prepare_targets(y: Tensor) -> Tensor:
     """Validate and prepare the model targets.
 
@@ -57,6 +100,166 @@ def _prepare_targets(y: Tensor) -> Tensor:
     return y.to(_DTYPE)
 
 
+def compute_fit_fingerprint(
+    surrogate: Surrogate, searchspace: SearchSpace, train_x: Tensor, train_y: Tensor
+) -> str:
+    """Compute a fingerprint identifying a surrogate fit.
+
+    The fingerprint covers the training data, the computational representation of the
+    search space (i.e. its column names and bounds) and the surrogate configuration.
+    Two fits with identical fingerprints yield equivalent models. For surrogates whose
+    configuration cannot be serialized, the fingerprint is tied to the specific
+    surrogate object.
+
+    Args:
+        surrogate: The surrogate to be fitted.
+        searchspace: The search space in which experiments are conducted.
+        train_x: The training data points.
+        train_y: The training data labels.
+
+    Returns:
+        The fingerprint in form of a hex string.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+
+    # Training data
+    for tensor in (train_x, train_y):
+        array = tensor.detach().to(_DTYPE).contiguous().numpy()
+        hasher.update(str(array.shape).encode())
+        hasher.update(array.tobytes())
+
+    # Computational representation of the search space
+    columns = list(searchspace.discrete.comp_rep.columns) + list(
+        searchspace.continuous.param_names
+    )
+    hasher.update(repr(columns).encode())
+    hasher.update(searchspace.param_bounds_comp.to(_DTYPE).numpy().tobytes())
+
+    # Surrogate configuration (excluding any persisted fitted state)
+    from baybe.surrogates.base import _unstructure_surrogate_config
+
+    try:
+        config = json.dumps(_unstructure_surrogate_config(surrogate))
+    except Exception:
+        config = f"{surrogate.__class__.__name__}@{id(surrogate)}"
+    hasher.update(config.encode())
+
+    return hasher.hexdigest()
+
+
+def _new_wrapper_instance(module: str, name: str, depth: int) -> Surrogate:
+    """Create an uninitialized instance of a class involved in a wrapped surrogate.
+
+    The class is located by descending from the public surrogate class ``module.name``
+    through the given number of wrapping levels.
+
+    Args:
+        module: The module containing the public surrogate class.
+        name: The name of the public surrogate class.
+        depth: The number of wrapping levels between the public class and the
+            requested class.
+
+    Returns:
+        The uninitialized instance, whose state is yet to be set.
+    """
+    cls = getattr(importlib.import_module(module), name)
+    for _ in range(depth):
+        cls = cls._wrapped_cls
+    return cls.__new__(cls)
+
+
+def _reduce_wrapped(obj: Surrogate) -> Tuple[Callable, Tuple[str, str, int], Any]:
+    """Reduce an instance of a class involved in a wrapped surrogate for pickling.
+
+    The classes generated by the wrapping decorators are local to the decorators and
+    the name of the undecorated class is bound to the outermost wrapper. Hence, none of
+    them can be located by name, which :mod:`pickle` requires. Instead, they are
+    located via the public surrogate class they are part of.
+
+    Args:
+        obj: The object to be reduced.
+
+    Returns:
+        The callable creating the uninitialized object, its arguments, and the state
+        of the object.
+    """
+    cls = type(obj)
+    innermost = cls
+    while issubclass(innermost, _SurrogateWrapper):
+        innermost = innermost._wrapped_cls
+
+    located = getattr(importlib.import_module(innermost.__module__), innermost.__name__)
+    depth = 0
+    while located is not cls:
+        located, depth = located._wrapped_cls, depth + 1
+
+    args = (innermost.__module__, innermost.__name__, depth)
+    return _new_wrapper_instance, args, obj.__getstate__()
+
+
+class _SurrogateWrapper:
+    """Mixin for the surrogate wrapper classes generated by decorators.
+
+    Makes the wrapped surrogates picklable (e.g. for scoring candidates in worker
+    processes) and copyable (see :func:`_reduce_wrapped`).
+    """
+
+    _wrapped_cls: ClassVar[type]
+    """The class wrapped by the decorator-generated class."""
+
+    def __reduce__(self):
+        """Reduce the wrapper for pickling.
+
+        Returns:
+            See :func:`_reduce_wrapped`.
+        """
+        return _reduce_wrapped(self)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Collect the instance attributes and the set slots of the base class.
+
+        Returns:
+            The state of the wrapper.
+        """
+        from baybe.surrogates.base import Surrogate
+
+        state = dict(self.__dict__)
+        for fld in fields(Surrogate):
+            try:
+                state[fld.name] = object.__getattribute__(self, fld.name)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state of an unpickled wrapper.
+
+        Args:
+            state: The state of the wrapper.
+        """
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self.__class__.__name__ = self.model.__class__.__name__
+
+
+class _ConstantTargetsWrapper(_SurrogateWrapper):
+    """Marker for the wrapper classes generated by :func:`catch_constant_targets`."""
+
+
+class _ScalingWrapper(_SurrogateWrapper):
+    """Marker for the wrapper classes generated by :func:`scale_model`."""
+
+
+def _register_wrapped(model_cls: Type[Surrogate]) -> None:
+    """Make an undecorated surrogate class picklable once it gets wrapped.
+
+    Args:
+        model_cls: The ``Surrogate`` class to be wrapped.
+    """
+    if not issubclass(model_cls, _SurrogateWrapper):
+        copyreg.pickle(model_cls, _reduce_wrapped)
+
+
 def catch_constant_targets(model_cls: Type[Surrogate]):
     """Wrap a ``Surrogate`` class that cannot handle constant training target values.
 
@@ -68,8 +271,13 @@ def catch_constant_targets(model_cls: Type[Surrogate]):
     Returns:
         A wrapped version of the class.
     """
+    # Make the classes involved in the wrapping picklable
+    _register_wrapped(model_cls)
+    bases = tuple(
+        b for b in model_cls.__bases__ if not issubclass(b, _SurrogateWrapper)
+    )
 
-    class SplitModel(*model_cls.__bases__):
+    class SplitModel(_ConstantTargetsWrapper, *bases):
         """The class that is used for wrapping.
 
         It applies a separate strategy for cases where the training
@@ -82,11 +290,24 @@ def catch_constant_targets(model_cls: Type[Surrogate]):
         joint_posterior: ClassVar[bool] = model_cls.joint_posterior
         # See base class.
 
+        supports_batched_posterior: ClassVar[
+            bool
+        ] = model_cls.supports_batched_posterior
+        # See base class.
+
+        posterior_memory_limit: ClassVar[int] = model_cls.posterior_memory_limit
+        # See base class.
+
+        _wrapped_cls: ClassVar[type] = model_cls
+        # See base class.
+
         def __init__(self, *args, **kwargs):
             super().__init__()
             self.model = model_cls(*args, **kwargs)
+            self._wrapped_model = self.model
             self.__class__.__name__ = self.model.__class__.__name__
             self.model_params = self.model.model_params
+            self.persist_fitted_state = self.model.persist_fitted_state
 
         def _posterior(self, candidates: Tensor) -> Tuple[Tensor, Tensor]:
             """Call the posterior function of the internal model instance."""
@@ -111,10 +332,31 @@ def catch_constant_targets(model_cls: Type[Surrogate]):
             # Needs 'unbiased=False' (otherwise, the result will be NaN for scalars)
             if torch.std(train_y.ravel(), unbiased=False) < _MIN_TARGET_STD:
                 self.model = MeanPredictionSurrogate()
+            else:
+                self.model = self._wrapped_model
 
             # Fit the selected model with the training data
             self.model.fit(searchspace, train_x, train_y)
 
+        def _get_fitted_state(self) -> Dict[str, Any]:
+            """Collect the fitted state of the internal model instance."""
+            from baybe.surrogates.naive import MeanPredictionSurrogate
+
+            return {
+                "constant": isinstance(self.model, MeanPredictionSurrogate),
+                "model": self.model._get_fitted_state(),
+            }
+
+        def _set_fitted_state(self, state: Dict[str, Any]) -> None:
+            """Restore the fitted state of the internal model instance."""
+            from baybe.surrogates.naive import MeanPredictionSurrogate
+
+            if state["constant"]:
+                self.model = MeanPredictionSurrogate()
+            else:
+                self.model = self._wrapped_model
+            self.model._set_fitted_state(state["model"])
+
         def __getattribute__(self, attr):
             """Access the attributes of the class instance if available.
 
@@ -148,8 +390,13 @@ def scale_model(model_cls: Type[Surrogate]):
     Returns:
         A wrapped version of the class.
     """
+    # Make the classes involved in the wrapping picklable
+    _register_wrapped(model_cls)
+    bases = tuple(
+        b for b in model_cls.__bases__ if not issubclass(b, _SurrogateWrapper)
+    )
 
-    class ScaledModel(*model_cls.__bases__):
+    class ScaledModel(_ScalingWrapper, *bases):
         """Overrides the methods of the given model class such the use scaled data.
 
         It stores an instance of the underlying model class and a scalar object.
@@ -159,6 +406,17 @@ def scale_model(model_cls: Type[Surrogate]):
         joint_posterior: ClassVar[bool] = model_cls.joint_posterior
         # See base class.
 
+        supports_batched_posterior: ClassVar[
+            bool
+        ] = model_cls.supports_batched_posterior
+        # See base class.
+
+        posterior_memory_limit: ClassVar[int] = model_cls.posterior_memory_limit
+        # See base class.
+
+        _wrapped_cls: ClassVar[type] = model_cls
+        # See base class.
+
         def __init__(self, *args, **kwargs):
             self.model = model_cls(*args, **kwargs)
             self.__class__.__name__ = self.model.__class__.__name__
@@ -179,10 +437,24 @@ def scale_model(model_cls: Type[Surrogate]):
             self, searchspace: SearchSpace, train_x: Tensor, train_y: Tensor
         ) -> None:
             """Fits the scaler and the model using the scaled training data."""
-            self.scaler = DefaultScaler(searchspace.discrete.comp_rep)
+            self.scaler = DefaultScaler(
+                searchspace.discrete.comp_rep,
+                bounds=torch.from_numpy(
+                    searchspace.discrete.comp_rep_statistics.bounds
+                ),
+            )
             train_x, train_y = self.scaler.fit_transform(train_x, train_y)
             self.model.fit(searchspace, train_x, train_y)
 
+        def _get_fitted_state(self) -> Dict[str, Any]:
+            """Collect the fitted scaler and the state of the internal model."""
+            return {"scaler": self.scaler, "model": self.model._get_fitted_state()}
+
+        def _set_fitted_state(self, state: Dict[str, Any]) -> None:
+            """Restore the fitted scaler and the state of the internal model."""
+            self.scaler = state["scaler"]
+            self.model._set_fitted_state(state["model"])
+
         def __getattribute__(self, attr):
             """Access the attributes of the class instance if available.
 
@@ -233,27 +505,30 @@ def batchify(
         Returns:
             The mean and the covariance.
         """
-        # If no batch dimensions are given, call the model directly
-        if candidates.ndim == 2:
+        # If no batch dimensions are given or the model can handle them natively,
+        # call the model directly
+        if (candidates.ndim == 2) or model.supports_batched_posterior:
             return posterior(model, candidates)
 
         # Keep track of batch dimensions
         t_shape = candidates.shape[:-2]
         q_shape = candidates.shape[-2]
 
-        # If the posterior function provides full covariance information, call it
-        # t-batch by t-batch
+        # If the posterior function provides full covariance information, call it on
+        # groups of t-batches
         if model.joint_posterior:
             # Flatten all t-batch dimensions into a single one
             flattened = candidates.flatten(end_dim=-3)
 
-            # Call the model on each (flattened) t-batch
-            out = (posterior(model, batch) for batch in flattened)
+            # Call the model on groups of (flattened) t-batches whose covariance
+            # entries do not exceed the memory limit of the model
+            max_entries = model.posterior_memory_limit // candidates.element_size()
+            out = _grouped_posterior(posterior, model, flattened, max_entries)
 
             # Collect the results and restore the batch dimensions
             mean, covar = zip(*out)
-            mean = torch.reshape(torch.stack(mean), t_shape + (q_shape,))
-            covar = torch.reshape(torch.stack(covar), t_shape + (q_shape, q_shape))
+            mean = torch.reshape(torch.cat(mean), t_shape + (q_shape,))
+            covar = torch.reshape(torch.cat(covar), t_shape + (q_shape, q_shape))
 
             return mean, covar
 
@@ -273,3 +548,76 @@ def batchify(
             return mean, var
 
     return sequential_posterior
+
+
+def _grouped_posterior(
+    posterior: Callable[[Surrogate, Tensor], Tuple[Tensor, Tensor]],
+    model: Surrogate,
+    batches: Tensor,
+    max_entries: int,
+) -> List[Tuple[Tensor, Tensor]]:
+    """Evaluate a joint posterior for groups of t-batches.
+
+    If possible, each group is evaluated in a single call by vectorizing the posterior
+    function over a leading batch dimension, so that only the covariance blocks of the
+    individual t-batches are computed. Posterior functions that cannot be vectorized
+    (e.g. because they operate on numpy arrays) are instead called on groups of
+    t-batches concatenated into a single q-batch (see :func:`_concatenated_posterior`).
+
+    Args:
+        posterior: The original ``posterior`` function.
+        model: The ``Surrogate`` model.
+        batches: The t-batches, represented as a tensor of shape ``(t, q, d)``.
+        max_entries: The maximum number of covariance entries computed per call.
+
+    Returns:
+        The means and covariances of each group, of shapes ``(g, q)`` and
+        ``(g, q, q)``, where ``g`` denotes the size of the group.
+
+    Raises:
+        RuntimeError: If the posterior function fails for a reason other than being
+            incompatible with vectorization.
+    """
+    q = batches.shape[-2]
+    vectorized = torch.func.vmap(lambda x: posterior(model, x))
+    groups = torch.split(batches, max(1, max_entries // q**2))
+    try:
+        first = vectorized(groups[0])
+    except RuntimeError as ex:
+        if not any(message in str(ex) for message in _VMAP_INCOMPATIBILITIES):
+            raise
+        group_size = max(1, math.isqrt(max_entries) // q)
+        return [
+            _concatenated_posterior(posterior, model, group)
+            for group in torch.split(batches, group_size)
+        ]
+    return [first] + [vectorized(group) for group in groups[1:]]
+
+
+def _concatenated_posterior(
+    posterior: Callable[[Surrogate, Tensor], Tuple[Tensor, Tensor]],
+    model: Surrogate,
+    batches: Tensor,
+) -> Tuple[Tensor, Tensor]:
+    """Evaluate a joint posterior for several t-batches in a single call.
+
+    The t-batches are concatenated into one q-batch and the posterior covariances of
+    the individual t-batches are extracted from the diagonal blocks of the resulting
+    joint covariance matrix.
+
+    Args:
+        posterior: The original ``posterior`` function.
+        model: The ``Surrogate`` model.
+        batches: The t-batches, represented as a tensor of shape ``(t, q, d)``.
+
+    Returns:
+        The means and covariances of shapes ``(t, q)`` and ``(t, q, q)``.
+    """
+    n_batches, q, _ = batches.shape
+    if n_batches == 1:
+        mean, covar = posterior(model, batches[0])
+        return mean.unsqueeze(0), covar.unsqueeze(0)
+
+    mean, covar = posterior(model, batches.flatten(end_dim=-2))
+    blocks = covar.reshape(n_batches, q, n_batches, q).diagonal(dim1=0, dim2=2)
+    return mean.reshape(n_batches, q), blocks.permute(2, 0, 1)
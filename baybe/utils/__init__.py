@@ -8,5 +8,6 @@ from baybe.utils.chemistry import *
 from baybe.utils.dataframe import *
 from baybe.utils.interval import *
 from baybe.utils.numeric import *
+from baybe.utils.optimization import *
 from baybe.utils.sampling_algorithms import *
 from baybe.utils.serialization import *
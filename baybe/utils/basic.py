@@ -1,6 +1,7 @@
 """Collection of small basic utilities."""
 
 import random
+import sys
 from dataclasses import dataclass
 from typing import Callable, Dict, Iterable, List, TypeVar
 
@@ -47,7 +48,30 @@ def get_subclasses(cls: _T, recursive: bool = True, abstract: bool = False) -> L
         if recursive:
             subclasses.extend(get_subclasses(subclass, abstract=abstract))
 
-    return subclasses
+    return [c for c in subclasses if not _is_replaced(c)]
+
+
+def _is_replaced(cls: type) -> bool:
+    """Check if a class has been replaced by another definition of the same name.
+
+    For example, slotted attrs classes replace the classes they are created from,
+    which linger as subclasses of their bases until they are garbage collected.
+
+    Args:
+        cls: The class to be checked.
+
+    Returns:
+        ``True`` if the class bound to the qualified name of the class in its module
+        is a different class of the same qualified name, ``False`` otherwise.
+    """
+    bound = sys.modules.get(cls.__module__)
+    for name in cls.__qualname__.split("."):
+        bound = getattr(bound, name, None)
+    return (
+        isinstance(bound, type)
+        and bound is not cls
+        and bound.__qualname__ == cls.__qualname__
+    )
 
 
 def set_random_seed(seed: int):
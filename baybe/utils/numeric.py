@@ -1,5 +1,7 @@
 """Utilities for numeric operations."""
-from typing import List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List
 
 import numpy as np
 import torch
@@ -20,6 +22,42 @@ There is no clear documentation but some references can be found here (version 1
  * https://onnx.ai/sklearn-onnx/auto_tutorial/plot_ebegin_float_double.html
 """  # noqa: E501
 
+_SCORING_PRECISION: "ContextVar[torch.dtype]" = ContextVar(
+    "_SCORING_PRECISION", default=DTypeFloatTorch
+)
+"""The floating point data type currently used for scoring candidates."""
+
+
+@contextmanager
+def scoring_precision(dtype: torch.dtype) -> Iterator[None]:
+    """Temporarily set the floating point precision used for scoring candidates.
+
+    The precision applies to the posterior evaluations of surrogate models only.
+    Model training and hyperparameter fitting are always carried out in
+    :data:`DTypeFloatTorch`. The setting is local to the current thread, i.e.
+    concurrent scorings in other threads are not affected.
+
+    Args:
+        dtype: The floating point data type used for scoring.
+
+    Yields:
+        Nothing.
+    """
+    token = _SCORING_PRECISION.set(dtype)
+    try:
+        yield
+    finally:
+        _SCORING_PRECISION.reset(token)
+
+
+def get_scoring_dtype() -> torch.dtype:
+    """Get the floating point data type currently used for scoring candidates.
+
+    Returns:
+        The data type (see :func:`scoring_precision`).
+    """
+    return _SCORING_PRECISION.get()
+
 
 def geom_mean(arr: np.ndarray, weights: List[float] = None) -> np.ndarray:
     """Calculate the (weighted) geometric mean along the second axis of a 2-D array.
@@ -0,0 +1,1109 @@
+"""Utilities for the optimization of acquisition functions."""
+
+import math
+import multiprocessing
+import pickle
+import time
+import uuid
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import copy_context
+from copy import deepcopy
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import torch
+from attrs import define, field, validators
+from botorch.optim import optimize_acqf
+from scipy.spatial import cKDTree
+from scipy.stats import spearmanr
+from torch import Tensor
+
+from baybe.utils.dataframe import to_tensor
+from baybe.utils.numeric import DTypeFloatTorch, scoring_precision
+
+_PROCESS_POOL: Dict[str, Any] = {"pool": None, "size": 0}
+"""The persistent worker pool used for multi-process candidate scoring."""
+
+_WORKER_CACHE: Dict[str, Any] = {"token": None, "acqf": None}
+"""The acquisition function currently loaded by a worker process."""
+
+_SHARDS_PER_PROCESS = 4
+"""The number of candidate shards per worker process (for load balancing)."""
+
+_NUMPY_DTYPES = {torch.float64: np.float64, torch.float32: np.float32}
+"""The numpy counterparts of the supported floating point data types."""
+
+_DEFAULT_NUM_RESTARTS = 5
+"""The number of optimization restarts used in the absence of a budget."""
+
+_DEFAULT_RAW_SAMPLES = 10
+"""The number of raw samples used in the absence of a budget."""
+
+_RAW_SAMPLES_FRACTION = 0.2
+"""The fraction of an evaluation budget spent on raw samples."""
+
+_EVALUATIONS_PER_RESTART = 50
+"""The targeted number of acquisition evaluations per optimization restart."""
+
+_MAX_RESTARTS = 32
+"""The maximum number of optimization restarts derived from a budget."""
+
+_MIN_EVALUATIONS_PER_RESTART = 5
+"""The minimum number of acquisition evaluations per optimization restart."""
+
+_MAX_BATCH_LIMIT = 16
+"""The maximum number of restarts optimized jointly in one batch."""
+
+_MAX_INIT_BATCH_LIMIT = 1024
+"""The maximum number of raw samples evaluated jointly in one batch."""
+
+_GRADIENT_COST_FACTOR = 3.0
+"""The estimated cost of an acquisition evaluation with gradient relative to an
+evaluation without gradient (used for translating time budgets)."""
+
+_N_PROBES = 16
+"""The number of points used for estimating the cost of an acquisition evaluation."""
+
+
+@contextmanager
+def torch_threads(n_threads: Optional[int]) -> Iterator[None]:
+    """Temporarily set the number of threads used for torch's intra-op parallelism.
+
+    Args:
+        n_threads: The number of threads. If ``None``, the current setting is kept.
+
+    Yields:
+        Nothing.
+    """
+    if n_threads is None:
+        yield
+        return
+
+    previous = torch.get_num_threads()
+    torch.set_num_threads(n_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+def _evaluate_chunked(
+    acquisition_function: Callable, points: Tensor, chunk_size: int
+) -> Tensor:
+    """Evaluate an acquisition function on single-point batches, chunk by chunk.
+
+    Args:
+        acquisition_function: The acquisition function to be evaluated.
+        points: The points to be evaluated, represented as a 2D tensor.
+        chunk_size: The maximum number of points evaluated at once.
+
+    Returns:
+        The acquisition values of the points.
+    """
+    return torch.cat(
+        [
+            acquisition_function(chunk.unsqueeze(-2))
+            for chunk in torch.split(points, chunk_size)
+        ]
+    )
+
+
+def _to_tensor(df: pd.DataFrame, dtype: torch.dtype) -> Tensor:
+    """Convert a dataframe into a tensor of the given floating point data type.
+
+    In contrast to :func:`baybe.utils.dataframe.to_tensor`, the values are directly
+    converted into the target data type, without an intermediate float64 copy.
+
+    Args:
+        df: The dataframe to be converted.
+        dtype: The floating point data type of the tensor.
+
+    Returns:
+        The tensor.
+    """
+    if dtype == DTypeFloatTorch:
+        return to_tensor(df)
+    return torch.from_numpy(df.to_numpy(dtype=_NUMPY_DTYPES[dtype]))
+
+
+def _top_k_chunked(
+    acquisition_function: Callable,
+    get_chunk: Callable[[int, int], Tensor],
+    start: int,
+    stop: int,
+    chunk_size: int,
+    k: int,
+) -> Tuple[Tensor, Tensor]:
+    """Stream a range of candidates through an acquisition function, keeping the top k.
+
+    Args:
+        acquisition_function: The acquisition function used for scoring.
+        get_chunk: A callable returning the candidates within a given positional range
+            as a 2D tensor.
+        start: The position of the first candidate to be scored.
+        stop: The position after the last candidate to be scored.
+        chunk_size: The maximum number of candidates scored at once.
+        k: The number of best candidates to be kept.
+
+    Returns:
+        The acquisition values of the best candidates (in descending order) and their
+        positional indices.
+    """
+    top_values = torch.empty(0, dtype=torch.float64)
+    top_ilocs = torch.empty(0, dtype=torch.long)
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop)
+        chunk = get_chunk(chunk_start, chunk_stop)
+        values = acquisition_function(chunk.unsqueeze(-2)).to(torch.float64)
+        ilocs = torch.arange(chunk_start, chunk_stop)
+        top_values, top_positions = torch.topk(
+            torch.cat([top_values, values]), min(k, len(top_values) + len(values))
+        )
+        top_ilocs = torch.cat([top_ilocs, ilocs])[top_positions]
+    return top_values, top_ilocs
+
+
+def _initialize_worker() -> None:
+    """Initialize a scoring worker process."""
+    # Parallelism is achieved via the processes
+    torch.set_num_threads(1)
+
+
+def _get_process_pool(n_processes: int) -> ProcessPoolExecutor:
+    """Get the persistent worker pool, (re-)creating it if required.
+
+    Args:
+        n_processes: The required number of worker processes.
+
+    Returns:
+        The worker pool.
+    """
+    if (_PROCESS_POOL["pool"] is None) or (_PROCESS_POOL["size"] != n_processes):
+        if _PROCESS_POOL["pool"] is not None:
+            _PROCESS_POOL["pool"].shutdown()
+        _PROCESS_POOL["pool"] = ProcessPoolExecutor(
+            max_workers=n_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+        )
+        _PROCESS_POOL["size"] = n_processes
+
+    return _PROCESS_POOL["pool"]
+
+
+def _load_shared_acqf(token: str, shm_name: str, n_bytes: int) -> Callable:
+    """Load a pickled acquisition function from shared memory (once per token).
+
+    Args:
+        token: The unique identifier of the acquisition function.
+        shm_name: The name of the shared memory block holding the pickled function.
+        n_bytes: The size of the pickled function in bytes.
+
+    Returns:
+        The acquisition function.
+    """
+    if _WORKER_CACHE["token"] != token:
+        shm = SharedMemory(name=shm_name)
+        try:
+            _WORKER_CACHE["acqf"] = pickle.loads(shm.buf[:n_bytes])
+        finally:
+            shm.close()
+        _WORKER_CACHE["token"] = token
+    return _WORKER_CACHE["acqf"]
+
+
+def _score_shard(
+    candidates_spec: Tuple[str, Tuple[int, int]],
+    acqf_spec: Tuple[str, str, int],
+    start: int,
+    stop: int,
+    chunk_size: int,
+    k: int,
+    dtype: torch.dtype,
+) -> Tuple[Tensor, Tensor]:
+    """Score a shard of the shared candidates within a worker process.
+
+    Args:
+        candidates_spec: The name of the shared memory block holding the candidates
+            and the shape of the candidate array.
+        acqf_spec: The arguments for :func:`_load_shared_acqf`.
+        start: The position of the first candidate of the shard.
+        stop: The position after the last candidate of the shard.
+        chunk_size: The maximum number of candidates scored at once.
+        k: The number of best candidates to be returned.
+        dtype: The floating point data type used for scoring.
+
+    Returns:
+        The output of :func:`_top_k_chunked` for the shard.
+    """
+    acquisition_function = _load_shared_acqf(*acqf_spec)
+    shm_name, shape = candidates_spec
+    shm = SharedMemory(name=shm_name)
+    try:
+        with torch.no_grad(), scoring_precision(dtype):
+            return _top_k_array(
+                acquisition_function,
+                np.ndarray(shape, dtype=np.float64, buffer=shm.buf),
+                start,
+                stop,
+                chunk_size,
+                k,
+                dtype,
+            )
+    finally:
+        shm.close()
+
+
+def _top_k_array(
+    acquisition_function: Callable,
+    array: np.ndarray,
+    start: int,
+    stop: int,
+    chunk_size: int,
+    k: int,
+    dtype: torch.dtype,
+) -> Tuple[Tensor, Tensor]:
+    """Apply :func:`_top_k_chunked` to candidates stored in an array.
+
+    The chunks are copied from the array, so that no views on the underlying buffer
+    exist after the call.
+
+    Args:
+        acquisition_function: See :func:`_top_k_chunked`.
+        array: The candidates, represented as a 2D array.
+        start: See :func:`_top_k_chunked`.
+        stop: See :func:`_top_k_chunked`.
+        chunk_size: See :func:`_top_k_chunked`.
+        k: See :func:`_top_k_chunked`.
+        dtype: The floating point data type of the chunks.
+
+    Returns:
+        See :func:`_top_k_chunked`.
+    """
+    return _top_k_chunked(
+        acquisition_function,
+        lambda a, b: torch.from_numpy(np.array(array[a:b])).to(dtype),
+        start,
+        stop,
+        chunk_size,
+        k,
+    )
+
+
+def _copy_columns(df: pd.DataFrame, buffer: memoryview) -> None:
+    """Copy a dataframe column by column into a buffer, as a C-ordered float array.
+
+    Copying column by column avoids materializing an intermediate copy of the entire
+    data.
+
+    Args:
+        df: The dataframe to be copied.
+        buffer: The target buffer.
+    """
+    array = np.ndarray(df.shape, dtype=np.float64, buffer=buffer)
+    for j, column in enumerate(df.columns):
+        array[:, j] = df[column].to_numpy(dtype=np.float64)
+
+
+def _top_k_multiprocess(
+    candidates: pd.DataFrame,
+    payload: bytes,
+    n_processes: int,
+    chunk_size: int,
+    k: int,
+    dtype: torch.dtype,
+) -> Tuple[Tensor, Tensor]:
+    """Score candidates in shards distributed across a persistent worker pool.
+
+    The candidates and the pickled acquisition function are placed in shared memory,
+    so that each worker loads the acquisition function only once per call and no
+    candidate data needs to be transferred between the processes.
+
+    Args:
+        candidates: The candidates in computational representation.
+        payload: The pickled acquisition function.
+        n_processes: The number of worker processes.
+        chunk_size: The maximum number of candidates scored at once by a worker.
+        k: The number of best candidates to be kept.
+        dtype: The floating point data type used for scoring.
+
+    Returns:
+        The acquisition values of the best candidates (in descending order) and their
+        positional indices.
+    """
+    n_rows, n_cols = candidates.shape
+    shm_candidates = SharedMemory(create=True, size=max(n_rows * n_cols * 8, 1))
+    shm_acqf = SharedMemory(create=True, size=len(payload))
+    try:
+        _copy_columns(candidates, shm_candidates.buf)
+        shm_acqf.buf[: len(payload)] = payload
+
+        # Distribute the shards
+        n_shards = n_processes * _SHARDS_PER_PROCESS
+        bounds = np.linspace(0, n_rows, n_shards + 1).astype(int)
+        candidates_spec = (shm_candidates.name, (n_rows, n_cols))
+        acqf_spec = (uuid.uuid4().hex, shm_acqf.name, len(payload))
+        pool = _get_process_pool(n_processes)
+        futures = [
+            pool.submit(
+                _score_shard, candidates_spec, acqf_spec, a, b, chunk_size, k, dtype
+            )
+            for a, b in zip(bounds[:-1], bounds[1:])
+            if b > a
+        ]
+        results = [future.result() for future in futures]
+    finally:
+        shm_candidates.close()
+        shm_candidates.unlink()
+        shm_acqf.close()
+        shm_acqf.unlink()
+
+    # Merge the results of the shards
+    values, ilocs = (torch.cat(x) for x in zip(*results))
+    top_values, top_positions = torch.topk(values, min(k, len(values)))
+    return top_values, ilocs[top_positions]
+
+
+def optimize_acqf_discrete_chunked(
+    acquisition_function: Callable,
+    q: int,
+    candidates: pd.DataFrame,
+    chunk_size: int = 10_000,
+    n_retained: int = 10_000,
+    n_threads: Optional[int] = None,
+    n_processes: Optional[int] = None,
+    dtype: torch.dtype = DTypeFloatTorch,
+) -> Tuple[np.ndarray, Tensor]:
+    """Optimize an acquisition function over discrete candidates with bounded memory.
+
+    A streaming variant of BoTorch's ``optimize_acqf_discrete``. The candidates are
+    converted into tensors and scored chunk by chunk, keeping only a running
+    selection of the ``n_retained`` best candidates. Hence, the peak memory does not
+    depend on the number of candidates. For batches (``q > 1``), the points are
+    selected in a sequential greedy fashion, where the candidates are rescored in the
+    presence of the already selected (pending) points. To keep the cost of each greedy
+    step independent of the number of candidates, the rescoring is restricted to the
+    retained candidates.
+
+    Optionally, the scoring can be distributed across a persistent pool of worker
+    processes, which operate on a shared-memory copy of the candidates. This requires
+    the acquisition function (including its surrogate model) to be picklable.
+    Otherwise, the scoring falls back to the calling process.
+
+    Args:
+        acquisition_function: The acquisition function to be optimized. For
+            ``q > 1``, it must support pending points (i.e. provide ``X_pending`` and
+            ``set_X_pending``).
+        q: The number of points to be selected.
+        candidates: The candidates in computational representation.
+        chunk_size: The maximum number of candidates scored at once.
+        n_retained: The number of best candidates that are kept for the greedy
+            selection of batch points. Values smaller than ``q`` are increased to
+            ``q``.
+        n_threads: The number of threads used by torch for the scoring. If ``None``,
+            the current torch setting is used.
+        n_processes: The number of worker processes used for the scoring. If ``None``
+            or 1, the scoring happens in the calling process.
+        dtype: The floating point data type used for scoring the candidates (see
+            :func:`baybe.utils.numeric.scoring_precision`). Reduced precision lowers
+            the memory footprint and increases the throughput of the scoring.
+
+    Returns:
+        The positional indices of the selected candidates and their acquisition values
+        at the time of their selection.
+
+    Raises:
+        ValueError: If the candidate set is empty or contains fewer points than
+            requested.
+    """
+    if len(candidates) < max(q, 1):
+        raise ValueError(
+            f"At least {q} candidate(s) are required but only {len(candidates)} "
+            f"were provided."
+        )
+
+    n_retained = min(max(n_retained, q), len(candidates))
+    base_X_pending = acquisition_function.X_pending if q > 1 else None
+
+    payload = None
+    if (n_processes is not None) and (n_processes > 1):
+        try:
+            payload = pickle.dumps(acquisition_function)
+        except (pickle.PicklingError, AttributeError, TypeError) as ex:
+            warnings.warn(
+                f"The acquisition function cannot be shared with worker processes "
+                f"({ex}). The candidates are scored in the calling process instead.",
+                UserWarning,
+            )
+
+    with torch_threads(n_threads), torch.no_grad(), scoring_precision(dtype):
+        # Stream the candidates and keep track of the best ones
+        if payload is not None:
+            top_values, top_ilocs = _top_k_multiprocess(
+                candidates, payload, n_processes, chunk_size, n_retained, dtype
+            )
+        else:
+            top_values, top_ilocs = _top_k_chunked(
+                acquisition_function,
+                lambda a, b: _to_tensor(candidates.iloc[a:b], dtype),
+                0,
+                len(candidates),
+                chunk_size,
+                n_retained,
+            )
+
+        if q == 1:
+            return top_ilocs[:1].numpy(), top_values[:1]
+
+        # Sequential greedy selection among the retained candidates
+        pool = _to_tensor(candidates.iloc[top_ilocs.numpy()], dtype)
+        selected, selected_values = [], []
+        values = top_values
+        try:
+            for _ in range(q):
+                best = int(torch.argmax(values))
+                selected.append(best)
+                selected_values.append(values[best])
+                pending = pool[selected]
+                acquisition_function.set_X_pending(
+                    pending
+                    if base_X_pending is None
+                    else torch.cat([base_X_pending, pending], dim=-2)
+                )
+                if len(selected) < q:
+                    values = _evaluate_chunked(
+                        acquisition_function, pool, chunk_size
+                    ).to(torch.float64)
+                    values[selected] = -float("inf")
+        finally:
+            acquisition_function.set_X_pending(base_X_pending)
+
+    return top_ilocs[selected].numpy(), torch.stack(selected_values)
+
+
+def _optimize_configurations(
+    acquisition_function: Callable,
+    configurations: Tensor,
+    ilocs: List[int],
+    optimizer_kwargs: Dict[str, Any],
+) -> List[Tuple[float, Tensor]]:
+    """Optimize the continuous part of a sequence of discrete configurations.
+
+    Args:
+        acquisition_function: The acquisition function to be optimized.
+        configurations: All discrete configurations, represented as a 2D tensor.
+        ilocs: The positional indices of the configurations to be optimized.
+        optimizer_kwargs: Additional keyword arguments passed to BoTorch's
+            ``optimize_acqf``.
+
+    Returns:
+        For each configuration, the acquisition value of the optimized point and the
+        point itself (including its discrete part).
+    """
+    results = []
+    for iloc in ilocs:
+        fixed_features = dict(enumerate(configurations[iloc].tolist()))
+        point, value = optimize_acqf(
+            acq_function=acquisition_function,
+            q=1,
+            fixed_features=fixed_features,
+            **optimizer_kwargs,
+        )
+        results.append((float(value), point[0]))
+    return results
+
+
+def optimize_acqf_hybrid_screened(
+    acquisition_function: Callable,
+    q: int,
+    candidates: pd.DataFrame,
+    continuous_samples: Tensor,
+    bounds: Tensor,
+    n_top: int = 10,
+    chunk_size: int = 10_000,
+    n_workers: int = 1,
+    num_restarts: int = _DEFAULT_NUM_RESTARTS,
+    raw_samples: int = _DEFAULT_RAW_SAMPLES,
+    equality_constraints: Optional[List[Tuple[Tensor, Tensor, float]]] = None,
+    inequality_constraints: Optional[List[Tuple[Tensor, Tensor, float]]] = None,
+    options: Optional[Dict[str, Any]] = None,
+    timeout_sec: Optional[float] = None,
+) -> Tuple[np.ndarray, Tensor, Tensor]:
+    """Optimize an acquisition function over a hybrid space via screening and pruning.
+
+    A pruned alternative to BoTorch's ``optimize_acqf_mixed``, which optimizes the
+    continuous subspace once for every discrete configuration. Instead, all discrete
+    configurations are first screened by evaluating the acquisition function at a
+    fixed set of continuous samples, in batched form and chunk by chunk. The
+    continuous subspace is then optimized only for the ``n_top`` configurations with
+    the best screening scores, which can be distributed across a thread pool. As in
+    ``optimize_acqf_mixed``, batch points (``q > 1``) are selected in a sequential
+    greedy fashion, where the top configurations are re-optimized in the presence of
+    the already selected (pending) points.
+
+    Args:
+        acquisition_function: The acquisition function to be optimized. For
+            ``q > 1``, it must support pending points (i.e. provide ``X_pending`` and
+            ``set_X_pending``).
+        q: The number of points to be selected.
+        candidates: The discrete configurations in computational representation.
+            The discrete dimensions are assumed to precede the continuous ones.
+        continuous_samples: The continuous points at which the configurations are
+            screened, represented as a 2D tensor.
+        bounds: The bounds of the full hybrid space.
+        n_top: The number of best-screened configurations for which the continuous
+            subspace is optimized.
+        chunk_size: The maximum number of points evaluated at once during screening.
+        n_workers: The number of threads among which the optimizations of the top
+            configurations are distributed. Each thread operates on its own copy of
+            the acquisition function.
+        num_restarts: See BoTorch's ``optimize_acqf``.
+        raw_samples: See BoTorch's ``optimize_acqf``.
+        equality_constraints: See BoTorch's ``optimize_acqf``.
+        inequality_constraints: See BoTorch's ``optimize_acqf``.
+        options: See BoTorch's ``optimize_acqf``.
+        timeout_sec: See BoTorch's ``optimize_acqf``. Applies to each optimization of
+            a configuration separately.
+
+    Returns:
+        The positional indices of the discrete configurations of the selected points,
+        the continuous parts of the selected points, and their acquisition values at
+        the time of their selection.
+
+    Raises:
+        ValueError: If no discrete configurations or continuous samples are provided.
+    """
+    if len(candidates) == 0 or len(continuous_samples) == 0:
+        raise ValueError(
+            "At least one discrete configuration and one continuous sample are "
+            "required for the screening."
+        )
+
+    configurations = to_tensor(candidates)
+    samples = continuous_samples.to(configurations.dtype)
+    n_samples = len(samples)
+
+    def screen(chunk: Tensor) -> Tensor:
+        """Compute the best acquisition value of each configuration among samples."""
+        chunk = chunk.squeeze(-2)
+        points = torch.cat(
+            [
+                chunk.repeat_interleave(n_samples, dim=0),
+                samples.repeat(len(chunk), 1),
+            ],
+            dim=-1,
+        )
+        values = acquisition_function(points.unsqueeze(-2))
+        return values.view(len(chunk), n_samples).max(dim=-1).values
+
+    # Screen all configurations and keep the most promising ones
+    with torch.no_grad():
+        _, top_ilocs = _top_k_chunked(
+            screen,
+            lambda a, b: configurations[a:b],
+            0,
+            len(configurations),
+            max(chunk_size // n_samples, 1),
+            min(n_top, len(configurations)),
+        )
+    top_ilocs = top_ilocs.tolist()
+
+    return _optimize_configurations_greedy(
+        acquisition_function,
+        q,
+        configurations,
+        top_ilocs,
+        n_workers,
+        {
+            "bounds": bounds,
+            "num_restarts": num_restarts,
+            "raw_samples": raw_samples,
+            "equality_constraints": equality_constraints,
+            "inequality_constraints": inequality_constraints,
+            "options": options,
+            "timeout_sec": timeout_sec,
+        },
+    )
+
+
+def optimize_acqf_hybrid(
+    acquisition_function: Callable,
+    q: int,
+    candidates: pd.DataFrame,
+    bounds: Tensor,
+    n_workers: int = 1,
+    num_restarts: int = _DEFAULT_NUM_RESTARTS,
+    raw_samples: int = _DEFAULT_RAW_SAMPLES,
+    equality_constraints: Optional[List[Tuple[Tensor, Tensor, float]]] = None,
+    inequality_constraints: Optional[List[Tuple[Tensor, Tensor, float]]] = None,
+    options: Optional[Dict[str, Any]] = None,
+    timeout_sec: Optional[float] = None,
+) -> Tuple[np.ndarray, Tensor, Tensor]:
+    """Optimize an acquisition function over a hybrid space for every configuration.
+
+    The counterpart of BoTorch's ``optimize_acqf_mixed``, which optimizes the
+    continuous subspace once for every discrete configuration and selects batch points
+    (``q > 1``) in a sequential greedy fashion. In contrast to ``optimize_acqf_mixed``,
+    the optimization runs can be distributed across a thread pool and a timeout is
+    respected by each of them.
+
+    Args:
+        acquisition_function: The acquisition function to be optimized. For
+            ``q > 1``, it must support pending points (i.e. provide ``X_pending`` and
+            ``set_X_pending``).
+        q: The number of points to be selected.
+        candidates: The discrete configurations in computational representation.
+            The discrete dimensions are assumed to precede the continuous ones.
+        bounds: The bounds of the full hybrid space.
+        n_workers: The number of threads among which the optimizations of the
+            configurations are distributed. Each thread operates on its own copy of
+            the acquisition function.
+        num_restarts: See BoTorch's ``optimize_acqf``.
+        raw_samples: See BoTorch's ``optimize_acqf``.
+        equality_constraints: See BoTorch's ``optimize_acqf``.
+        inequality_constraints: See BoTorch's ``optimize_acqf``.
+        options: See BoTorch's ``optimize_acqf``.
+        timeout_sec: See BoTorch's ``optimize_acqf``. Applies to each optimization of
+            a configuration separately.
+
+    Returns:
+        The positional indices of the discrete configurations of the selected points,
+        the continuous parts of the selected points, and their acquisition values at
+        the time of their selection.
+
+    Raises:
+        ValueError: If no discrete configurations are provided.
+    """
+    if len(candidates) == 0:
+        raise ValueError("At least one discrete configuration is required.")
+
+    return _optimize_configurations_greedy(
+        acquisition_function,
+        q,
+        to_tensor(candidates),
+        list(range(len(candidates))),
+        n_workers,
+        {
+            "bounds": bounds,
+            "num_restarts": num_restarts,
+            "raw_samples": raw_samples,
+            "equality_constraints": equality_constraints,
+            "inequality_constraints": inequality_constraints,
+            "options": options,
+            "timeout_sec": timeout_sec,
+        },
+    )
+
+
+def _optimize_configurations_greedy(
+    acquisition_function: Callable,
+    q: int,
+    configurations: Tensor,
+    ilocs: List[int],
+    n_workers: int,
+    optimizer_kwargs: Dict[str, Any],
+) -> Tuple[np.ndarray, Tensor, Tensor]:
+    """Select batch points among optimized configurations in a sequential greedy way.
+
+    Args:
+        acquisition_function: The acquisition function to be optimized.
+        q: The number of points to be selected.
+        configurations: All discrete configurations, represented as a 2D tensor.
+        ilocs: The positional indices of the configurations to be optimized.
+        n_workers: The number of threads among which the optimizations are
+            distributed.
+        optimizer_kwargs: Additional keyword arguments passed to BoTorch's
+            ``optimize_acqf``.
+
+    Returns:
+        The positional indices of the discrete configurations of the selected points,
+        the continuous parts of the selected points, and their acquisition values at
+        the time of their selection.
+    """
+    n_discrete = configurations.shape[-1]
+
+    # Each thread works on its own copy of the acquisition function since the
+    # function objects (e.g. their samplers) carry mutable state
+    n_workers = min(max(n_workers, 1), len(ilocs))
+    acqfs = (
+        [acquisition_function]
+        if n_workers == 1
+        else [deepcopy(acquisition_function) for _ in range(n_workers)]
+    )
+
+    shards = [ilocs[w::n_workers] for w in range(n_workers)]
+    ilocs = [iloc for shard in shards for iloc in shard]
+
+    base_X_pending = acquisition_function.X_pending if q > 1 else None
+    selected, points, values = [], [], []
+    try:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            for _ in range(q):
+                # The threads inherit the context (e.g. the scoring precision)
+                futures = [
+                    executor.submit(
+                        copy_context().run,
+                        _optimize_configurations,
+                        acqf,
+                        configurations,
+                        shard,
+                        optimizer_kwargs,
+                    )
+                    for acqf, shard in zip(acqfs, shards)
+                ]
+                results = [r for future in futures for r in future.result()]
+
+                # Select the best point and add it to the pending points
+                best = int(np.argmax([value for value, _ in results]))
+                selected.append(ilocs[best])
+                values.append(results[best][0])
+                points.append(results[best][1])
+                if len(selected) < q:
+                    pending = torch.stack(points)
+                    for acqf in acqfs:
+                        acqf.set_X_pending(
+                            pending
+                            if base_X_pending is None
+                            else torch.cat([base_X_pending, pending], dim=-2)
+                        )
+    finally:
+        if q > 1:
+            acquisition_function.set_X_pending(base_X_pending)
+
+    return (
+        np.asarray(selected, dtype=np.int64),
+        torch.stack(points)[:, n_discrete:],
+        torch.tensor(values, dtype=torch.float64),
+    )
+
+
+def match_candidates(
+    points: np.ndarray, candidates: Union[np.ndarray, cKDTree], k: int = 1
+) -> np.ndarray:
+    """Match points to their closest candidates (w.r.t. the Manhattan distance).
+
+    Used for projecting points onto a candidate set. The candidates are organized in a
+    KD-tree, whose construction takes ``O(n log n)`` time for ``n`` candidates, after
+    which the lookups of the points are typically logarithmic in the number of
+    candidates. For repeated matching against the same candidates, a prebuilt tree
+    can be passed instead of the candidates (e.g.
+    :attr:`baybe.searchspace.discrete.SubspaceDiscrete.comp_rep_tree`).
+
+    Args:
+        points: The points to be matched, represented as 2D array.
+        candidates: The candidates, represented as 2D array with the same number of
+            columns as ``points`` or as a KD-tree built on such an array.
+        k: The number of closest candidates to be returned per point. Values larger
+            than the number of candidates are reduced accordingly.
+
+    Returns:
+        The positional indices of the closest candidates. For ``k=1``, a 1D array with
+        one index per point. Otherwise, a 2D array containing the indices of each
+        point in a separate row, ordered by increasing distance. For duplicated
+        candidates, the position of one of the duplicates is returned.
+
+    Raises:
+        ValueError: If the candidate set is empty.
+    """
+    n_candidates = candidates.n if isinstance(candidates, cKDTree) else len(candidates)
+    if n_candidates == 0:
+        raise ValueError("At least one candidate is required for matching.")
+    k = min(k, n_candidates)
+
+    # Without coordinates, all candidates are equally close
+    if points.shape[1] == 0:
+        ilocs = np.tile(np.arange(k, dtype=np.int64), (len(points), 1))
+    else:
+        tree = candidates if isinstance(candidates, cKDTree) else cKDTree(candidates)
+        _, ilocs = tree.query(points, k=k, p=1)
+        ilocs = np.asarray(ilocs, dtype=np.int64).reshape(len(points), k)
+
+    return ilocs[:, 0] if k == 1 else ilocs
+
+
+def compare_scoring_precision(
+    acquisition_function: Callable,
+    candidates: pd.DataFrame,
+    dtype: torch.dtype = torch.float32,
+    chunk_size: int = 10_000,
+    top_k: int = 10,
+) -> Dict[str, float]:
+    """Quantify the effect of reduced scoring precision on a candidate ranking.
+
+    The candidates are scored (as single-point batches) both in full precision and in
+    the given reduced precision, and the resulting acquisition values and rankings are
+    compared.
+
+    Args:
+        acquisition_function: The acquisition function used for scoring.
+        candidates: The candidates in computational representation.
+        dtype: The reduced floating point data type to be validated.
+        chunk_size: The maximum number of candidates scored at once.
+        top_k: The number of best candidates considered for the overlap metric.
+
+    Returns:
+        A dictionary containing the maximum absolute deviation of the acquisition
+        values (``"max_abs_error"``), the same deviation relative to the range of the
+        full-precision values (``"max_rel_error"``), the Spearman rank correlation of
+        both rankings (``"spearman"``), the fraction of the ``top_k`` full-precision
+        candidates that are also among the ``top_k`` reduced-precision candidates
+        (``"top_k_overlap"``), and a flag indicating whether both precisions select
+        the same best candidate (``"same_best"``).
+    """
+    values = {}
+    with torch.no_grad():
+        for precision in (DTypeFloatTorch, dtype):
+            with scoring_precision(precision):
+                values[precision] = _evaluate_chunked(
+                    acquisition_function, _to_tensor(candidates, precision), chunk_size
+                ).to(torch.float64)
+    reference, reduced = values[DTypeFloatTorch], values[dtype]
+
+    errors = (reference - reduced).abs()
+    value_range = (reference.max() - reference.min()).item()
+    top_k = min(top_k, len(candidates))
+    top_reference = set(torch.topk(reference, top_k).indices.tolist())
+    top_reduced = set(torch.topk(reduced, top_k).indices.tolist())
+
+    return {
+        "max_abs_error": errors.max().item(),
+        "max_rel_error": errors.max().item() / value_range if value_range > 0 else 0.0,
+        "spearman": float(spearmanr(reference.numpy(), reduced.numpy())[0]),
+        "top_k_overlap": len(top_reference & top_reduced) / top_k,
+        "same_best": float(torch.argmax(reference) == torch.argmax(reduced)),
+    }
+
+
+@define(frozen=True)
+class OptimizationBudget:
+    """A computational budget for the optimization of an acquisition function.
+
+    The budget is translated into the settings of BoTorch's optimizers (number of
+    restarts, number of raw samples, batch limits and iteration limits) by
+    :func:`get_budgeted_optimizer_settings`. If both limits are specified, the more
+    restrictive one applies. The budget is a target rather than a hard limit, since
+    fixed overheads (e.g. of the individual optimizer runs in hybrid search spaces)
+    are not accounted for.
+    """
+
+    max_time: Optional[float] = field(
+        default=None, validator=validators.optional(validators.gt(0))
+    )
+    """The maximum wall-clock time in seconds."""
+
+    max_evaluations: Optional[int] = field(
+        default=None, validator=validators.optional(validators.ge(1))
+    )
+    """The maximum number of acquisition function evaluations (i.e. evaluated
+    q-batches)."""
+
+    def __attrs_post_init__(self):
+        if self.max_time is None and self.max_evaluations is None:
+            raise ValueError(
+                f"A '{self.__class__.__name__}' requires a time limit, an evaluation "
+                f"limit, or both."
+            )
+
+
+@define(frozen=True)
+class OptimizationReport:
+    """A report on the budget spent for the optimization of an acquisition function."""
+
+    budget: Optional[OptimizationBudget]
+    """The specified budget (``None`` if the default settings were used)."""
+
+    num_restarts: int
+    """The number of restarts per optimizer run."""
+
+    raw_samples: int
+    """The number of raw samples per optimizer run."""
+
+    n_runs: int
+    """The number of optimizer runs among which the budget was split."""
+
+    n_evaluations: int
+    """The total number of acquisition function evaluations (i.e. evaluated
+    q-batches)."""
+
+    elapsed_time: float
+    """The total wall-clock time in seconds."""
+
+
+class _EvaluationCounter:
+    """A counter for the number of acquisition function evaluations.
+
+    Copies of a hooked acquisition function (e.g. those of the worker threads) share
+    the counter with the original, which is why the counter is not copied and its
+    updates are synchronized.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = Lock()
+
+    def __call__(self, _: Any, args: Tuple[Any, ...], __: Any) -> None:
+        """Count the q-batches of a forward call (signature of a forward hook)."""
+        X = args[0] if args else None
+        if isinstance(X, Tensor) and X.ndim >= 2:
+            with self._lock:
+                self.count += math.prod(X.shape[:-2])
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_EvaluationCounter":
+        """Share the counter among all copies of the hooked acquisition function."""
+        return self
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop the lock, which cannot be pickled."""
+        return {"count": self.count}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the count and create a new lock."""
+        self.count = state["count"]
+        self._lock = Lock()
+
+
+def _find_module(acquisition_function: Callable) -> Optional[torch.nn.Module]:
+    """Find the BoTorch module behind a (potentially wrapped) acquisition function.
+
+    Args:
+        acquisition_function: The acquisition function.
+
+    Returns:
+        The innermost module (``None`` if there is none).
+    """
+    while not isinstance(acquisition_function, torch.nn.Module):
+        acquisition_function = getattr(acquisition_function, "acqf", None)
+        if acquisition_function is None:
+            return None
+    return acquisition_function
+
+
+@contextmanager
+def count_evaluations(acquisition_function: Callable) -> Iterator[_EvaluationCounter]:
+    """Count the evaluations of an acquisition function within a context.
+
+    Every evaluated q-batch counts as one evaluation, regardless of whether gradients
+    are computed. Acquisition functions that are not backed by a BoTorch module are
+    not counted.
+
+    Args:
+        acquisition_function: The acquisition function whose evaluations are counted.
+
+    Yields:
+        The counter, whose ``count`` attribute holds the number of evaluations.
+    """
+    counter = _EvaluationCounter()
+    module = _find_module(acquisition_function)
+    handle = None if module is None else module.register_forward_hook(counter)
+    try:
+        yield counter
+    finally:
+        if handle is not None:
+            handle.remove()
+
+
+def _estimate_evaluation_time(
+    acquisition_function: Callable, bounds: Tensor, q: int
+) -> float:
+    """Estimate the time of a single acquisition function evaluation.
+
+    Args:
+        acquisition_function: The acquisition function.
+        bounds: The bounds of the optimization domain.
+        q: The number of points per evaluated q-batch.
+
+    Returns:
+        The estimated time in seconds.
+    """
+    lower, upper = bounds.to(DTypeFloatTorch)
+    probes = lower + (upper - lower) * torch.rand(
+        _N_PROBES, q, bounds.shape[-1], dtype=DTypeFloatTorch
+    )
+    start = time.perf_counter()
+    with torch.no_grad():
+        acquisition_function(probes)
+    return (time.perf_counter() - start) / _N_PROBES
+
+
+def get_budgeted_optimizer_settings(
+    acquisition_function: Callable,
+    bounds: Tensor,
+    q: int,
+    budget: Optional[OptimizationBudget],
+    n_runs: int = 1,
+    constrained: bool = False,
+) -> Dict[str, Any]:
+    """Translate an optimization budget into settings for BoTorch's optimizers.
+
+    The budget is split evenly among ``n_runs`` optimizer runs (e.g. one per discrete
+    configuration in a hybrid search space). A time budget is translated into a number
+    of evaluations using the measured cost of evaluating the acquisition function and
+    is additionally enforced via BoTorch's ``timeout_sec``. Of each run's evaluations,
+    a fixed fraction is spent on raw samples, which are evaluated in large batches
+    that are not interrupted by the timeout, while the remainder is distributed among
+    the restarts (bounding their iterations), which are optimized jointly in parallel
+    batches. Restarts of problems with linear constraints are optimized one at a time
+    instead, since BoTorch then relies on SciPy's SLSQP, whose cost grows cubically
+    with the number of jointly optimized variables.
+
+    Args:
+        acquisition_function: The acquisition function to be optimized.
+        bounds: The bounds of the optimization domain.
+        q: The number of points to be optimized jointly.
+        budget: The optimization budget. If ``None``, the default settings are used.
+        n_runs: The number of optimizer runs among which the budget is split.
+        constrained: Whether the optimization problem has linear constraints. Only
+            affects the settings derived from a budget.
+
+    Returns:
+        Keyword arguments for BoTorch's ``optimize_acqf`` (and its variants).
+    """
+    if budget is None:
+        return {
+            "num_restarts": _DEFAULT_NUM_RESTARTS,
+            "raw_samples": _DEFAULT_RAW_SAMPLES,
+        }
+
+    n_runs = max(n_runs, 1)
+    settings: Dict[str, Any] = {}
+    n_evaluations = math.inf
+    if budget.max_evaluations is not None:
+        n_evaluations = budget.max_evaluations / n_runs
+    if budget.max_time is not None:
+        start = time.perf_counter()
+        evaluation_time = _estimate_evaluation_time(acquisition_function, bounds, q)
+        time_per_run = max(budget.max_time - (time.perf_counter() - start), 0) / n_runs
+        n_evaluations = min(
+            n_evaluations,
+            time_per_run / (evaluation_time * _GRADIENT_COST_FACTOR + 1e-12),
+        )
+        settings["timeout_sec"] = time_per_run
+
+    raw_samples = max(int(n_evaluations * _RAW_SAMPLES_FRACTION), 1)
+    n_remaining = max(n_evaluations - raw_samples, 0)
+    num_restarts = min(
+        max(int(n_remaining // _EVALUATIONS_PER_RESTART), 1), _MAX_RESTARTS
+    )
+    evaluations_per_restart = max(
+        int(n_remaining // num_restarts), _MIN_EVALUATIONS_PER_RESTART
+    )
+    raw_samples = max(raw_samples, num_restarts)
+    settings.update(
+        {
+            "num_restarts": num_restarts,
+            "raw_samples": raw_samples,
+            "options": {
+                "batch_limit": (
+                    1 if constrained else min(num_restarts, _MAX_BATCH_LIMIT)
+                ),
+                "init_batch_limit": min(raw_samples, _MAX_INIT_BATCH_LIMIT),
+                "maxiter": evaluations_per_restart,
+            },
+        }
+    )
+    return settings
@@ -1,21 +1,28 @@
 """A collection of point sampling algorithms."""
 
-from typing import Literal
+from typing import List, Literal, Optional
 
 import numpy as np
-from sklearn.metrics import pairwise_distances
+from attr import define, field
+from scipy.optimize import linprog
+from sklearn.metrics import pairwise_distances, pairwise_distances_chunked
+
+_N_PROJECTIONS = 32
+"""Number of random directions for approximating the farthest pair of points."""
 
 
 def farthest_point_sampling(
     points: np.ndarray,
     n_samples: int = 1,
-    initialization: Literal["farthest", "random"] = "farthest",
-) -> np.ndarray:
+    initialization: Literal["farthest", "random", "projection"] = "farthest",
+) -> List[int]:
     """Sample points according to a farthest point heuristic.
 
     Creates a subset of a collection of points by successively adding points with the
     largest Euclidean distance to intermediate point selections encountered during
-    the algorithmic process.
+    the algorithmic process. The distances of all points to the current selection are
+    tracked in a single vector that is updated for each selected point, which requires
+    O(n) memory and O(n * n_samples) distance computations for n points.
 
     Args:
         points: The points that are available for selection, represented as a 2D array
@@ -23,48 +30,241 @@ def farthest_point_sampling(
         n_samples: The total number of points to be selected.
         initialization: Determines how the first points are selected. When
             ``"farthest"`` is chosen, the first two selected points are those with the
-            largest distance. If only a single point is requested, it is selected
+            largest distance, which are found via a chunked search over all pairs of
+            points (O(n^2) time). When ``"projection"`` is chosen, the pair with the
+            largest distance is approximated by the pair with the largest distance
+            among the extreme points along random projection directions (O(n) time).
+            In both cases, if only a single point is requested, it is selected
             randomly from these two. When ``"random"`` is chosen, the first point is
             selected uniformly at random.
 
     Returns:
-        An array containing the positional indices of the selected points.
+        A list containing the positional indices of the selected points.
 
     Raises:
+        ValueError: If more points are requested than available.
         ValueError: If an unknown initialization strategy is used.
     """
-    # Compute the pairwise distances between all points
-    dist_matrix = pairwise_distances(points)
+    if n_samples > len(points):
+        raise ValueError(
+            f"Cannot select {n_samples} out of {len(points)} points via farthest "
+            f"point sampling."
+        )
 
     # Initialize the point selection subset
     if initialization == "random":
         selected_point_indices = [np.random.randint(0, len(points))]
-    elif initialization == "farthest":
-        idx_1d = np.argmax(dist_matrix)
-        selected_point_indices = list(np.unravel_index(idx_1d, dist_matrix.shape))
+    elif initialization in ("farthest", "projection"):
+        if initialization == "farthest":
+            selected_point_indices = _find_farthest_pair(points)
+        else:
+            selected_point_indices = _find_farthest_pair_projected(points)
         if n_samples == 1:
-            return np.random.choice(selected_point_indices, 1)
+            return np.random.choice(selected_point_indices, 1).tolist()
     else:
         raise ValueError(f"unknown initialization strategy: '{initialization}'")
 
-    # Initialize the list of remaining points
-    remaining_point_indices = list(range(len(points)))
+    # Initialize the smallest distances of the points to the selected points, where
+    # already selected points are excluded from further selection
+    min_dists = np.full(len(points), np.inf)
     for idx in selected_point_indices:
-        remaining_point_indices.remove(idx)
+        _update_min_distances(min_dists, points, idx)
 
-    # Successively add the points with the largest distance
+    # Successively add the points with the "largest smallest distance"
     while len(selected_point_indices) < n_samples:
-        # Collect distances between selected and remaining points
-        dist = dist_matrix[np.ix_(remaining_point_indices, selected_point_indices)]
+        selected_point_index = int(np.argmax(min_dists))
+        selected_point_indices.append(selected_point_index)
+        _update_min_distances(min_dists, points, selected_point_index)
 
-        # Find for each candidate point the smallest distance to the selected points
-        min_dists = np.min(dist, axis=1)
+    return selected_point_indices
 
-        # Choose the point with the "largest smallest distance"
-        selected_point_index = remaining_point_indices[np.argmax(min_dists)]
 
-        # Add the chosen point to the selection
-        selected_point_indices.append(selected_point_index)
-        remaining_point_indices.remove(selected_point_index)
+def _update_min_distances(min_dists: np.ndarray, points: np.ndarray, idx: int) -> None:
+    """Update the smallest distances to the selected points with a newly selected one.
 
-    return selected_point_indices
+    Args:
+        min_dists: The current smallest distances, which are updated in place.
+        points: The points available for selection.
+        idx: The positional index of the newly selected point.
+    """
+    dists = pairwise_distances(points, points[idx : idx + 1])[:, 0]
+    np.minimum(min_dists, dists, out=min_dists)
+    min_dists[idx] = -np.inf
+
+
+def _find_farthest_pair(points: np.ndarray) -> List[int]:
+    """Find the pair of points with the largest distance via a chunked search.
+
+    Args:
+        points: The points to be searched.
+
+    Returns:
+        The positional indices of the two points. Among several pairs with the same
+        distance, the first one in row-major order is returned.
+    """
+    best_dist, best_pair = -np.inf, [0, 0]
+    start = 0
+    for row_maxima, row_argmaxima in pairwise_distances_chunked(
+        points, reduce_func=lambda chunk, _: (chunk.max(axis=1), chunk.argmax(axis=1))
+    ):
+        row = int(np.argmax(row_maxima))
+        if row_maxima[row] > best_dist:
+            best_dist = row_maxima[row]
+            best_pair = [start + row, int(row_argmaxima[row])]
+        start += len(row_maxima)
+    return best_pair
+
+
+def _find_farthest_pair_projected(points: np.ndarray) -> List[int]:
+    """Approximate the pair of points with the largest distance via random projections.
+
+    The points with the smallest and largest projections onto random directions are
+    extreme points of the point set. The pair with the largest distance among these
+    candidates is returned.
+
+    Args:
+        points: The points to be searched.
+
+    Returns:
+        The positional indices of the two points.
+    """
+    directions = np.random.standard_normal((points.shape[1], _N_PROJECTIONS))
+    projections = points @ directions
+    candidates = np.unique(
+        np.concatenate([projections.argmin(axis=0), projections.argmax(axis=0)])
+    )
+    idx_1d = np.argmax(pairwise_distances(points[candidates]))
+    pair = np.unravel_index(idx_1d, (len(candidates), len(candidates)))
+    return [int(candidates[pair[0]]), int(candidates[pair[1]])]
+
+
+@define
+class PolytopeSampler:
+    """A persistent hit-and-run sampler for points within a polytope.
+
+    The polytope is defined by box bounds and the linear inequality constraints
+    ``matrix @ x >= rhs``. The sampler runs several hit-and-run chains in parallel,
+    which are advanced in vectorized steps. The constraint matrices and the starting
+    point of the chains are computed once and the chain states are kept between calls,
+    so that repeated sampling continues the existing chains without further burn-in.
+    """
+
+    bounds: np.ndarray = field(eq=False)
+    """The box bounds of the polytope (first row: lower, second row: upper)."""
+
+    matrix: np.ndarray = field(eq=False)
+    """The coefficients of the inequality constraints, one constraint per row."""
+
+    rhs: np.ndarray = field(eq=False)
+    """The right-hand sides of the inequality constraints."""
+
+    n_chains: int = field(default=64)
+    """The number of chains that are run in parallel."""
+
+    n_burnin: int = field(default=1000)
+    """The number of steps each chain takes before its first sample is drawn."""
+
+    thinning: int = field(default=32)
+    """The number of steps each chain takes between two consecutive samples."""
+
+    _constraint_matrix: np.ndarray = field(init=False, eq=False, repr=False)
+    """The combined coefficients of all constraints, including the box bounds."""
+
+    _constraint_rhs: np.ndarray = field(init=False, eq=False, repr=False)
+    """The combined right-hand sides of all constraints, including the box bounds."""
+
+    _interior_point: Optional[np.ndarray] = field(
+        init=False, default=None, eq=False, repr=False
+    )
+    """The point from which the chains are started."""
+
+    _state: Optional[np.ndarray] = field(init=False, default=None, eq=False, repr=False)
+    """The current states of the chains."""
+
+    _buffer: np.ndarray = field(init=False, eq=False, repr=False)
+    """Chain states that have been generated but not yet returned as samples."""
+
+    def __attrs_post_init__(self):
+        eye = np.eye(self.bounds.shape[1])
+        self._constraint_matrix = np.vstack([self.matrix, eye, -eye])
+        self._constraint_rhs = np.concatenate(
+            [self.rhs, self.bounds[0], -self.bounds[1]]
+        )
+        self._buffer = np.empty((0, self.bounds.shape[1]))
+
+    @property
+    def interior_point(self) -> np.ndarray:
+        """The Chebyshev center of the polytope, from which the chains are started.
+
+        Raises:
+            ValueError: If the polytope is empty or has no interior.
+        """
+        if self._interior_point is None:
+            # Maximize the radius of a ball inside the polytope, i.e. solve
+            # max r s.t. matrix @ x - r * ||matrix_i|| >= rhs
+            norms = np.linalg.norm(self._constraint_matrix, axis=1, keepdims=True)
+            n_dims = self.bounds.shape[1]
+            result = linprog(
+                c=np.r_[np.zeros(n_dims), -1.0],
+                A_ub=-np.hstack([self._constraint_matrix, -norms]),
+                b_ub=-self._constraint_rhs,
+                bounds=[(None, None)] * n_dims + [(0, None)],
+            )
+            if not result.success or result.x[-1] <= 0:
+                raise ValueError("The polytope is empty or has no interior.")
+            self._interior_point = result.x[:-1]
+        return self._interior_point
+
+    def _step(self, states: np.ndarray) -> np.ndarray:
+        """Advance all chains by one hit-and-run step."""
+        directions = np.random.standard_normal(states.shape)
+        directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+
+        # Find the feasible segment along each direction and move to a uniformly random
+        # point on it
+        slack = np.maximum(states @ self._constraint_matrix.T - self._constraint_rhs, 0)
+        rates = directions @ self._constraint_matrix.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = -slack / rates
+        upper = np.where(rates < 0, ratios, np.inf).min(axis=1)
+        lower = np.where(rates > 0, ratios, -np.inf).max(axis=1)
+        steps = lower + np.random.random(len(states)) * (upper - lower)
+        return states + steps[:, None] * directions
+
+    def sample(self, n_points: int) -> np.ndarray:
+        """Draw points from the polytope.
+
+        Without inequality constraints, the points are drawn directly from the uniform
+        distribution on the box. Otherwise, the points are the subsequent (thinned)
+        states of the hit-and-run chains, which are burned in upon first use. States
+        that are not needed in a call are kept for subsequent calls.
+
+        Args:
+            n_points: The number of points to be drawn.
+
+        Returns:
+            The drawn points as 2D array whose first dimension corresponds to the point
+            index.
+        """
+        if len(self.matrix) == 0:
+            return np.random.uniform(
+                self.bounds[0], self.bounds[1], (n_points, self.bounds.shape[1])
+            )
+
+        if self._state is None:
+            self._state = np.tile(self.interior_point, (self.n_chains, 1))
+            for _ in range(self.n_burnin):
+                self._state = self._step(self._state)
+
+        samples = [self._buffer]
+        n_generated = len(self._buffer)
+        while n_generated < n_points:
+            for _ in range(self.thinning):
+                self._state = self._step(self._state)
+            samples.append(self._state)
+            n_generated += len(self._state)
+        points = np.concatenate(samples)
+        self._buffer = points[n_points:]
+
+        # Round-off errors are removed by clipping to the box
+        return np.clip(points[:n_points], self.bounds[0], self.bounds[1])
@@ -0,0 +1,68 @@
+"""Benchmark of the candidate scoring throughput of the Gaussian process surrogate.
+
+Compares the time needed to compute posterior means and variances for a large set of
+candidates, evaluated in chunks, with exact predictive variances and with fast
+predictive variances computed from the cached LOVE decomposition.
+
+Usage::
+
+    python benchmarks/gp_candidate_scoring.py --n-candidates 1000000
+"""
+
+import argparse
+import time
+
+import torch
+
+from baybe.parameters import NumericalContinuousParameter
+from baybe.searchspace import SearchSpace
+from baybe.surrogates import GaussianProcessSurrogate
+
+
+def score_candidates(
+    surrogate: GaussianProcessSurrogate, candidates: torch.Tensor, chunk_size: int
+) -> float:
+    """Score all candidates chunk by chunk and return the elapsed time in seconds."""
+    start = time.perf_counter()
+    with torch.no_grad():
+        for chunk in torch.split(candidates, chunk_size):
+            surrogate.posterior(chunk.unsqueeze(-2))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-train", type=int, default=500)
+    parser.add_argument("--n-candidates", type=int, default=200_000)
+    parser.add_argument("--n-dims", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    searchspace = SearchSpace.from_product(
+        [
+            NumericalContinuousParameter(name=f"x{k}", bounds=(0, 1))
+            for k in range(args.n_dims)
+        ]
+    )
+    train_x = torch.rand(args.n_train, args.n_dims, dtype=torch.float64)
+    train_y = torch.sin(6 * train_x).sum(dim=-1, keepdim=True)
+    candidates = torch.rand(args.n_candidates, args.n_dims, dtype=torch.float64)
+
+    print(f"{'setting':<12}{'fit [s]':>10}{'scoring [s]':>14}{'candidates/s':>16}")
+    for fast_pred_var in (False, True):
+        surrogate = GaussianProcessSurrogate(fast_pred_var=fast_pred_var)
+        start = time.perf_counter()
+        surrogate.fit(searchspace, train_x, train_y)
+        fit_time = time.perf_counter() - start
+        scoring_time = score_candidates(surrogate, candidates, args.chunk_size)
+        label = "LOVE" if fast_pred_var else "exact"
+        print(
+            f"{label:<12}{fit_time:>10.2f}{scoring_time:>14.2f}"
+            f"{args.n_candidates / scoring_time:>16,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
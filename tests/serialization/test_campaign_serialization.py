@@ -1,9 +1,14 @@
 """Test serialization of campaigns."""
 
+from unittest.mock import patch
+
 import pytest
+import torch
 from cattrs import ClassValidationError
 
 from baybe.campaign import Campaign
+from baybe.surrogates import RandomForestSurrogate, trusted_fitted_states
+from baybe.utils.dataframe import add_fake_results
 
 
 def roundtrip(campaign: Campaign) -> Campaign:
@@ -20,6 +25,54 @@ def test_campaign_serialization(campaign):
     assert campaign == campaign2
 
 
+@pytest.mark.parametrize(
+    "surrogate_model", [RandomForestSurrogate(persist_fitted_state=True)]
+)
+def test_persisted_fitted_state(campaign):
+    """A campaign reloaded from a trusted source reuses the persisted fit."""
+    for _ in range(2):
+        rec = campaign.recommend(batch_quantity=3)
+        add_fake_results(rec, campaign)
+        campaign.add_measurements(rec)
+    campaign.recommend(batch_quantity=3)
+
+    with trusted_fitted_states():
+        campaign2 = roundtrip(campaign)
+    surrogate = campaign.strategy.recommender.surrogate_model
+    surrogate2 = campaign2.strategy.recommender.surrogate_model
+    assert surrogate2._fit_fingerprint == surrogate._fit_fingerprint
+
+    # The reloaded surrogate makes identical predictions without being refitted
+    test_x = torch.from_numpy(campaign.searchspace.discrete.comp_rep.values)
+    with patch.object(surrogate2, "_fit", wraps=surrogate2._fit) as fit:
+        campaign2.recommend(batch_quantity=2)
+        assert fit.call_count == 0
+    posteriors = zip(surrogate2.posterior(test_x), surrogate.posterior(test_x))
+    for actual, expected in posteriors:
+        assert torch.equal(actual, expected)
+
+
+@pytest.mark.parametrize(
+    "surrogate_model", [RandomForestSurrogate(persist_fitted_state=True)]
+)
+def test_untrusted_fitted_state(campaign):
+    """Persisted fits are not unpickled unless the source is declared trusted."""
+    rec = campaign.recommend(batch_quantity=3)
+    add_fake_results(rec, campaign)
+    campaign.add_measurements(rec)
+    campaign.recommend(batch_quantity=3)
+
+    with patch("pickle.loads") as loads, pytest.warns(UserWarning, match="ignored"):
+        campaign2 = roundtrip(campaign)
+    assert loads.call_count == 0
+    surrogate = campaign2.strategy.recommender.surrogate_model
+    assert surrogate._fit_fingerprint is None
+
+    with patch.object(surrogate, "_fit", wraps=surrogate._fit) as fit:
+        campaign2.recommend(batch_quantity=2)
+        assert fit.call_count == 1
+
+
 def test_valid_config(config):
     Campaign.validate_config(config)
 
@@ -3,12 +3,14 @@
 import pytest
 
 from baybe.recommenders import FPSRecommender, RandomRecommender
+from baybe.recommenders.base import NonPredictiveRecommender
 from baybe.strategies import (
     SequentialStrategy,
     StreamingSequentialStrategy,
     TwoPhaseStrategy,
 )
 from baybe.strategies.base import Strategy
+from baybe.utils.basic import get_subclasses
 from tests.conftest import select_recommender
 
 # Create some recommenders of different class for better differentiation after roundtrip
@@ -63,3 +65,20 @@ def test_strategy_state_serialization(strategy):
     strategy = roundtrip(strategy)
     rec = select_recommender(strategy, 1)
     assert rec == RECOMMENDERS[1]
+
+
+def test_replaced_class_serialization():
+    """Replaced class definitions are ignored when deserializing by class name."""
+    # Mimic the original definition of the slotted attrs class, which lingers as a
+    # subclass until it is garbage collected
+    replaced = type(
+        "FPSRecommender",
+        (NonPredictiveRecommender,),
+        {"__module__": FPSRecommender.__module__, "__qualname__": "FPSRecommender"},
+    )
+    assert replaced in NonPredictiveRecommender.__subclasses__()
+    assert replaced not in get_subclasses(NonPredictiveRecommender)
+    assert FPSRecommender in get_subclasses(NonPredictiveRecommender)
+
+    strategy = TwoPhaseStrategy(recommender=FPSRecommender(initialization="projection"))
+    assert strategy == roundtrip(strategy)
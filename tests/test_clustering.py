@@ -0,0 +1,43 @@
+"""Tests for the clustering recommenders."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from baybe.parameters import NumericalDiscreteParameter
+from baybe.recommenders import (
+    GaussianMixtureClusteringRecommender,
+    KMeansClusteringRecommender,
+    MiniBatchKMeansClusteringRecommender,
+    PAMClusteringRecommender,
+)
+from baybe.searchspace import SearchSpace
+
+
+@pytest.fixture(name="searchspace")
+def fixture_searchspace():
+    """A discrete search space whose candidates form two well-separated blobs."""
+    values = np.concatenate([np.linspace(0, 1, 20), np.linspace(10, 11, 20)])
+    parameters = [
+        NumericalDiscreteParameter(name="x0", values=list(values)),
+        NumericalDiscreteParameter(name="x1", values=list(np.linspace(0, 1, 20))),
+    ]
+    return SearchSpace.from_product(parameters)
+
+
+@pytest.mark.parametrize(
+    "recommender",
+    [
+        KMeansClusteringRecommender(coreset_size=100),
+        MiniBatchKMeansClusteringRecommender(),
+        PAMClusteringRecommender(coreset_size=100),
+        GaussianMixtureClusteringRecommender(coreset_size=100),
+    ],
+)
+def test_scalable_clustering(searchspace, recommender):
+    """Clusterings fit on coresets or mini-batches select one point per blob."""
+    np.random.seed(0)
+    recommendation = recommender.recommend(searchspace, 2)
+    assert len(recommendation) == 2
+    assert recommendation.index.is_unique
+    assert set(pd.cut(recommendation["x0"], [-1, 5, 12], labels=False)) == {0, 1}
@@ -1,15 +1,26 @@
 """Tests for custom surrogate models."""
 from contextlib import nullcontext
 
+import numpy as np
 import pytest
+import torch
 
 from baybe import Campaign
 from baybe.exceptions import ModelParamsNotSupportedError
-from baybe.surrogates import _ONNX_INSTALLED, register_custom_architecture
+from baybe.parameters import NumericalDiscreteParameter
+from baybe.searchspace import SearchSpace
+from baybe.surrogates import (
+    _ONNX_INSTALLED,
+    BayesianLinearSurrogate,
+    GaussianProcessSurrogate,
+    RandomForestSurrogate,
+    register_custom_architecture,
+)
 from tests.conftest import run_iterations
 
 if _ONNX_INSTALLED:
     from baybe.surrogates import CustomONNXSurrogate
+    from baybe.surrogates.export import export_onnx_surrogate
 
     def test_invalid_onnx_creation(onnx_str):
         """Invalid onnx model creation."""
@@ -50,6 +61,62 @@ if _ONNX_INSTALLED:
         with context:
             campaign.recommend(batch_quantity=1)
 
+    @pytest.mark.parametrize("chunk_size", [3, 100])
+    def test_onnx_chunked_inference(onnx_str, chunk_size):
+        """Chunked inference with reused buffers matches a plain session run."""
+        surrogate = CustomONNXSurrogate(
+            onnx_input_name="input",
+            onnx_str=onnx_str,
+            chunk_size=chunk_size,
+            intra_op_num_threads=1,
+            graph_optimization_level="basic",
+        )
+        candidates = torch.linspace(0, 9, 10, dtype=torch.float64).view(-1, 1)
+
+        mean, var = surrogate._posterior(candidates)
+        results = surrogate._model.run(
+            None, {"input": candidates.numpy().astype(np.float32)}
+        )
+        assert torch.allclose(mean, torch.from_numpy(results[0]).double().ravel())
+        assert torch.allclose(var, torch.from_numpy(results[1]).double().ravel() ** 2)
+
+        # The buffers are reused across calls
+        buffers = surrogate._buffers
+        surrogate._posterior(candidates)
+        assert surrogate._buffers is buffers
+
+    @pytest.mark.parametrize(
+        "surrogate_cls",
+        [RandomForestSurrogate, BayesianLinearSurrogate, GaussianProcessSurrogate],
+    )
+    def test_onnx_export(surrogate_cls):
+        """Exported surrogates reproduce the posterior of the fitted surrogates."""
+        parameters = [
+            NumericalDiscreteParameter(name=f"x{k}", values=list(np.linspace(0, 1, 5)))
+            for k in range(3)
+        ]
+        searchspace = SearchSpace.from_product(parameters)
+        generator = torch.Generator().manual_seed(0)
+        train_x = torch.rand(30, 3, dtype=torch.float64, generator=generator)
+        train_y = 3 * train_x.sum(dim=1, keepdim=True)
+        test_x = torch.rand(50, 1, 3, dtype=torch.float64, generator=generator)
+
+        # Include candidates at the training points, where the posterior variances are
+        # small and hence prone to cancellation errors
+        test_x = torch.cat([test_x, train_x[:10].unsqueeze(-2)])
+
+        surrogate = surrogate_cls()
+        surrogate.fit(searchspace, train_x, train_y)
+        exported = export_onnx_surrogate(surrogate, chunk_size=16)
+
+        # The exported GP computes exact variances (i.e. without LOVE)
+        if isinstance(surrogate, GaussianProcessSurrogate):
+            surrogate.fast_pred_var = False
+        mean, covar = surrogate.posterior(test_x)
+        mean_onnx, covar_onnx = exported.posterior(test_x)
+        assert torch.allclose(mean, mean_onnx, atol=1e-4)
+        assert torch.allclose(covar, covar_onnx, rtol=1e-2, atol=1e-5)
+
 
 def test_validate_architectures():
     """Test architecture class validation."""
@@ -94,3 +161,92 @@ def test_validate_architectures():
     register_custom_architecture()(
         type("ValidArch", (), {"_fit": _valid_fit, "_posterior": _valid_posterior})
     )
+
+
+class _JointArchitecture:
+    """A custom architecture with a joint (kernel-based) posterior that counts calls."""
+
+    def __init__(self):
+        self.input_shapes = []
+
+    def _fit(self, searchspace, train_x, train_y):
+        pass
+
+    def _posterior(self, candidates):
+        self.input_shapes.append(tuple(candidates.shape))
+        mean = candidates.sum(dim=-1)
+        covar = torch.exp(-(torch.cdist(candidates, candidates) ** 2))
+        return mean, covar
+
+
+class _NumpyJointArchitecture(_JointArchitecture):
+    """A joint posterior architecture operating on numpy arrays."""
+
+    def _posterior(self, candidates):
+        mean, covar = super()._posterior(torch.from_numpy(candidates.numpy()))
+        return mean, covar
+
+
+@pytest.mark.parametrize(
+    ["architecture", "memory_limit", "n_calls"],
+    [
+        (_JointArchitecture, 8 * 3 * 4**2, 4),
+        (_JointArchitecture, 2**20, 1),
+        (_NumpyJointArchitecture, 8 * (3 * 4) ** 2, 4),
+        (_NumpyJointArchitecture, 2**20, 1),
+    ],
+    ids=[
+        "three_batches_per_call",
+        "single_call",
+        "concatenated_three_batches_per_call",
+        "concatenated_single_call",
+    ],
+)
+def test_batchify_groups_joint_posterior(architecture, memory_limit, n_calls):
+    """Joint posteriors are evaluated for groups of t-batches within a memory cap."""
+    surrogate = register_custom_architecture(
+        joint_posterior_attr=True,
+        constant_target_catching=False,
+        posterior_memory_limit_attr=memory_limit,
+    )(architecture)()
+    candidates = torch.rand(10, 4, 3, dtype=torch.float64)
+
+    mean, covar = surrogate._posterior(candidates)
+    expected = [surrogate.model._posterior(batch) for batch in candidates]
+    assert torch.allclose(mean, torch.stack([m for m, _ in expected]))
+    assert torch.allclose(covar, torch.stack([c for _, c in expected]))
+
+    # Each call evaluates as many t-batches as the memory limit permits (the first
+    # calls stem from the batched evaluation, the remaining from the reference).
+    # Posteriors that cannot be vectorized are evaluated on concatenated t-batches,
+    # whose full joint covariance must fit into the memory limit.
+    assert len(surrogate.model.input_shapes) == n_calls + len(candidates)
+
+
+class _FailingJointArchitecture(_JointArchitecture):
+    """A joint posterior architecture whose evaluation fails."""
+
+    def _posterior(self, candidates):
+        self.input_shapes.append(tuple(candidates.shape))
+        raise RuntimeError("Model failure")
+
+
+def test_batchify_propagates_model_errors():
+    """Errors of the model are not mistaken for an incompatibility with vmap."""
+    surrogate = register_custom_architecture(
+        joint_posterior_attr=True, constant_target_catching=False
+    )(_FailingJointArchitecture)()
+    with pytest.raises(RuntimeError, match="Model failure"):
+        surrogate._posterior(torch.rand(10, 4, 3, dtype=torch.float64))
+    assert len(surrogate.model.input_shapes) == 1
+
+
+def test_batchify_passes_native_batches():
+    """Surrogates with native batch support receive the full batched input."""
+    surrogate = register_custom_architecture(
+        joint_posterior_attr=True,
+        constant_target_catching=False,
+        batched_posterior_attr=True,
+    )(_JointArchitecture)()
+    surrogate._posterior(torch.rand(2, 5, 4, 3, dtype=torch.float64))
+    assert surrogate.model.input_shapes == [(2, 5, 4, 3)]
@@ -1,8 +1,12 @@
 """Tests for basic input-output and iterative loop."""
 import numpy as np
 import pytest
+import torch
 
-from baybe.utils.dataframe import add_fake_results
+from baybe.campaign import Campaign
+from baybe.exceptions import NoMCAcquisitionFunctionError
+from baybe.recommenders import NaiveHybridRecommender
+from baybe.utils.dataframe import add_fake_results, to_tensor
 
 # List of tests that are expected to fail (still missing implementation etc)
 param_xfails = []
@@ -53,3 +57,70 @@ def test_bad_target_input_value(campaign, good_reference_values, bad_val, reques
     rec.Target_max.iloc[0] = bad_val
     with pytest.raises((ValueError, TypeError)):
         campaign.add_measurements(rec)
+
+
+@pytest.mark.parametrize(
+    "parameter_names",
+    [
+        ["Categorical_1", "Categorical_2", "Num_disc_1"],
+        ["Categorical_1", "Num_disc_1", "Conti_finite1", "Conti_finite2"],
+    ],
+    ids=["discrete", "hybrid"],
+)
+def test_pending_experiments(campaign):
+    """Pending experiments are considered for recommendations and can be retired."""
+    rec = campaign.recommend(batch_quantity=3)
+    add_fake_results(rec, campaign)
+    campaign.add_measurements(rec)
+
+    # Registering pending experiments invalidates the cached recommendations
+    pending = campaign.recommend(batch_quantity=3)
+    campaign.add_pending_experiments(pending)
+    assert len(campaign.pending_experiments) == 3
+    assert len(campaign.recommend(batch_quantity=3)) == 3
+
+    # The pending experiments are passed to the acquisition function
+    acqf = campaign.strategy.recommender.setup_acquisition_function(
+        campaign.searchspace,
+        campaign.measurements_parameters_comp,
+        campaign.measurements_targets_comp,
+        campaign.pending_experiments_comp,
+    )
+    assert torch.equal(acqf.X_pending, to_tensor(campaign.pending_experiments_comp))
+
+    # Pending experiments survive serialization
+    restored = Campaign.from_json(campaign.to_json())
+    assert restored.pending_experiments.equals(campaign.pending_experiments)
+
+    # Adding measurements retires the corresponding pending experiments
+    add_fake_results(pending, campaign)
+    campaign.add_measurements(pending.iloc[:2])
+    assert len(campaign.pending_experiments) == 1
+    assert (
+        campaign.pending_experiments.values
+        == pending.iloc[2:][campaign.pending_experiments.columns].values
+    ).all()
+
+
+@pytest.mark.parametrize("recommender", [NaiveHybridRecommender()])
+@pytest.mark.parametrize(
+    "parameter_names", [["Categorical_1", "Num_disc_1", "Conti_finite1"]]
+)
+def test_pending_experiments_naive_hybrid(campaign):
+    """Pending hybrid points are retained when optimizing the individual subspaces."""
+    rec = campaign.recommend(batch_quantity=3)
+    add_fake_results(rec, campaign)
+    campaign.add_measurements(rec)
+    campaign.add_pending_experiments(campaign.recommend(batch_quantity=2))
+    assert len(campaign.recommend(batch_quantity=2)) == 2
+
+
+@pytest.mark.parametrize("acquisition_function_cls", ["EI"])
+def test_pending_experiments_analytic_acqf(campaign):
+    """Pending experiments cannot be considered by analytic acquisition functions."""
+    rec = campaign.recommend(batch_quantity=3)
+    add_fake_results(rec, campaign)
+    campaign.add_measurements(rec)
+    campaign.add_pending_experiments(rec)
+    with pytest.raises(NoMCAcquisitionFunctionError):
+        campaign.recommend(batch_quantity=1)
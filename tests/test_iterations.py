@@ -8,12 +8,15 @@ from baybe.recommenders.base import NonPredictiveRecommender, Recommender
 from baybe.recommenders.bayesian import (
     BayesianRecommender,
     NaiveHybridRecommender,
+    RelaxedHybridRecommender,
     SequentialGreedyRecommender,
 )
+from baybe.recommenders.sampling import FPSRecommender
 from baybe.searchspace import SearchSpaceType
 from baybe.strategies.base import Strategy
 from baybe.surrogates import get_available_surrogates
 from baybe.utils.basic import get_subclasses
+from baybe.utils.optimization import OptimizationBudget
 
 from .conftest import run_iterations
 
@@ -24,7 +27,9 @@ valid_acquisition_functions = get_args(
     get_type_hints(BayesianRecommender.__init__)["acquisition_function_cls"]
 )
 valid_surrogate_models = [cls() for cls in get_available_surrogates()]
-valid_initial_recommenders = [cls() for cls in get_subclasses(NonPredictiveRecommender)]
+valid_initial_recommenders = [
+    cls() for cls in get_subclasses(NonPredictiveRecommender)
+] + [FPSRecommender(initialization="projection")]
 valid_discrete_recommenders = [
     cls()
     for cls in get_subclasses(Recommender)
@@ -36,6 +41,10 @@ valid_continuous_recommenders = [
     for cls in get_subclasses(Recommender)
     if cls.compatibility
     in [SearchSpaceType.CONTINUOUS, SearchSpaceType.HYBRID, SearchSpaceType.EITHER]
+] + [
+    SequentialGreedyRecommender(
+        optimization_budget=OptimizationBudget(max_time=1.0, max_evaluations=100)
+    )
 ]
 # List of all hybrid recommenders with default attributes. Is extended with other lists
 # of hybird recommenders like naive ones or recommenders not using default arguments
@@ -57,6 +66,12 @@ sampling_strategies = [
 valid_hybrid_sequential_greedy_recommenders = [
     SequentialGreedyRecommender(hybrid_sampler=sampler, sampling_percentage=per)
     for sampler, per in sampling_strategies
+] + [
+    SequentialGreedyRecommender(hybrid_n_top=3, hybrid_n_workers=2),
+    RelaxedHybridRecommender(n_neighbors=2),
+    RelaxedHybridRecommender(
+        optimization_budget=OptimizationBudget(max_evaluations=200)
+    ),
 ]
 
 valid_discrete_non_predictive_recommenders = [
@@ -0,0 +1,402 @@
+"""Tests for the acquisition function optimization utilities."""
+
+import pickle
+import threading
+import time
+import warnings
+from copy import deepcopy
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from botorch.acquisition import (
+    ExpectedImprovement,
+    qExpectedImprovement,
+    qUpperConfidenceBound,
+)
+from botorch.models import SingleTaskGP
+from botorch.optim import optimize_acqf, optimize_acqf_discrete
+from botorch.sampling import SobolQMCNormalSampler
+
+from baybe.acquisition import debotorchize
+from baybe.constraints import ContinuousLinearEqualityConstraint
+from baybe.parameters import (
+    NumericalContinuousParameter,
+    NumericalDiscreteParameter,
+)
+from baybe.recommenders import SequentialGreedyRecommender
+from baybe.searchspace import SearchSpace
+from baybe.surrogates import (
+    BayesianLinearSurrogate,
+    GaussianProcessSurrogate,
+    RandomForestSurrogate,
+)
+from baybe.utils.numeric import get_scoring_dtype, scoring_precision
+from baybe.utils.optimization import (
+    _DEFAULT_RAW_SAMPLES,
+    OptimizationBudget,
+    compare_scoring_precision,
+    count_evaluations,
+    get_budgeted_optimizer_settings,
+    match_candidates,
+    optimize_acqf_discrete_chunked,
+    optimize_acqf_hybrid,
+    optimize_acqf_hybrid_screened,
+)
+
+
+@pytest.fixture(name="candidates")
+def fixture_candidates():
+    """A random candidate set in computational representation."""
+    generator = torch.Generator().manual_seed(0)
+    points = torch.rand(500, 2, dtype=torch.float64, generator=generator)
+    return pd.DataFrame(points.numpy(), columns=["x0", "x1"], index=range(1000, 1500))
+
+
+@pytest.fixture(name="searchspace")
+def fixture_searchspace():
+    """A small discrete search space with three numerical dimensions."""
+    parameters = [
+        NumericalDiscreteParameter(name=f"x{k}", values=list(np.linspace(0, 1, 5)))
+        for k in range(3)
+    ]
+    return SearchSpace.from_product(parameters)
+
+
+@pytest.fixture(name="training_data")
+def fixture_training_data():
+    """Training data of a simple linear function."""
+    generator = torch.Generator().manual_seed(0)
+    train_x = torch.rand(20, 3, dtype=torch.float64, generator=generator)
+    return train_x, train_x.sum(dim=1, keepdim=True)
+
+
+@pytest.fixture(name="acqf")
+def fixture_acqf():
+    """An MC acquisition function based on a GP with fixed hyperparameters."""
+    generator = torch.Generator().manual_seed(1)
+    train_x = torch.rand(10, 2, dtype=torch.float64, generator=generator)
+    train_y = torch.sin(6 * train_x).sum(dim=-1, keepdim=True)
+    sampler = SobolQMCNormalSampler(torch.Size([256]), seed=0)
+    return qUpperConfidenceBound(
+        SingleTaskGP(train_x, train_y), beta=1.0, sampler=sampler
+    )
+
+
+@pytest.mark.parametrize("q", [1, 3])
+def test_chunked_discrete_optimization(candidates, acqf, q):
+    """The chunked optimizer selects the same points as the BoTorch optimizer."""
+    expected, _ = optimize_acqf_discrete(acqf, q, torch.tensor(candidates.values))
+    ilocs, values = optimize_acqf_discrete_chunked(
+        acqf, q, candidates, chunk_size=64, n_retained=len(candidates)
+    )
+
+    assert len(ilocs) == len(values) == q
+    assert torch.equal(torch.tensor(candidates.values[ilocs]), expected)
+    assert acqf.X_pending is None
+
+
+def test_chunked_discrete_optimization_too_few_candidates(candidates, acqf):
+    """Requesting more points than candidates raises an error."""
+    with pytest.raises(ValueError):
+        optimize_acqf_discrete_chunked(acqf, 3, candidates.iloc[:2])
+
+
+def test_chunked_discrete_optimization_retained_pool(candidates, acqf):
+    """Batch points are selected among the best-scoring single points only."""
+    _, n_best = optimize_acqf_discrete_chunked(acqf, 1, candidates)
+    ilocs, _ = optimize_acqf_discrete_chunked(
+        acqf, 3, candidates, chunk_size=64, n_retained=5
+    )
+    single_values = acqf(torch.tensor(candidates.values).unsqueeze(-2))
+    top5 = torch.topk(single_values, 5).indices
+    assert set(ilocs) <= set(top5.tolist())
+    assert torch.isclose(single_values[ilocs[0]].double(), n_best[0])
+
+
+def test_chunked_discrete_optimization_multiprocess(candidates, acqf):
+    """Scoring in worker processes selects the same points as in-process scoring."""
+    expected, expected_values = optimize_acqf_discrete_chunked(acqf, 2, candidates)
+    ilocs, values = optimize_acqf_discrete_chunked(
+        acqf, 2, candidates, chunk_size=64, n_processes=2
+    )
+    assert (ilocs == expected).all()
+    assert torch.allclose(values, expected_values)
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_screened_hybrid_optimization(acqf, n_workers):
+    """The screened hybrid optimizer finds the best discrete/continuous combination."""
+    configurations = pd.DataFrame({"x0": np.linspace(0, 1, 20)})
+    bounds = torch.tensor([[0.0, 0.0], [1.0, 1.0]], dtype=torch.float64)
+    samples = torch.linspace(0, 1, 8, dtype=torch.float64).unsqueeze(-1)
+
+    def best_values(continuous: torch.Tensor) -> torch.Tensor:
+        """Best acquisition value of each configuration on a continuous grid."""
+        x0 = torch.tensor(configurations["x0"].values)
+        points = torch.cartesian_prod(x0, continuous)
+        with torch.no_grad():
+            return acqf(points.unsqueeze(-2)).view(len(x0), -1).max(dim=-1).values
+
+    # Compared to a brute-force search on a dense grid, the optimum is found
+    expected = best_values(torch.linspace(0, 1, 1001, dtype=torch.float64))
+    ilocs, cont_points, values = optimize_acqf_hybrid_screened(
+        acqf, 1, configurations, samples, bounds, n_top=20, n_workers=n_workers
+    )
+    assert ilocs[0] == int(torch.argmax(expected))
+    assert cont_points.shape == (1, 1)
+    assert values[0] >= expected.max() - 1e-3
+
+    # Batch points are selected among the top screened configurations only
+    ilocs, cont_points, values = optimize_acqf_hybrid_screened(
+        acqf, 2, configurations, samples, bounds, n_top=3, n_workers=n_workers
+    )
+    top_screened = torch.topk(best_values(samples[:, 0]), 3).indices
+    assert set(ilocs) <= set(top_screened.tolist())
+    assert len(ilocs) == len(cont_points) == len(values) == 2
+    assert ((cont_points >= 0) & (cont_points <= 1)).all()
+    assert acqf.X_pending is None
+
+
+def test_candidate_matching(candidates):
+    """Drifted points are matched to their original candidates."""
+    values = candidates.to_numpy()
+    ilocs = np.array([3, 499, 0, 3])
+    points = values[ilocs] + 1e-9
+    assert np.array_equal(match_candidates(points, values), ilocs)
+
+    # Duplicated candidates are matched to one of their copies
+    duplicated = np.vstack([values, values[:1]])
+    assert match_candidates(values[:1], duplicated)[0] in (0, len(values))
+
+    # Without coordinates, any candidate is a match
+    assert np.array_equal(match_candidates(np.empty((2, 0)), np.empty((5, 0))), [0, 0])
+
+    # Multiple matches are ordered by increasing distance
+    neighbors = match_candidates(points, values, k=3)
+    distances = np.abs(values[neighbors] - points[:, None, :]).sum(axis=-1)
+    assert neighbors.shape == (4, 3)
+    assert np.array_equal(neighbors[:, 0], ilocs)
+    assert (np.diff(distances, axis=-1) >= 0).all()
+
+
+@pytest.mark.parametrize(
+    "surrogate_cls", [RandomForestSurrogate, BayesianLinearSurrogate]
+)
+def test_chunked_discrete_optimization_multiprocess_wrapped_surrogate(
+    searchspace, training_data, surrogate_cls
+):
+    """Decorated surrogates are scored in worker processes without fallback."""
+    surrogate = surrogate_cls()
+    surrogate.fit(searchspace, *training_data)
+    acqf = debotorchize(ExpectedImprovement)(surrogate, 1.0)
+    candidates = searchspace.discrete.comp_rep
+
+    expected, expected_values = optimize_acqf_discrete_chunked(acqf, 1, candidates)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        ilocs, values = optimize_acqf_discrete_chunked(
+            acqf, 1, candidates, chunk_size=16, n_processes=2
+        )
+    assert (ilocs == expected).all()
+    assert torch.allclose(values, expected_values)
+
+
+def test_debotorchized_acqf_pickling(searchspace, training_data):
+    """Debotorchized acquisition functions survive a pickle round trip."""
+    surrogate = GaussianProcessSurrogate()
+    surrogate.fit(searchspace, *training_data)
+    acqf = debotorchize(qExpectedImprovement)(surrogate, 1.0)
+    acqf.set_X_pending(training_data[0][:2])
+    restored = pickle.loads(pickle.dumps(acqf))
+
+    test_x = torch.rand(5, 1, 3, dtype=torch.float64)
+    assert torch.equal(restored.X_pending, acqf.X_pending)
+    assert torch.allclose(
+        restored.model.posterior(test_x).mean, acqf.model.posterior(test_x).mean
+    )
+
+
+def test_reduced_precision_scoring(searchspace, training_data):
+    """Single-precision scoring preserves the ranking of the candidates."""
+    surrogate = GaussianProcessSurrogate()
+    surrogate.fit(searchspace, *training_data)
+    acqf = debotorchize(ExpectedImprovement)(surrogate, 1.0)
+    generator = torch.Generator().manual_seed(0)
+    points = torch.rand(300, 3, dtype=torch.float64, generator=generator)
+    candidates = pd.DataFrame(points.numpy(), columns=["x0", "x1", "x2"])
+
+    # The posterior is evaluated in the requested precision
+    with scoring_precision(torch.float32):
+        mean, covar = surrogate.posterior(points[:5].unsqueeze(-2))
+    assert mean.dtype == covar.dtype == torch.float32
+
+    report = compare_scoring_precision(acqf, candidates, top_k=5)
+    assert report["spearman"] > 0.999
+    assert report["top_k_overlap"] == 1.0
+
+    ilocs, _ = optimize_acqf_discrete_chunked(acqf, 1, candidates, dtype=torch.float32)
+    expected, _ = optimize_acqf_discrete_chunked(acqf, 1, candidates)
+    assert (ilocs == expected).all()
+
+
+def test_scoring_precision_thread_local():
+    """The scoring precision set in one thread does not affect other threads."""
+    barrier = threading.Barrier(2)
+    observed = {}
+
+    def score(name, dtype):
+        with scoring_precision(dtype):
+            barrier.wait()
+            observed[name] = get_scoring_dtype()
+            barrier.wait()
+
+    threads = [
+        threading.Thread(target=score, args=(name, dtype))
+        for name, dtype in [("single", torch.float32), ("double", torch.float64)]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert observed == {"single": torch.float32, "double": torch.float64}
+
+
+def test_optimization_budget_requires_limit():
+    """A budget without any limit cannot be created."""
+    with pytest.raises(ValueError):
+        OptimizationBudget()
+
+
+@pytest.mark.parametrize(
+    "budget",
+    [
+        OptimizationBudget(max_evaluations=300),
+        OptimizationBudget(max_evaluations=10_000),
+        OptimizationBudget(max_time=0.5),
+    ],
+)
+def test_budgeted_optimization(acqf, budget):
+    """Optimizer settings are derived from a budget and the spent budget is counted."""
+    bounds = torch.tensor([[0.0, 0.0], [1.0, 1.0]], dtype=torch.float64)
+    for unbudgeted_constrained in (False, True):
+        assert get_budgeted_optimizer_settings(
+            acqf, bounds, 1, None, constrained=unbudgeted_constrained
+        ) == {"num_restarts": 5, "raw_samples": 10}
+    constrained = get_budgeted_optimizer_settings(
+        acqf, bounds, 1, budget, constrained=True
+    )
+    assert constrained["options"]["batch_limit"] == 1
+
+    with count_evaluations(acqf) as counter:
+        settings = get_budgeted_optimizer_settings(acqf, bounds, 1, budget)
+        optimize_acqf(acqf, bounds, q=1, **settings)
+
+    # The planned evaluations do not exceed the budget
+    num_restarts, raw_samples = settings["num_restarts"], settings["raw_samples"]
+    assert num_restarts <= raw_samples
+    assert settings["options"]["batch_limit"] <= num_restarts
+    if budget.max_evaluations is not None:
+        planned = raw_samples + num_restarts * settings["options"]["maxiter"]
+        assert planned <= budget.max_evaluations
+    else:
+        assert settings["timeout_sec"] <= budget.max_time
+    assert counter.count > raw_samples
+
+    # Evaluations are only counted within the context
+    acqf(torch.rand(7, 1, 2, dtype=torch.float64))
+    with count_evaluations(acqf) as counter:
+        acqf(torch.rand(7, 1, 2, dtype=torch.float64))
+    assert counter.count == 7
+
+    # Evaluations of copies (e.g. those of worker threads) are counted as well
+    with count_evaluations(acqf) as counter:
+        deepcopy(acqf)(torch.rand(7, 1, 2, dtype=torch.float64))
+    assert counter.count == 7
+
+
+def test_constrained_restarts_without_budget():
+    """Restarts of constrained problems are optimized one at a time by default."""
+    parameters = [
+        NumericalContinuousParameter(name=f"x{k}", bounds=(0, 1)) for k in range(3)
+    ]
+    searchspace = SearchSpace.from_product(
+        parameters,
+        [ContinuousLinearEqualityConstraint(["x0", "x1", "x2"], [1.0] * 3, 1.0)],
+    )
+    generator = torch.Generator().manual_seed(0)
+    train_x = torch.rand(10, 3, dtype=torch.float64, generator=generator)
+    train_x /= train_x.sum(dim=1, keepdim=True)
+    train_y = torch.sin(6 * train_x).sum(dim=1, keepdim=True)
+
+    with patch(
+        "baybe.recommenders.bayesian.optimize_acqf", wraps=optimize_acqf
+    ) as optimizer:
+        recommendation = SequentialGreedyRecommender().recommend(
+            searchspace,
+            2,
+            pd.DataFrame(train_x.numpy(), columns=["x0", "x1", "x2"]),
+            pd.DataFrame(train_y.numpy(), columns=["y"]),
+        )
+    assert optimizer.call_args.kwargs["options"] == {"batch_limit": 1}
+    assert np.allclose(recommendation.sum(axis=1), 1.0)
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_hybrid_optimization(acqf, n_workers):
+    """Every configuration is optimized within its own deadline."""
+    configurations = pd.DataFrame({"x0": np.linspace(0, 1, 6)})
+    bounds = torch.tensor([[0.0, 0.0], [1.0, 1.0]], dtype=torch.float64)
+
+    with patch(
+        "baybe.utils.optimization.optimize_acqf", wraps=optimize_acqf
+    ) as optimizer, count_evaluations(acqf) as counter:
+        ilocs, cont_points, values = optimize_acqf_hybrid(
+            acqf, 2, configurations, bounds, n_workers=n_workers, timeout_sec=5.0
+        )
+
+    # Each configuration is optimized once per batch point
+    assert optimizer.call_count == 2 * len(configurations)
+    assert all(c.kwargs["timeout_sec"] == 5.0 for c in optimizer.call_args_list)
+    assert len(ilocs) == len(cont_points) == len(values) == 2
+    assert acqf.X_pending is None
+
+    # The evaluations of all worker threads are counted
+    assert counter.count >= optimizer.call_count * _DEFAULT_RAW_SAMPLES
+
+
+def test_hybrid_time_budget():
+    """A time budget is respected in hybrid spaces despite underestimated costs."""
+    parameters = [
+        NumericalDiscreteParameter(name="x0", values=[0.0, 1.0]),
+        NumericalContinuousParameter(name="x1", bounds=(0, 1)),
+        NumericalContinuousParameter(name="x2", bounds=(0, 1)),
+    ]
+    searchspace = SearchSpace.from_product(parameters)
+    generator = torch.Generator().manual_seed(0)
+    train_x = torch.rand(10, 3, dtype=torch.float64, generator=generator)
+    train_y = torch.sin(6 * train_x).sum(dim=1, keepdim=True)
+
+    # Evaluations take much longer than estimated, so that the number of optimizer
+    # iterations derived from the budget is too large and only the timeout applies
+    posterior = GaussianProcessSurrogate._posterior
+
+    def slow_posterior(*args, **kwargs):
+        time.sleep(0.02)
+        return posterior(*args, **kwargs)
+
+    recommender = SequentialGreedyRecommender(
+        optimization_budget=OptimizationBudget(max_time=1.0)
+    )
+    with patch(
+        "baybe.utils.optimization._estimate_evaluation_time", return_value=1e-4
+    ), patch.object(GaussianProcessSurrogate, "_posterior", slow_posterior):
+        recommender.recommend(
+            searchspace,
+            1,
+            pd.DataFrame(train_x.numpy(), columns=["x0", "x1", "x2"]),
+            pd.DataFrame(train_y.numpy(), columns=["y"]),
+        )
+    assert recommender.optimization_report.elapsed_time < 1.75
@@ -0,0 +1,41 @@
+"""Tests for the point sampling algorithms."""
+
+import numpy as np
+import pytest
+from sklearn.metrics import pairwise_distances
+
+from baybe.utils.sampling_algorithms import farthest_point_sampling
+
+
+@pytest.fixture(name="points")
+def fixture_points():
+    """A random point cloud."""
+    return np.random.default_rng(0).random((300, 4))
+
+
+@pytest.mark.parametrize("initialization", ["farthest", "random"])
+def test_farthest_point_sampling(points, initialization):
+    """The selections match a brute-force evaluation of the farthest point heuristic."""
+    dist_matrix = pairwise_distances(points)
+    np.random.seed(0)
+    selected = farthest_point_sampling(points, 20, initialization)
+
+    if initialization == "farthest":
+        assert dist_matrix[selected[0], selected[1]] == dist_matrix.max()
+    for k in range(2, len(selected)):
+        min_dists = dist_matrix[:, selected[:k]].min(axis=1)
+        assert np.isclose(min_dists[selected[k]], min_dists.max())
+    assert len(set(selected)) == 20
+
+
+def test_farthest_point_sampling_projection(points):
+    """The projection initialization selects distant points without duplicates."""
+    np.random.seed(0)
+    selected = farthest_point_sampling(points, len(points), "projection")
+    assert sorted(selected) == list(range(len(points)))
+    first_dist = np.linalg.norm(points[selected[0]] - points[selected[1]])
+    assert first_dist > 0.8 * pairwise_distances(points).max()
+
+    assert len(farthest_point_sampling(points, 1, "projection")) == 1
+    with pytest.raises(ValueError):
+        farthest_point_sampling(points, len(points) + 1)
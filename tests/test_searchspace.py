@@ -1,4 +1,5 @@
 """Tests for the searchspace module."""
+import numpy as np
 import pandas as pd
 import pytest
 import torch
@@ -21,6 +22,7 @@ from baybe.searchspace import (
     SubspaceContinuous,
     SubspaceDiscrete,
 )
+from baybe.utils.optimization import match_candidates
 
 
 def test_empty_parameters():
@@ -61,6 +63,135 @@ def test_empty_parameter_bounds():
     assert torch.equal(searchspace_continuous.param_bounds_comp, expected)
 
 
+def test_comp_rep_statistics():
+    """The cached statistics match the data and are invalidated upon reassignment."""
+    parameters = [
+        NumericalDiscreteParameter(name="A", values=[1.0, 2.0, 5.0]),
+        CategoricalParameter(name="B", values=["a", "b"], encoding="OHE"),
+    ]
+    subspace = SubspaceDiscrete.from_product(parameters=parameters)
+    values = subspace.comp_rep.to_numpy()
+
+    stats = subspace.comp_rep_statistics
+    assert subspace.comp_rep_statistics is stats
+    assert np.array_equal(stats.bounds, [values.min(axis=0), values.max(axis=0)])
+    assert np.allclose(stats.mean, values.mean(axis=0))
+    assert np.allclose(stats.var, values.var(axis=0))
+    assert np.allclose(stats.standardize(subspace.comp_rep).std(axis=0), 1.0)
+
+    # Reassigning the computational representation invalidates the cache
+    subspace.comp_rep = subspace.comp_rep.iloc[:2]
+    assert subspace.comp_rep_statistics is not stats
+    assert np.array_equal(subspace.comp_rep_statistics.bounds[:, 0], [1.0, 1.0])
+
+
+def test_comp_rep_tree():
+    """The cached tree matches points relative to the extent of the subspace."""
+    parameters = [
+        NumericalDiscreteParameter(name="A", values=[0.0, 100.0, 200.0]),
+        NumericalDiscreteParameter(name="B", values=[0.0, 1.0]),
+    ]
+    subspace = SubspaceDiscrete.from_product(parameters=parameters)
+    tree = subspace.comp_rep_tree
+    assert subspace.comp_rep_tree is tree
+    assert np.allclose(tree.data.min(axis=0), 0.0)
+    assert np.allclose(tree.data.max(axis=0), 1.0)
+
+    # Normalized points are matched to the same candidates as against the array
+    stats = subspace.comp_rep_statistics
+    points = stats.normalize(np.array([[40.0, 0.9], [160.0, 0.2]]))
+    candidates = stats.normalize(subspace.comp_rep.to_numpy())
+    ilocs = match_candidates(points, tree)
+    assert np.array_equal(ilocs, match_candidates(points, candidates))
+    assert np.array_equal(subspace.comp_rep.iloc[ilocs].values, [[0, 1], [200, 0]])
+
+    # Reassigning the computational representation invalidates the cache
+    subspace.comp_rep = subspace.comp_rep.iloc[:2]
+    assert subspace.comp_rep_tree is not tree
+    assert subspace.comp_rep_tree.n == 2
+
+
+def test_null_space_parameterization():
+    """Equality constraints are eliminated and restored by the parameterization."""
+    parameters = [
+        NumericalContinuousParameter(name=f"x{k}", bounds=(0.0, 1.0)) for k in range(4)
+    ]
+    names = [p.name for p in parameters]
+    subspace = SubspaceContinuous(
+        parameters,
+        constraints_lin_eq=[
+            ContinuousLinearEqualityConstraint(names, [1.0] * 4, 1.0),
+            ContinuousLinearEqualityConstraint(names[:2], [1.0, -1.0], 0.0),
+        ],
+        constraints_lin_ineq=[
+            ContinuousLinearInequalityConstraint(names[2:], [1.0, -1.0], 0.1)
+        ],
+    )
+    parameterization = subspace.null_space_parameterization
+    assert subspace.null_space_parameterization is parameterization
+    assert parameterization.n_free == 2
+
+    # Free coordinates are mapped to points satisfying the equality constraints
+    points = subspace.samples_random(50).to_numpy()
+    assert np.allclose(points.sum(axis=1), 1.0)
+    assert np.allclose(points[:, 0], points[:, 1])
+    assert ((points >= 0.0) & (points <= 1.0)).all()
+    assert (points[:, 2] - points[:, 3] >= 0.1 - 1e-8).all()
+    reduced = parameterization.to_reduced(points)
+    assert np.allclose(parameterization.from_reduced(reduced), points)
+    assert (
+        parameterization.inequality_matrix @ reduced.T
+        >= parameterization.inequality_rhs[:, None] - 1e-8
+    ).all()
+
+    # Reassigning the constraints invalidates the cache
+    subspace.constraints_lin_eq = subspace.constraints_lin_eq[:1]
+    assert subspace.null_space_parameterization.n_free == 3
+    subspace.constraints_lin_eq = []
+    assert subspace.null_space_parameterization is None
+
+    # Inconsistent equality constraints are detected
+    subspace.constraints_lin_eq = [
+        ContinuousLinearEqualityConstraint(names[:1], [1.0], 0.2),
+        ContinuousLinearEqualityConstraint(names[:1], [1.0], 0.3),
+    ]
+    with pytest.raises(ValueError):
+        subspace.null_space_parameterization
+
+
+def test_persistent_sampler():
+    """The sampler of a subspace keeps its chains between calls."""
+    parameters = [
+        NumericalContinuousParameter(name=f"x{k}", bounds=(0.0, 1.0)) for k in range(3)
+    ]
+    names = [p.name for p in parameters]
+    subspace = SubspaceContinuous(
+        parameters,
+        constraints_lin_ineq=[
+            ContinuousLinearInequalityConstraint(names, [-1.0, -1.0, -1.0], -1.0)
+        ],
+    )
+    sampler = subspace.sampler
+    interior = sampler.interior_point
+    assert np.allclose(interior, np.full(3, 1 / (3 + np.sqrt(3))))
+
+    # Chains are burned in once and continued in subsequent calls
+    points = subspace.samples_random(100).to_numpy()
+    state = sampler._state
+    assert len(subspace.samples_random(1)) == 1
+    assert subspace.sampler is sampler and sampler._state is state
+    assert len(subspace.samples_random(200)) == 200
+    assert sampler._state is not state
+    assert ((points >= 0.0) & (points <= 1.0)).all()
+    assert (points.sum(axis=1) <= 1.0 + 1e-8).all()
+    assert len(np.unique(points, axis=0)) == 100
+
+    # Reassigning the constraints invalidates the sampler
+    subspace.constraints_lin_ineq = []
+    assert subspace.sampler is not sampler
+    assert subspace.samples_random(5).shape == (5, 3)
+
+
 def test_discrete_searchspace_creation_from_dataframe():
     """A purely discrete search space is created from an example dataframe."""
     num_specified = NumericalDiscreteParameter(name="num_specified", values=[1, 2, 3])
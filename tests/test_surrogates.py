@@ -0,0 +1,271 @@
+"""Tests for surrogate models."""
+
+from threading import Lock
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from gpytorch.kernels import InducingPointKernel
+from linear_operator.operators import DiagLinearOperator
+
+from baybe.acquisition import AdapterModel
+from baybe.parameters import (
+    NumericalContinuousParameter,
+    NumericalDiscreteParameter,
+    TaskParameter,
+)
+from baybe.recommenders import NaiveHybridRecommender, SequentialGreedyRecommender
+from baybe.searchspace import SearchSpace
+from baybe.surrogates import GaussianProcessSurrogate, RandomForestSurrogate
+from baybe.surrogates.random_forest import _accumulate_moments
+
+
+@pytest.fixture(name="searchspace")
+def fixture_searchspace():
+    """A small discrete search space with three numerical dimensions."""
+    parameters = [
+        NumericalDiscreteParameter(name=f"x{k}", values=list(np.linspace(0, 1, 5)))
+        for k in range(3)
+    ]
+    return SearchSpace.from_product(parameters)
+
+
+@pytest.fixture(name="training_data")
+def fixture_training_data():
+    """Noisy training data of a simple linear function."""
+    generator = torch.Generator().manual_seed(0)
+    train_x = torch.rand(60, 3, dtype=torch.float64, generator=generator)
+    noise = torch.randn(60, 1, dtype=torch.float64, generator=generator)
+    train_y = train_x.sum(dim=1, keepdim=True) + 0.01 * noise
+    return train_x, train_y
+
+
+def test_gp_incremental_update(searchspace, training_data):
+    """Small additions of data are handled via incremental updates."""
+    train_x, train_y = training_data
+    surrogate = GaussianProcessSurrogate(
+        incremental_update_ratio=0.1, max_incremental_updates=1
+    )
+    reference = GaussianProcessSurrogate()
+
+    # Small addition of data triggers an incremental update
+    surrogate.fit(searchspace, train_x[:50], train_y[:50])
+    surrogate.fit(searchspace, train_x[:52], train_y[:52])
+    assert surrogate._n_incremental_updates == 1
+
+    # The updated model yields (approximately) the same predictions as a refit
+    reference.fit(searchspace, train_x[:52], train_y[:52])
+    test_x = torch.rand(10, 1, 3, dtype=torch.float64)
+    mean, _ = surrogate.posterior(test_x)
+    mean_ref, _ = reference.posterior(test_x)
+    assert torch.allclose(mean, mean_ref, atol=0.05)
+
+    # The maximum number of consecutive updates enforces a full refit
+    surrogate.fit(searchspace, train_x[:53], train_y[:53])
+    assert surrogate._n_incremental_updates == 0
+
+    # Modified training data enforces a full refit
+    surrogate.fit(searchspace, train_x[1:55], train_y[1:55])
+    assert surrogate._n_incremental_updates == 0
+
+
+def test_gp_warm_start(searchspace, training_data):
+    """Warm-started fits are initialized with the previous hyperparameters."""
+    train_x, train_y = training_data
+    surrogate = GaussianProcessSurrogate(warm_start=True)
+    surrogate.fit(searchspace, train_x[:30], train_y[:30])
+    surrogate.fit(searchspace, train_x, train_y)
+    mean, covar = surrogate.posterior(train_x[:5].unsqueeze(-2))
+    assert torch.isfinite(mean).all() and torch.isfinite(covar).all()
+
+
+@pytest.mark.parametrize("fit_method", ["torch", "scipy"])
+def test_gp_fit_diagnostics(searchspace, training_data, fit_method):
+    """Fitting with restarts reports the diagnostics of the selected run."""
+    train_x, train_y = training_data
+    surrogate = GaussianProcessSurrogate(
+        fit_method=fit_method, fit_step_limit=20, fit_restarts=2
+    )
+    assert surrogate.fit_diagnostics is None
+
+    surrogate.fit(searchspace, train_x, train_y)
+    diagnostics = surrogate.fit_diagnostics
+    assert 0 < diagnostics.n_steps <= 20
+    assert diagnostics.n_restarts == 2
+    assert np.isfinite(diagnostics.loss)
+    assert diagnostics.runtime > 0
+
+
+@pytest.mark.parametrize("task", [False, True], ids=["single_task", "multi_task"])
+def test_gp_sparse_approximation(searchspace, training_data, task):
+    """Large training sets are modeled via an inducing point approximation."""
+    train_x, train_y = training_data
+    if task:
+        parameters = list(searchspace.parameters) + [
+            TaskParameter(name="task", values=["A", "B"])
+        ]
+        searchspace = SearchSpace.from_product(parameters)
+        train_x = torch.cat([train_x, (train_x[:, :1] > 0.5).double()], dim=1)
+    surrogate = GaussianProcessSurrogate(
+        sparse_threshold=50, n_inducing_points=20, fit_method="scipy"
+    )
+
+    surrogate.fit(searchspace, train_x, train_y)
+    assert isinstance(surrogate._model.covar_module, InducingPointKernel)
+    assert surrogate._model.covar_module.inducing_points.shape[0] == 20
+
+    mean, covar = surrogate.posterior(train_x[:5].unsqueeze(-2))
+    assert torch.isfinite(mean).all() and torch.isfinite(covar).all()
+    assert torch.allclose(mean.squeeze(), train_y[:5].squeeze(), atol=0.2)
+
+    # Fits to the same data select the same inducing points
+    torch.manual_seed(0)
+    refit = GaussianProcessSurrogate(
+        sparse_threshold=50, n_inducing_points=20, fit_method="scipy"
+    )
+    refit.fit(searchspace, train_x, train_y)
+    assert torch.equal(
+        refit._model.covar_module.inducing_points,
+        surrogate._model.covar_module.inducing_points,
+    )
+
+
+def test_gp_fast_pred_var(searchspace):
+    """Cached scoring of single-point batches approximates the exact posterior."""
+    # The training set exceeds the default size of the low-rank decomposition
+    generator = torch.Generator().manual_seed(0)
+    train_x = torch.rand(150, 3, dtype=torch.float64, generator=generator)
+    train_y = torch.sin(8 * train_x).sum(dim=1, keepdim=True)
+    surrogate = GaussianProcessSurrogate(fast_pred_var=True)
+    surrogate.fit(searchspace, train_x, train_y)
+
+    # The prediction caches, including the LOVE cache, are created directly after the
+    # fit
+    cache = surrogate._model.prediction_strategy._memoize_cache
+    assert "covar_cache" in {key[0] for key in cache}
+
+    # Exact variances are computed by default
+    reference = GaussianProcessSurrogate()
+    assert not reference.fast_pred_var
+    reference.fit(searchspace, train_x, train_y)
+    test_x = torch.rand(10, 1, 3, dtype=torch.float64, generator=generator)
+    mean, covar = surrogate.posterior(test_x)
+    mean_ref, covar_ref = reference.posterior(test_x)
+    assert mean.shape == mean_ref.shape and covar.shape == covar_ref.shape
+    assert torch.allclose(mean, mean_ref)
+    assert torch.allclose(covar, covar_ref, rtol=0.05)
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_random_forest_posterior(searchspace, training_data, n_jobs):
+    """The accumulated tree moments match the statistics of the tree predictions."""
+    train_x, train_y = training_data
+    surrogate = RandomForestSurrogate(
+        model_params={"n_estimators": 20, "n_jobs": n_jobs}
+    )
+    surrogate.fit(searchspace, train_x, train_y)
+
+    test_x = torch.rand(50, 3, dtype=torch.float64)
+    mean, var = surrogate._posterior(test_x)
+
+    scaled_x = surrogate.scaler.transform(test_x).numpy()
+    predictions = torch.from_numpy(
+        np.asarray([tree.predict(scaled_x) for tree in surrogate._model.estimators_])
+    )
+    expected_mean, expected_var = surrogate.scaler.untransform(
+        predictions.mean(dim=0), predictions.var(dim=0)
+    )
+    assert torch.allclose(mean, expected_mean)
+    assert torch.allclose(var, expected_var)
+
+
+def test_random_forest_moments_precision():
+    """The tree moments are accurate for predictions with a small relative spread."""
+    rng = np.random.default_rng(0)
+    predictions = 1e8 + rng.normal(scale=1e-2, size=(20, 5))
+    moments = np.zeros((3, 5))
+    for prediction in predictions:
+        tree = Mock(predict=Mock(return_value=prediction))
+        _accumulate_moments(tree, None, moments, Lock())
+
+    assert np.array_equal(moments[0], np.full(5, 20))
+    assert np.allclose(moments[1], predictions.mean(axis=0))
+    assert np.allclose(moments[2] / 19, predictions.var(axis=0, ddof=1), rtol=1e-6)
+
+
+def test_fit_cache(searchspace, training_data):
+    """Fits to unchanged data are reused, while modified data triggers a refit."""
+    train_x, train_y = training_data
+    train_x = pd.DataFrame(train_x.numpy(), columns=["x0", "x1", "x2"])
+    train_y = pd.DataFrame(train_y.numpy(), columns=["y"])
+    test_x = torch.rand(10, 3, dtype=torch.float64)
+
+    recommender = SequentialGreedyRecommender(
+        surrogate_model=RandomForestSurrogate(model_params={"n_estimators": 5})
+    )
+    surrogate = recommender.surrogate_model
+    with patch.object(surrogate, "_fit", wraps=surrogate._fit) as fit:
+        # Repeated fits to the same data are skipped
+        recommender._fit(searchspace, train_x, train_y)
+        expected = surrogate.posterior(test_x)
+        recommender._fit(searchspace, train_x, train_y)
+        assert fit.call_count == 1
+
+        # Modified data triggers a refit
+        recommender._fit(searchspace, train_x[1:], train_y[1:])
+        assert fit.call_count == 2
+
+        # A recent fit is restored into the surrogate of the recommender
+        assert recommender._fit(searchspace, train_x, train_y) is surrogate
+        assert fit.call_count == 2
+        for actual, desired in zip(surrogate.posterior(test_x), expected):
+            assert torch.equal(actual, desired)
+
+    # Fits are not shared between recommenders
+    other = SequentialGreedyRecommender(
+        surrogate_model=RandomForestSurrogate(model_params={"n_estimators": 5})
+    )
+    with patch.object(
+        other.surrogate_model, "_fit", wraps=other.surrogate_model._fit
+    ) as fit:
+        other._fit(searchspace, train_x, train_y)
+        assert fit.call_count == 1
+
+
+def test_fit_cache_naive_hybrid():
+    """The subspace recommenders of a naive hybrid recommender share their fits."""
+    parameters = [
+        NumericalDiscreteParameter(name="x0", values=list(np.linspace(0, 1, 5))),
+        NumericalContinuousParameter(name="x1", bounds=(0, 1)),
+    ]
+    searchspace = SearchSpace.from_product(parameters)
+    train_x = searchspace.discrete.exp_rep.assign(x1=0.5)
+    train_y = pd.DataFrame({"y": np.sin(4 * train_x["x0"].values)})
+
+    # Only the surrogate of the discrete recommender is fitted
+    recommender = NaiveHybridRecommender()
+    fit = GaussianProcessSurrogate._fit
+    with patch.object(
+        GaussianProcessSurrogate, "_fit", autospec=True, side_effect=fit
+    ) as fit:
+        recommender.recommend(searchspace, 2, train_x, train_y)
+        assert fit.call_count == 1
+        assert fit.call_args.args[0] is recommender.disc_recommender.surrogate_model
+    assert recommender.cont_recommender.surrogate_model._fit_fingerprint is not None
+
+
+def test_diagonal_adapter_posterior(searchspace, training_data):
+    """Marginal surrogates are passed to BoTorch with diagonal covariance operators."""
+    train_x, train_y = training_data
+    surrogate = RandomForestSurrogate(model_params={"n_estimators": 10})
+    surrogate.fit(searchspace, train_x, train_y)
+    test_x = torch.rand(20, 2, 3, dtype=torch.float64)
+
+    posterior = AdapterModel(surrogate).posterior(test_x)
+    assert isinstance(posterior.mvn.lazy_covariance_matrix, DiagLinearOperator)
+
+    mean, covar = surrogate.posterior(test_x)
+    assert torch.allclose(posterior.mean.squeeze(-1), mean)
+    assert torch.allclose(posterior.mvn.covariance_matrix, covar)
@@ -0,0 +1,127 @@
+"""Tests for Thompson sampling via functions drawn from surrogate posteriors."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from botorch.sampling.pathwise import draw_matheron_paths
+
+from baybe.exceptions import NotEnoughPointsLeftError
+from baybe.parameters import NumericalDiscreteParameter
+from baybe.recommenders import ThompsonSamplingRecommender
+from baybe.searchspace import SearchSpace
+from baybe.surrogates import GaussianProcessSurrogate, RandomForestSurrogate
+
+
+@pytest.fixture(name="searchspace")
+def fixture_searchspace():
+    """A discrete search space with two numerical dimensions."""
+    parameters = [
+        NumericalDiscreteParameter(name=f"x{k}", values=list(np.linspace(0, 1, 15)))
+        for k in range(2)
+    ]
+    return SearchSpace.from_product(parameters)
+
+
+@pytest.fixture(name="training_data")
+def fixture_training_data():
+    """Training data of a smooth function."""
+    generator = torch.Generator().manual_seed(0)
+    train_x = torch.rand(15, 2, dtype=torch.float64, generator=generator)
+    return train_x, torch.sin(4 * train_x).sum(dim=1, keepdim=True)
+
+
+def test_posterior_paths(searchspace, training_data):
+    """Drawn functions are consistent and match the posterior distribution."""
+    surrogate = GaussianProcessSurrogate()
+    surrogate.fit(searchspace, *training_data)
+    torch.manual_seed(0)
+    points = torch.rand(5, 2, dtype=torch.float64)
+    functions = surrogate.sample_posterior_paths(4000)
+    values = functions(points)
+    assert values.shape == (4000, 5)
+
+    # Each function is evaluated consistently at different sets of points
+    assert torch.allclose(functions(points[:2]), values[:, :2])
+
+    # The joint evaluation of all functions agrees with the evaluation by BoTorch
+    torch.manual_seed(1)
+    functions = surrogate.sample_posterior_paths(10)
+    torch.manual_seed(1)
+    paths = draw_matheron_paths(surrogate._model, sample_shape=torch.Size([10]))
+    with torch.no_grad():
+        assert torch.allclose(functions(points), paths(points))
+
+    # The sampled values follow the marginal posterior distributions (up to the
+    # approximation error of the random Fourier features)
+    mean, var = surrogate.marginal_posterior(points.unsqueeze(-2))
+    std = var.squeeze(-1).sqrt().detach()
+    assert torch.allclose(values.mean(dim=0), mean.squeeze(-1), atol=0.1 * std.max())
+    assert torch.allclose(values.std(dim=0), std, atol=0.2 * std.max())
+
+
+def test_posterior_paths_not_supported(searchspace, training_data):
+    """Surrogates without support for drawing functions raise an error."""
+    surrogate = RandomForestSurrogate()
+    surrogate.fit(searchspace, *training_data)
+    with pytest.raises(NotImplementedError):
+        surrogate.sample_posterior_paths(2)
+
+
+@pytest.mark.parametrize(
+    "surrogate_model", [GaussianProcessSurrogate(), RandomForestSurrogate()]
+)
+def test_thompson_sampling_recommendation(searchspace, training_data, surrogate_model):
+    """The recommended points are distinct and independent of the chunk size."""
+    train_x = pd.DataFrame(training_data[0].numpy(), columns=["x0", "x1"])
+    train_y = pd.DataFrame(training_data[1].numpy(), columns=["y"])
+
+    recommendations = []
+    for chunk_size in [7, 10_000]:
+        torch.manual_seed(0)
+        recommender = ThompsonSamplingRecommender(
+            surrogate_model=surrogate_model, chunk_size=chunk_size
+        )
+        rec = recommender.recommend(
+            searchspace, 30, train_x, train_y, allow_repeated_recommendations=True
+        )
+        assert len(rec) == 30
+        assert not rec.index.duplicated().any()
+        recommendations.append(rec)
+
+    # Functions drawn from the posterior are independent of the streaming
+    if isinstance(surrogate_model, GaussianProcessSurrogate):
+        assert recommendations[0].equals(recommendations[1])
+
+
+def test_thompson_sampling_pending_experiments(searchspace, training_data):
+    """Candidates coinciding with pending experiments are not recommended."""
+    train_x = pd.DataFrame(training_data[0].numpy(), columns=["x0", "x1"])
+    train_y = pd.DataFrame(training_data[1].numpy(), columns=["y"])
+    recommender = ThompsonSamplingRecommender()
+
+    torch.manual_seed(0)
+    pending = recommender.recommend(
+        searchspace, 10, train_x, train_y, allow_repeated_recommendations=True
+    )
+    torch.manual_seed(0)
+    rec = recommender.recommend(
+        searchspace,
+        10,
+        train_x,
+        train_y,
+        allow_repeated_recommendations=True,
+        pending_experiments=pending,
+    )
+    assert rec.index.intersection(pending.index).empty
+
+    # There must be enough candidates left after excluding the pending experiments
+    with pytest.raises(NotEnoughPointsLeftError):
+        recommender.recommend(
+            searchspace,
+            10,
+            train_x,
+            train_y,
+            allow_repeated_recommendations=True,
+            pending_experiments=searchspace.discrete.exp_rep.iloc[5:],
+        )